@@ -0,0 +1,125 @@
+"""
+Requests per second of one worker with the sync (boto3) and async (aioboto3)
+DynamoDB repositories.
+
+Each request reads a session and its recent messages, like the chat routes do.
+The app runs in-process behind httpx's ASGI transport, so all requests share
+one event loop exactly as in a single uvicorn worker.
+
+    uv run python benchmark_repositories.py --concurrency 32 --seconds 10
+
+Set DYNAMODB_ENDPOINT_URL to run against DynamoDB Local; --create-tables then
+creates the sessions and messages tables there first.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import boto3
+import httpx
+from fastapi import FastAPI
+from package.core.config import settings
+from package.schemas.session import Session
+from package.databases.dynamodb.session_repository import DynamoDBSessionRepository
+from package.databases.dynamodb.message_repository import DynamoDBMessageRepository
+from package.databases.dynamodb_async.session_repository import AsyncDynamoDBSessionRepository
+from package.databases.dynamodb_async.message_repository import AsyncDynamoDBMessageRepository
+from package.databases.dynamodb_async.client import dynamodb
+
+IMPLEMENTATIONS = {
+    "dynamodb": (DynamoDBSessionRepository, DynamoDBMessageRepository),
+    "dynamodb_async": (AsyncDynamoDBSessionRepository, AsyncDynamoDBMessageRepository),
+}
+
+def create_tables():
+    client = boto3.client('dynamodb', region_name=settings.AWS_REGION, endpoint_url=settings.DYNAMODB_ENDPOINT_URL)
+    existing = client.list_tables()['TableNames']
+    tables = [
+        (settings.SESSIONS_TABLE, 'session_id', 'ProjectIndex', 'project_id', None),
+        (settings.MESSAGES_TABLE, 'message_id', 'SessionIndex', 'session_id', 'created_at'),
+    ]
+    for name, key, index, index_key, index_range in tables:
+        if name in existing:
+            continue
+        index_schema = [dict(AttributeName=index_key, KeyType='HASH')]
+        attributes = [dict(AttributeName=key, AttributeType='S'), dict(AttributeName=index_key, AttributeType='S')]
+        if index_range:
+            index_schema.append(dict(AttributeName=index_range, KeyType='RANGE'))
+            attributes.append(dict(AttributeName=index_range, AttributeType='S'))
+        client.create_table(
+            TableName=name,
+            BillingMode='PAY_PER_REQUEST',
+            KeySchema=[dict(AttributeName=key, KeyType='HASH')],
+            AttributeDefinitions=attributes,
+            GlobalSecondaryIndexes=[dict(IndexName=index, KeySchema=index_schema, Projection=dict(ProjectionType='ALL'))]
+        )
+
+async def seed(session_repo, message_repo) -> str:
+    session = await session_repo.create(Session(project_id="benchmark", name="benchmark"))
+    for i in range(10):
+        await message_repo.create_user_message(session.session_id, "benchmark", f"question {i}", "benchmark")
+    return session.session_id
+
+def build_app(session_repo, message_repo) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sessions/{session_id}")
+    async def read_session(session_id: str):
+        session = await session_repo.get_by_id(session_id)
+        messages = await message_repo.get_recent_by_session_id(session_id, 10)
+        return dict(session_id=session.session_id, messages=len(messages))
+
+    return app
+
+async def run(name: str, concurrency: int, seconds: float) -> dict:
+    session_cls, message_cls = IMPLEMENTATIONS[name]
+    session_repo, message_repo = session_cls(), message_cls()
+    session_id = await seed(session_repo, message_repo)
+    app = build_app(session_repo, message_repo)
+
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + seconds
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get(f"/sessions/{session_id}")  # warm up connections
+
+        async def user():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.monotonic()
+                response = await client.get(f"/sessions/{session_id}")
+                if response.status_code != 200:
+                    errors += 1
+                latencies.append((time.monotonic() - start) * 1000)
+
+        started = time.monotonic()
+        await asyncio.gather(*[user() for _ in range(concurrency)])
+        elapsed = time.monotonic() - started
+
+    await dynamodb.close()
+    latencies.sort()
+    return dict(
+        implementation=name,
+        requests=len(latencies),
+        errors=errors,
+        rps=round(len(latencies) / elapsed, 1),
+        p50_ms=round(statistics.median(latencies), 1),
+        p95_ms=round(latencies[int(len(latencies) * 0.95) - 1], 1)
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--create-tables", action="store_true")
+    args = parser.parse_args()
+
+    if args.create_tables:
+        create_tables()
+    for name in IMPLEMENTATIONS:
+        result = asyncio.run(run(name, args.concurrency, args.seconds))
+        print(" ".join(f"{key}={value}" for key, value in result.items()))
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,11 @@ from package.routers.sessions.router import router as sessions_router
 from package.routers.files.router import router as files_router
 from package.routers.chat.router import router as chat_router
 
+from package.core.dependencies import get_catalog_pool, get_sql_cache
+from package.llms.base import get_llm_executor
+from package.llms.admission import admission_stats
+from package.databases.dynamodb_async.client import dynamodb
+from package.core.access_cache import AccessMemoMiddleware
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
@@ -30,6 +35,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request memo for authorization lookups
+app.add_middleware(AccessMemoMiddleware)
+
 # Register routers
 # app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 # app.include_router(projects_router, prefix="/projects", tags=["Projects"])
@@ -51,6 +59,23 @@ def root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/catalog")
+def catalog_stats():
+    return get_catalog_pool().stats()
+
+@app.get("/health/llm")
+def llm_stats():
+    sql_cache = get_sql_cache()
+    return dict(
+        executor=get_llm_executor().stats(),
+        models=admission_stats(),
+        sql_cache=sql_cache.stats() if sql_cache else None
+    )
+
+@app.on_event("shutdown")
+async def close_dynamodb():
+    await dynamodb.close()
+
 # @app.get("/favicon.ico")
 # def favicon():
 #     return {"message": "No favicon"}
@@ -1,6 +1,8 @@
+from typing import Optional
 from package.prompt_hub import PromptHub
-from package.llms import ModelResponse, BaseLLM
+from package.llms import ModelResponse, BaseLLM, get_llm_executor
 from package.utils.parse_string import parse_blockcode
+import pyarrow as pa
 
 class ChartBuilder:
     """
@@ -10,10 +12,22 @@ class ChartBuilder:
     """
     def __init__(self, llm:BaseLLM):
         self.llm = llm
+        self.response: Optional[ModelResponse] = None  # last model response, for usage accounting
 
     def run(self, results, messages:list) -> str:
         """Generate plotly blockcode based on sql, results from database and user question."""
         response: ModelResponse = self.llm.run(PromptHub().chart_builder, messages)
+        self.response = response
+        return self.render(results, response)
+
+    async def arun(self, results, messages:list) -> str:
+        """Async version of run; the generated code runs on the bounded LLM executor."""
+        response: ModelResponse = await self.llm.arun(PromptHub().chart_builder, messages)
+        self.response = response
+        return await get_llm_executor().run(self.render, results, response)
+
+    def render(self, results, response:ModelResponse) -> str:
+        """Run the generated create_chart function and return the figure as json."""
         try:
             python_code = parse_blockcode(response.content, "python")
             # print("Generated code:", python_code)  # Debug
@@ -25,7 +39,9 @@ class ChartBuilder:
             # if "create_chart" not in local_vars:
             #     raise KeyError("create_chart function not found in generated code")
                 
-            fig = local_vars["create_chart"](results)
+            # Generated chart code works on pandas; convert Arrow results only here
+            data = results.to_pandas() if isinstance(results, pa.Table) else results
+            fig = local_vars["create_chart"](data)
             return fig.to_json()
         except Exception as e:
             print(f"Error: {e}")
@@ -1,3 +1,4 @@
+from typing import Optional
 from package.prompt_hub import PromptHub
 from package.llms import ModelResponse, BaseLLM
 from package.utils.parse_string import parse_sql
@@ -9,9 +10,23 @@ class QueryMasterAgent:
     """
     def __init__(self, llm:BaseLLM):
         self.llm = llm
+        self.response: Optional[ModelResponse] = None  # last model response, for usage accounting
 
-    def run(self, messages:list) -> str:
+    def system_prompt(self, schema_prompt:Optional[str]=None):
+        """Static instructions first, then the per-project schema block, so both can be cached"""
+        if schema_prompt is None:
+            return PromptHub().generate_sql
+        return [PromptHub().generate_sql, schema_prompt]
+
+    def run(self, messages:list, schema_prompt:Optional[str]=None) -> str:
         """Generate SQL query based on table metadata and user question."""
-        response: ModelResponse = self.llm.run(PromptHub().generate_sql, messages)
+        response: ModelResponse = self.llm.run(self.system_prompt(schema_prompt), messages)
+        self.response = response
         sql_query = parse_sql(response.content)
-        return sql_query
\ No newline at end of file
+        return sql_query
+
+    async def arun(self, messages:list, schema_prompt:Optional[str]=None) -> str:
+        """Async version of run."""
+        response: ModelResponse = await self.llm.arun(self.system_prompt(schema_prompt), messages)
+        self.response = response
+        return parse_sql(response.content)
@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+from package.core.repositories import ProjectRepository, SessionRepository, FileRepository
+
+_request_memo: ContextVar[Optional[dict]] = ContextVar("access_memo", default=None)
+
+class AccessMemoMiddleware:
+    """Give every request its own memo of ownership lookups"""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        token = _request_memo.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_memo.reset(token)
+
+class AccessCache:
+    """
+    Ownership lookups for authorization checks.
+    Maps projects to their owner and sessions and files to their project.
+    Lookups go through a per-request memo, then a short-TTL in-process LRU,
+    then the repositories; only entities that exist are cached. Deletes in
+    this process invalidate immediately, deletes elsewhere within the TTL.
+    """
+    def __init__(self, project_repo: ProjectRepository, session_repo: SessionRepository, file_repo: FileRepository,
+                 ttl_seconds: float = 30, max_entries: int = 10000):
+        self.project_repo = project_repo
+        self.session_repo = session_repo
+        self.file_repo = file_repo
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memo_hits = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: tuple) -> Optional[str]:
+        memo = _request_memo.get()
+        if memo is not None and key in memo:
+            with self._lock:
+                self.memo_hits += 1
+            return memo[key]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() < entry[1]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if memo is not None:
+                    memo[key] = entry[0]
+                return entry[0]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def _put(self, key: tuple, value: str):
+        memo = _request_memo.get()
+        if memo is not None:
+            memo[key] = value
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _invalidate(self, key: tuple):
+        memo = _request_memo.get()
+        if memo is not None:
+            memo.pop(key, None)
+        with self._lock:
+            self._entries.pop(key, None)
+
+    async def project_owner(self, project_id: str) -> Optional[str]:
+        key = ('project', project_id)
+        owner = self._get(key)
+        if owner is None:
+            project = await self.project_repo.get_by_id(project_id)
+            if not project:
+                return None
+            owner = project.user_id
+            self._put(key, owner)
+        return owner
+
+    async def session_project(self, session_id: str) -> Optional[str]:
+        key = ('session', session_id)
+        project_id = self._get(key)
+        if project_id is None:
+            session = await self.session_repo.get_by_id(session_id)
+            if not session:
+                return None
+            project_id = session.project_id
+            self._put(key, project_id)
+        return project_id
+
+    async def file_project(self, file_id: str) -> Optional[str]:
+        key = ('file', file_id)
+        project_id = self._get(key)
+        if project_id is None:
+            file = await self.file_repo.get_by_id(file_id)
+            if not file:
+                return None
+            project_id = file.project_id
+            self._put(key, project_id)
+        return project_id
+
+    async def owns_project(self, project_id: str, user_id: str) -> bool:
+        return await self.project_owner(project_id) == user_id
+
+    async def owns_session(self, session_id: str, user_id: str) -> Optional[str]:
+        """Return the session's project id if the user owns it"""
+        project_id = await self.session_project(session_id)
+        if project_id and await self.owns_project(project_id, user_id):
+            return project_id
+        return None
+
+    async def owns_file(self, file_id: str, user_id: str) -> Optional[str]:
+        """Return the file's project id if the user owns it"""
+        project_id = await self.file_project(file_id)
+        if project_id and await self.owns_project(project_id, user_id):
+            return project_id
+        return None
+
+    def invalidate_project(self, project_id: str):
+        self._invalidate(('project', project_id))
+
+    def invalidate_session(self, session_id: str):
+        self._invalidate(('session', session_id))
+
+    def invalidate_file(self, file_id: str):
+        self._invalidate(('file', file_id))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                entries=len(self._entries),
+                memo_hits=self.memo_hits,
+                hits=self.hits,
+                misses=self.misses
+            )
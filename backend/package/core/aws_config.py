@@ -3,8 +3,10 @@ import boto3
 
 def get_aws_configs():
     session = boto3.Session()
+    credentials = session.get_credentials().get_frozen_credentials()
     aws_configs = AWSConfig(
-        aws_access_key_id=session.get_credentials().access_key,
-        aws_secret_access_key=session.get_credentials().secret_key,
+        aws_access_key_id=credentials.access_key,
+        aws_secret_access_key=credentials.secret_key,
+        aws_session_token=credentials.token,
         region_name=session.region_name,)
     return aws_configs
\ No newline at end of file
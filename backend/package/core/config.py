@@ -23,13 +23,72 @@ class Settings:
     SESSIONS_TABLE: str = f"{DYNAMODB_TABLE_PREFIX}sessions"
     FILES_TABLE: str = f"{DYNAMODB_TABLE_PREFIX}files"
     MESSAGES_TABLE: str = f"{DYNAMODB_TABLE_PREFIX}messages"
+    DYNAMODB_ENDPOINT_URL: str = os.getenv("DYNAMODB_ENDPOINT_URL", "")  # e.g. DynamoDB Local; empty uses AWS
+    DYNAMODB_MAX_POOL_CONNECTIONS: int = int(os.getenv("DYNAMODB_MAX_POOL_CONNECTIONS", "50"))  # dynamodb_async only
     
     # S3 Configuration
     S3_BUCKET: str = os.getenv("S3_BUCKET", "leonidas-dev-bucket")
     FILE_BUCKET: str = os.getenv("FILE_BUCKET", "leonidas-dev-uploads-9586b382")
     
+    # Data Catalog Configuration
+    CATALOG_CREDENTIAL_TTL_SECONDS: int = int(os.getenv("CATALOG_CREDENTIAL_TTL_SECONDS", "900"))
+    S3_CACHE_DIR: str = os.getenv("S3_CACHE_DIR", "/tmp/s3_cache")
+    S3_CACHE_MAX_BYTES: int = int(os.getenv("S3_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    S3_CACHE_VALIDATE_SECONDS: float = float(os.getenv("S3_CACHE_VALIDATE_SECONDS", "0"))
+    RESULT_CACHE_MAX_BYTES: int = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    RESULT_CACHE_TTL_SECONDS: float = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+    
+    # DuckDB Resource Limits
+    DUCKDB_MEMORY_LIMIT: str = os.getenv("DUCKDB_MEMORY_LIMIT", "256MB")
+    DUCKDB_THREADS: int = int(os.getenv("DUCKDB_THREADS", "0"))  # 0 keeps DuckDB's default
+    DUCKDB_TEMP_DIRECTORY: str = os.getenv("DUCKDB_TEMP_DIRECTORY", "/tmp/duckdb_spill")
+    QUERY_TIMEOUT_SECONDS: float = float(os.getenv("QUERY_TIMEOUT_SECONDS", "30"))
+    QUERY_MAX_ROWS: int = int(os.getenv("QUERY_MAX_ROWS", "10000"))
+    CATALOG_EXECUTOR_WORKERS: int = int(os.getenv("CATALOG_EXECUTOR_WORKERS", "4"))
+    CATALOG_EXECUTOR_QUEUE: int = int(os.getenv("CATALOG_EXECUTOR_QUEUE", "32"))
+    
     # Bedrock Configuration
     BEDROCK_MODEL_ID: str = os.getenv("BEDROCK_MODEL_ID", "anthropic.claude-3-sonnet-20240229-v1:0")
     MODEL_PROVIDER:str = os.getenv("MODEL_PROVIDER", "bedrock")
+    LLM_EXECUTOR_WORKERS: int = int(os.getenv("LLM_EXECUTOR_WORKERS", "16"))
+    LLM_EXECUTOR_QUEUE: int = int(os.getenv("LLM_EXECUTOR_QUEUE", "64"))
+    LLM_CONCURRENCY_INITIAL: int = int(os.getenv("LLM_CONCURRENCY_INITIAL", "8"))
+    LLM_CONCURRENCY_MIN: int = int(os.getenv("LLM_CONCURRENCY_MIN", "1"))
+    LLM_CONCURRENCY_MAX: int = int(os.getenv("LLM_CONCURRENCY_MAX", "32"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_RETRY_BASE_SECONDS: float = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+    LLM_RETRY_MAX_SECONDS: float = float(os.getenv("LLM_RETRY_MAX_SECONDS", "8"))
+    LLM_BREAKER_THRESHOLD: int = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+    LLM_BREAKER_RESET_SECONDS: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+    
+    # Record/replay LLM for offline benchmarks: "off", "record" or "replay"
+    LLM_REPLAY_MODE: str = os.getenv("LLM_REPLAY_MODE", "off")
+    LLM_REPLAY_CASSETTE: str = os.getenv("LLM_REPLAY_CASSETTE", "/tmp/llm_cassette.jsonl")
+    LLM_REPLAY_DELEGATE: str = os.getenv("LLM_REPLAY_DELEGATE", "OPENAI_20b_BR")
+    # Unset keeps the recorded latency and token counts
+    LLM_REPLAY_LATENCY_MS: Optional[int] = int(os.getenv("LLM_REPLAY_LATENCY_MS")) if os.getenv("LLM_REPLAY_LATENCY_MS") else None
+    LLM_REPLAY_INPUT_TOKENS: Optional[int] = int(os.getenv("LLM_REPLAY_INPUT_TOKENS")) if os.getenv("LLM_REPLAY_INPUT_TOKENS") else None
+    LLM_REPLAY_OUTPUT_TOKENS: Optional[int] = int(os.getenv("LLM_REPLAY_OUTPUT_TOKENS")) if os.getenv("LLM_REPLAY_OUTPUT_TOKENS") else None
+    
+    CONTEXT_HISTORY_LIMIT: int = int(os.getenv("CONTEXT_HISTORY_LIMIT", "10"))
+    SQL_STAGE_TIMEOUT_SECONDS: float = float(os.getenv("SQL_STAGE_TIMEOUT_SECONDS", "60"))
+    CHART_STAGE_TIMEOUT_SECONDS: float = float(os.getenv("CHART_STAGE_TIMEOUT_SECONDS", "30"))
+    ANSWER_STAGE_TIMEOUT_SECONDS: float = float(os.getenv("ANSWER_STAGE_TIMEOUT_SECONDS", "90"))
+    
+    # Generated SQL Cache
+    SQL_CACHE_ENABLED: bool = os.getenv("SQL_CACHE_ENABLED", "true").lower() == "true"
+    SQL_CACHE_TTL_SECONDS: int = int(os.getenv("SQL_CACHE_TTL_SECONDS", "86400"))
+    SQL_CACHE_MAX_ENTRIES: int = int(os.getenv("SQL_CACHE_MAX_ENTRIES", "1024"))
+    SQL_CACHE_HISTORY_WINDOW: int = int(os.getenv("SQL_CACHE_HISTORY_WINDOW", "4"))
+    SQL_CACHE_TABLE: str = os.getenv("SQL_CACHE_TABLE", "")  # empty keeps the cache in-process only
+    
+    # Authorization Cache
+    AUTH_CACHE_TTL_SECONDS: float = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))  # 0 keeps only the per-request memo
+    AUTH_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+    
+    # Ollama Configuration
+    OLLAMA_TIMEOUT_SECONDS: float = float(os.getenv("OLLAMA_TIMEOUT_SECONDS", "120"))
+    OLLAMA_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("OLLAMA_CONNECT_TIMEOUT_SECONDS", "5"))
+    OLLAMA_MAX_CONNECTIONS: int = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "20"))
 
 settings = Settings()
\ No newline at end of file
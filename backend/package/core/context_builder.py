@@ -0,0 +1,71 @@
+from typing import Dict, List
+from pydantic import BaseModel
+
+def estimate_tokens(text: str) -> int:
+    """Rough local token count, about four characters per token"""
+    return (len(text) + 3) // 4
+
+class ContextPolicy(BaseModel):
+    max_messages: int
+    max_tokens: int
+    max_share: float  # share of the model context window the history may use
+    max_message_tokens: int
+    include_assistant: bool = True
+
+# SQL needs the earlier questions more than the earlier answers, the chart only
+# needs the current data, and the answer gets the widest view of the conversation
+STAGE_POLICIES: Dict[str, ContextPolicy] = {
+    "sql": ContextPolicy(max_messages=6, max_tokens=1500, max_share=0.25, max_message_tokens=300),
+    "chart": ContextPolicy(max_messages=2, max_tokens=300, max_share=0.05, max_message_tokens=150, include_assistant=False),
+    "answer": ContextPolicy(max_messages=10, max_tokens=6000, max_share=0.5, max_message_tokens=1500),
+}
+
+def trim(content: str, max_tokens: int) -> str:
+    if estimate_tokens(content) <= max_tokens:
+        return content
+    return content[:max_tokens * 4] + "\n...[truncated]"
+
+class ContextBuilder:
+    """
+    Builds the message list for each LLM stage from the session history.
+    History is taken newest first, long messages are trimmed and selection
+    stops at the stage's message and token budget; the tokens left out
+    compared with sending the full history are accumulated in saved_tokens.
+    """
+    def __init__(self, history: List[dict], context_window: int):
+        self.history = history  # chronological, without the current question
+        self.context_window = context_window
+        self.full_tokens = sum(estimate_tokens(m['content']) for m in history)
+        self.saved_tokens = 0
+
+    def build(self, stage: str, prompt: str) -> List[dict]:
+        """History for the stage followed by the prompt as the final user message"""
+        policy = STAGE_POLICIES[stage]
+        budget = min(policy.max_tokens, int(self.context_window * policy.max_share))
+        budget = max(0, budget - estimate_tokens(prompt))
+
+        selected, used = [], 0
+        for message in reversed(self.history):
+            if len(selected) >= policy.max_messages:
+                break
+            if message['role'] != 'user' and not policy.include_assistant:
+                continue
+            content = trim(message['content'], policy.max_message_tokens)
+            tokens = estimate_tokens(content)
+            if used + tokens > budget:
+                break
+            selected.append(dict(role=message['role'], content=content))
+            used += tokens
+        selected.reverse()
+
+        # Bedrock expects the conversation to start with the user and alternate roles
+        while selected and selected[0]['role'] != 'user':
+            used -= estimate_tokens(selected.pop(0)['content'])
+        self.saved_tokens += self.full_tokens - used
+        messages = []
+        for message in selected + [dict(role='user', content=prompt)]:
+            if messages and messages[-1]['role'] == message['role']:
+                messages[-1] = dict(role=message['role'], content=f"{messages[-1]['content']}\n\n{message['content']}")
+            else:
+                messages.append(message)
+        return messages
@@ -1,8 +1,20 @@
 import duckdb
-from typing import Optional
+from typing import Optional, Callable, Iterator, AsyncIterator
+from contextlib import contextmanager, asynccontextmanager
 from pydantic import BaseModel
+from uuid import uuid4
+from package.core.object_cache import S3ObjectCache
+from package.core.result_cache import QueryResultCache
+from package.core.executor import BoundedExecutor, ExecutorSaturatedError
 import pandas as pd
+import pyarrow as pa
+import threading
+import asyncio
+import time
 import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 class AWSConfig(BaseModel):
     aws_access_key_id: Optional[str] = None
@@ -10,64 +22,138 @@ class AWSConfig(BaseModel):
     region_name: Optional[str] = 'ap-southeast-1'
     aws_session_token: Optional[str] = None
 
+class QueryLimits(BaseModel):
+    memory_limit: Optional[str] = None
+    threads: Optional[int] = None
+    temp_directory: Optional[str] = None
+    timeout_seconds: Optional[float] = None
+    max_rows: Optional[int] = None
+
+class QueryError(Exception):
+    """A query rejected or aborted by DataCatalog, safe to show to the user"""
+    code = "query_failed"
+    status_code = 422
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+    def to_dict(self) -> dict:
+        return dict(code=self.code, message=self.message)
+
+class QueryTimeoutError(QueryError):
+    code = "query_timeout"
+    status_code = 408
+
+class QueryMemoryError(QueryError):
+    code = "query_memory_limit"
+
+class QueryRowLimitError(QueryError):
+    code = "query_row_limit"
+
+# Markers of S3 requests DuckDB had rejected for their credentials
+S3_AUTH_ERRORS = ("HTTP 403", "ExpiredToken", "InvalidAccessKeyId", "InvalidToken", "SignatureDoesNotMatch")
+
+def _is_s3_auth_error(error: BaseException) -> bool:
+    message = str(error)
+    return any(marker in message for marker in S3_AUTH_ERRORS)
+
+def _validate_config(aws_configs) -> dict:
+    """Validate and convert AWSConfig to dictionary"""
+    if isinstance(aws_configs, AWSConfig):
+        return aws_configs.model_dump()
+    elif isinstance(aws_configs, dict):
+        # Validate dict has required fields
+        AWSConfig(**aws_configs)  # This will raise ValidationError if invalid
+        return aws_configs
+    else:
+        raise TypeError("aws_configs must be AWSConfig instance or dict")
+
+def _load_httpfs(conn) -> bool:
+    """Load the httpfs extension, installing it first when needed"""
+    try:
+        # Try to load first (for Docker/Lambda)
+        conn.execute("LOAD httpfs")
+    except Exception:
+        try:
+            # If load fails, install then load (for local)
+            conn.execute("INSTALL httpfs")
+            conn.execute("LOAD httpfs")
+        except Exception as e:
+            logger.warning("Failed to install/load httpfs: %s", e)
+            return False
+    return True
+
+def _create_s3_secret(conn, aws_access_key_id=None, aws_secret_access_key=None, region_name='ap-southeast-1', aws_session_token=None):
+    """Create or replace the S3 secret used by httpfs"""
+    if aws_access_key_id and aws_secret_access_key:
+        secret_sql = f"""
+        CREATE OR REPLACE SECRET s3_secret (
+            TYPE s3,
+            PROVIDER config,
+            KEY_ID '{aws_access_key_id}',
+            SECRET '{aws_secret_access_key}',
+            REGION '{region_name}'"""
+        if aws_session_token:
+            secret_sql += f",\n                SESSION_TOKEN '{aws_session_token}'"
+        secret_sql += "\n            )"
+        conn.execute(secret_sql)
+    else:
+        conn.execute("""
+        CREATE OR REPLACE SECRET s3_secret (
+            TYPE s3,
+            PROVIDER credential_chain
+        )""")
+
+def _connect():
+    """Open a DuckDB connection usable inside Lambda"""
+    # Set HOME directory for Lambda environment
+    if not os.environ.get('HOME'):
+        os.environ['HOME'] = '/tmp'
+    return duckdb.connect()
+
+def _apply_limits(conn, limits: QueryLimits):
+    """Apply database-wide resource settings"""
+    if limits.memory_limit:
+        conn.execute(f"SET memory_limit = '{limits.memory_limit}'")
+    if limits.threads:
+        conn.execute(f"SET threads = {int(limits.threads)}")
+    if limits.temp_directory:
+        os.makedirs(limits.temp_directory, exist_ok=True)
+        conn.execute(f"SET temp_directory = '{limits.temp_directory}'")
+
 class DataCatalog:
-    def __init__(self, aws_configs:Optional[AWSConfig]=None):
-        # Set HOME directory for Lambda environment
-        if not os.environ.get('HOME'):
-            os.environ['HOME'] = '/tmp'
-        
-        self._conn = duckdb.connect()
+    def __init__(self, aws_configs:Optional[AWSConfig]=None, connection=None, object_cache:Optional[S3ObjectCache]=None,
+                 result_cache:Optional[QueryResultCache]=None, limits:Optional[QueryLimits]=None,
+                 executor:Optional[BoundedExecutor]=None):
+        """Create a catalog on its own connection, or on a warm one handed out by CatalogPool"""
+        self._conn = connection if connection is not None else _connect()
+        self.object_cache = object_cache
+        self.result_cache = result_cache
+        self.limits = limits or QueryLimits()
+        self.executor = executor
+        self._prefetched = {}
+        self._pinned = []
+        if connection is None:
+            _apply_limits(self._conn, self.limits)
         self._tables = {}
         self._relationships = []  # Store table relationships
-        if aws_configs:
-            self._setup_s3(**self._validate_config(aws_configs))
-
-    def _validate_config(self, aws_configs):
-        """Validate and convert AWSConfig to dictionary"""
-        if isinstance(aws_configs, AWSConfig):
-            return aws_configs.model_dump()
-        elif isinstance(aws_configs, dict):
-            # Validate dict has required fields
-            AWSConfig(**aws_configs)  # This will raise ValidationError if invalid
-            return aws_configs
-        else:
-            raise TypeError("aws_configs must be AWSConfig instance or dict")
+        if aws_configs and connection is None:
+            self._setup_s3(**_validate_config(aws_configs))
 
-    def _setup_s3(self, aws_access_key_id=None, aws_secret_access_key=None, region_name='ap-southeast-1', aws_session_token=None):
+    def _setup_s3(self, **aws_configs):
         """Setup S3 connection using your existing logic"""
-        try:
-            # Try to load first (for Docker/Lambda)
-            self._conn.execute("LOAD httpfs")
-        except Exception:
-            try:
-                # If load fails, install then load (for local)
-                self._conn.execute("INSTALL httpfs")
-                self._conn.execute("LOAD httpfs")
-            except Exception as e:
-                print(f"Warning: Failed to install/load httpfs: {e}")
-                return
-        
-        if aws_access_key_id and aws_secret_access_key:
-            secret_sql = f"""
-            CREATE OR REPLACE SECRET s3_secret (
-                TYPE s3,
-                PROVIDER config,
-                KEY_ID '{aws_access_key_id}',
-                SECRET '{aws_secret_access_key}',
-                REGION '{region_name}'"""
-            if aws_session_token:
-                secret_sql += f",\n                SESSION_TOKEN '{aws_session_token}'"
-            secret_sql += "\n            )"
-            self._conn.execute(secret_sql)
-        else:
-            self._conn.execute("""
-            CREATE OR REPLACE SECRET s3_secret (
-                TYPE s3,
-                PROVIDER credential_chain
-            )""")
-
-    def register(self, name: str, source, table_description: str = '', metadata=None):
-        """Universal table creation method"""
+        if _load_httpfs(self._conn):
+            _create_s3_secret(self._conn, **aws_configs)
+
+    def register(self, name: str, source, table_description: str = '', metadata=None, materialize: bool = False,
+                 file_id: Optional[str] = None, version: Optional[str] = None):
+        """
+        Universal table creation method.
+        File sources become lazy views so DuckDB pushes projections, filters and
+        LIMITs into the scan; materialize=True copies the data into a table instead.
+        file_id and version (e.g. updated_at) identify the dataset for the result cache.
+        """
         if isinstance(source, pd.DataFrame):
             # Pandas DataFrame
             self._conn.register(name, source)
@@ -76,17 +162,19 @@ class DataCatalog:
         
         elif isinstance(source, str):
             # File path (local or S3)
-            if source.startswith('s3://'):
-                if source.endswith('.parquet'):
-                    self._conn.execute(f"CREATE TABLE '{name}' AS SELECT * FROM read_parquet('{source}')")
-                    source_type = 's3_parquet'
+            reader = 'read_parquet' if source.endswith('.parquet') else 'read_csv_auto'
+            location = 's3' if source.startswith('s3://') else 'local'
+            source_type = f"{location}_{'parquet' if reader == 'read_parquet' else 'csv'}"
+            scan_path, etag = source, None
+            if location == 's3' and self.object_cache:
+                if source in self._prefetched:
+                    local_path, etag = self._prefetched.pop(source)
                 else:
-                    self._conn.execute(f"CREATE TABLE '{name}' AS SELECT * FROM read_csv_auto('{source}')")
-                    source_type = 's3_csv'
-            else:
-                # Local file
-                self._conn.execute(f"CREATE TABLE '{name}' AS SELECT * FROM read_csv_auto('{source}')")
-                source_type = 'local_csv'
+                    local_path, etag = self.object_cache.fetch(source)
+                    self._pinned.append(local_path)
+                scan_path = local_path or source
+            relation = 'TABLE' if materialize else 'VIEW'
+            self._conn.execute(f"CREATE {relation} '{name}' AS SELECT * FROM {reader}('{scan_path}')")
             source_path = source
         
         else:
@@ -96,8 +184,254 @@ class DataCatalog:
             'type': source_type, 
             'path': source_path, 
             'table_description': table_description,
-            'metadata': metadata
+            'metadata': metadata,
+            'materialized': materialize if source_path else False,
+            'etag': etag if source_path else None,
+            'file_id': file_id,
+            'version': version
         }            
     
+    def sniff_schema(self, source: str, sample_size: int = 20480):
+        """
+        Describe a file's columns from a bounded sample instead of a full scan.
+        Returns the column_name/column_type frame FileMetadata.from_dataframe expects.
+        """
+        if source.endswith('.parquet'):
+            relation = f"read_parquet('{source}')"
+        else:
+            relation = f"read_csv_auto('{source}', sample_size={sample_size})"
+        return self._conn.execute(f"DESCRIBE SELECT * FROM {relation}").df()
+
+    def export_parquet(self, source: str, target: str, compression: str = 'zstd'):
+        """Write a typed, compressed Parquet copy of a CSV source"""
+        self._conn.execute(
+            f"COPY (SELECT * FROM read_csv_auto('{source}')) TO '{target}' (FORMAT parquet, COMPRESSION {compression})"
+        )
+    
+    def query_arrow(self, sql: str) -> pa.Table:
+        """Run a query and keep the result in Arrow, without a pandas copy"""
+        key = self.result_cache.make_key(sql, self._tables) if self.result_cache else None
+        if key:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+        result = self._execute_governed(sql)
+        if key:
+            file_ids = [info['file_id'] for info in self._tables.values() if info['file_id']]
+            self.result_cache.put(key, result, file_ids)
+        return result
+
+    def _execute_governed(self, sql: str) -> pa.Table:
+        """Execute with the wall-clock timeout and row cap, mapping failures to QueryError"""
+        timed_out = threading.Event()
+
+        def interrupt():
+            timed_out.set()
+            self._conn.interrupt()
+
+        timer = threading.Timer(self.limits.timeout_seconds, interrupt) if self.limits.timeout_seconds else None
+        if timer:
+            timer.start()
+        try:
+            result = self._conn.execute(sql)
+            if not self.limits.max_rows:
+                return result.to_arrow_table()
+            reader = result.to_arrow_reader(min(self.limits.max_rows + 1, 100_000))
+            batches, rows = [], 0
+            for batch in reader:
+                rows += batch.num_rows
+                if rows > self.limits.max_rows:
+                    raise QueryRowLimitError(f"Query returned more than {self.limits.max_rows} rows; add filters, aggregation or a LIMIT")
+                batches.append(batch)
+            return pa.Table.from_batches(batches, schema=reader.schema)
+        except duckdb.InterruptException:
+            if timed_out.is_set():
+                raise QueryTimeoutError(f"Query exceeded the {self.limits.timeout_seconds:g}s time limit")
+            raise QueryError("Query was interrupted")
+        except duckdb.OutOfMemoryException:
+            raise QueryMemoryError(f"Query exceeded the {self.limits.memory_limit or 'configured'} memory limit")
+        except duckdb.Error as e:
+            raise QueryError(str(e))
+        finally:
+            if timer:
+                timer.cancel()
+
     def query(self, sql: str):
-        return self._conn.execute(sql).df()
\ No newline at end of file
+        return self.query_arrow(sql).to_pandas()
+
+    async def _run(self, fn, *args, **kwargs):
+        """Run blocking DuckDB work off the event loop"""
+        if self.executor:
+            return await self.executor.run(fn, *args, **kwargs)
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def release(self):
+        """Unpin the cached files this catalog's views read; call once its tables are dropped"""
+        if self.object_cache:
+            for path in self._pinned:
+                self.object_cache.release(path)
+        self._pinned = []
+        self._prefetched = {}
+
+    async def aregister(self, name: str, source, **kwargs):
+        return await self._run(self.register, name, source, **kwargs)
+
+    async def aregister_many(self, tables: list):
+        """
+        Register several sources at once; tables is a list of register() kwargs.
+        S3 objects are fetched into the object cache in parallel, then the
+        views are created one after another on this catalog's cursor.
+        """
+        if self.object_cache:
+            sources = list({t['source'] for t in tables if isinstance(t['source'], str) and t['source'].startswith('s3://')})
+            fetched = await asyncio.gather(*[self._run(self.object_cache.fetch, source) for source in sources], return_exceptions=True)
+            for source, result in zip(sources, fetched):
+                if not isinstance(result, BaseException):
+                    self._pinned.append(result[0])
+                    self._prefetched[source] = result
+            errors = [result for result in fetched if isinstance(result, BaseException)]
+            if errors:
+                raise errors[0]
+
+        def register_all():
+            for table in tables:
+                self.register(**table)
+        await self._run(register_all)
+
+    async def asniff_schema(self, source: str, **kwargs):
+        return await self._run(self.sniff_schema, source, **kwargs)
+
+    async def aexport_parquet(self, source: str, target: str, **kwargs):
+        return await self._run(self.export_parquet, source, target, **kwargs)
+
+    async def aquery_arrow(self, sql: str) -> pa.Table:
+        return await self._run(self.query_arrow, sql)
+
+    async def aquery(self, sql: str):
+        return await self._run(self.query, sql)
+
+class CatalogPool:
+    """
+    Process-wide DuckDB database shared by every request in a warm container.
+    httpfs is loaded and the S3 secret created once; each lease gets its own
+    cursor and schema so requests never see each other's tables. A failed
+    httpfs load is retried on later leases with exponential backoff.
+    """
+    HTTPFS_RETRY_SECONDS = 1.0
+    HTTPFS_MAX_RETRY_SECONDS = 60.0
+
+    def __init__(self, aws_config_provider:Optional[Callable[[], AWSConfig]]=None, credential_ttl_seconds:int=900,
+                 object_cache:Optional[S3ObjectCache]=None, result_cache:Optional[QueryResultCache]=None,
+                 limits:Optional[QueryLimits]=None, executor:Optional[BoundedExecutor]=None):
+        self.aws_config_provider = aws_config_provider
+        self.credential_ttl_seconds = credential_ttl_seconds
+        self.object_cache = object_cache
+        self.result_cache = result_cache
+        self.limits = limits or QueryLimits()
+        self.executor = executor or BoundedExecutor(name="catalog")
+        self._conn = None
+        self._s3_ready = False
+        self._httpfs_retry_at = 0.0
+        self._httpfs_backoff = self.HTTPFS_RETRY_SECONDS
+        self._credentials_loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _ensure_ready(self):
+        """Open the shared connection and refresh S3 credentials when they are stale"""
+        if self._conn is None:
+            self._conn = _connect()
+            _apply_limits(self._conn, self.limits)
+        if not self._s3_ready and time.monotonic() >= self._httpfs_retry_at:
+            self._load_httpfs()
+        if not self._s3_ready or self.aws_config_provider is None:
+            return
+        if time.monotonic() - self._credentials_loaded_at >= self.credential_ttl_seconds:
+            _create_s3_secret(self._conn, **_validate_config(self.aws_config_provider()))
+            self._credentials_loaded_at = time.monotonic()
+
+    def _load_httpfs(self):
+        """Load httpfs, scheduling the next attempt further out after each failure"""
+        self._s3_ready = _load_httpfs(self._conn)
+        if self._s3_ready:
+            self._httpfs_backoff = self.HTTPFS_RETRY_SECONDS
+            return
+        self._httpfs_retry_at = time.monotonic() + self._httpfs_backoff
+        self._httpfs_backoff = min(self._httpfs_backoff * 2, self.HTTPFS_MAX_RETRY_SECONDS)
+
+    def invalidate_credentials(self):
+        """Force the next lease to reload S3 credentials; leases call it when S3 rejects them"""
+        with self._lock:
+            self._credentials_loaded_at = 0.0
+
+    def _check_credentials(self, error: Exception):
+        if _is_s3_auth_error(error):
+            # Session credentials can expire before the TTL runs out
+            self.invalidate_credentials()
+
+    def _open(self):
+        """Create an isolated cursor and schema on the shared connection"""
+        with self._lock:
+            self._ensure_ready()
+            cursor = self._conn.cursor()
+        schema = f"req_{uuid4().hex}"
+        try:
+            cursor.execute(f'CREATE SCHEMA "{schema}"')
+            cursor.execute(f"SET schema = '{schema}'")
+        except Exception:
+            cursor.close()
+            raise
+        catalog = DataCatalog(
+            connection=cursor,
+            object_cache=self.object_cache,
+            result_cache=self.result_cache,
+            limits=self.limits,
+            executor=self.executor
+        )
+        return catalog, cursor, schema
+
+    def _close(self, catalog, cursor, schema):
+        try:
+            cursor.execute(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE')
+        finally:
+            cursor.close()
+            catalog.release()
+
+    @contextmanager
+    def lease(self) -> Iterator[DataCatalog]:
+        """Hand out a DataCatalog bound to an isolated cursor and schema"""
+        catalog, cursor, schema = self._open()
+        try:
+            yield catalog
+        except Exception as e:
+            self._check_credentials(e)
+            raise
+        finally:
+            self._close(catalog, cursor, schema)
+
+    @asynccontextmanager
+    async def alease(self) -> AsyncIterator[DataCatalog]:
+        """Async lease; connection setup and cleanup run on the catalog executor"""
+        catalog, cursor, schema = await self.executor.run(self._open)
+        try:
+            yield catalog
+        except Exception as e:
+            self._check_credentials(e)
+            raise
+        finally:
+            try:
+                await self.executor.run(self._close, catalog, cursor, schema)
+            except ExecutorSaturatedError:
+                # Never leak the cursor; dropping an empty schema is cheap
+                self._close(catalog, cursor, schema)
+
+    def invalidate_file(self, file_id: str):
+        """Forget cached query results that read a file that was changed or removed"""
+        if self.result_cache:
+            self.result_cache.invalidate_file(file_id)
+
+    def stats(self) -> dict:
+        return dict(
+            object_cache=self.object_cache.stats() if self.object_cache else None,
+            result_cache=self.result_cache.stats() if self.result_cache else None,
+            executor=self.executor.stats()
+        )
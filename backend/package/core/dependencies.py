@@ -1,4 +1,6 @@
+import boto3
 from functools import lru_cache
+from typing import Optional
 from package.core.config import settings
 from package.core.repositories import UserRepository, ProjectRepository, SessionRepository, FileRepository, MessageRepository
 from package.databases.dynamodb.user_repository import DynamoDBUserRepository
@@ -6,11 +8,25 @@ from package.databases.dynamodb.project_repository import DynamoDBProjectReposit
 from package.databases.dynamodb.session_repository import DynamoDBSessionRepository
 from package.databases.dynamodb.file_repository import DynamoDBFileRepository
 from package.databases.dynamodb.message_repository import DynamoDBMessageRepository
+from package.databases.dynamodb_async.user_repository import AsyncDynamoDBUserRepository
+from package.databases.dynamodb_async.project_repository import AsyncDynamoDBProjectRepository
+from package.databases.dynamodb_async.session_repository import AsyncDynamoDBSessionRepository
+from package.databases.dynamodb_async.file_repository import AsyncDynamoDBFileRepository
+from package.databases.dynamodb_async.message_repository import AsyncDynamoDBMessageRepository
+from package.core.data_catalog import CatalogPool, QueryLimits
+from package.core.object_cache import S3ObjectCache
+from package.core.result_cache import QueryResultCache
+from package.core.executor import BoundedExecutor
+from package.core.sql_cache import SQLCache
+from package.core.access_cache import AccessCache
+from package.core.aws_config import get_aws_configs
 
 @lru_cache()
 def get_user_repository() -> UserRepository:
     if settings.DATABASE_TYPE == "dynamodb":
         return DynamoDBUserRepository()
+    elif settings.DATABASE_TYPE == "dynamodb_async":
+        return AsyncDynamoDBUserRepository()
     else:
         raise ValueError(f"Unsupported database: {settings.DATABASE_TYPE}")
 
@@ -18,6 +34,8 @@ def get_user_repository() -> UserRepository:
 def get_project_repository() -> ProjectRepository:
     if settings.DATABASE_TYPE == "dynamodb":
         return DynamoDBProjectRepository()
+    elif settings.DATABASE_TYPE == "dynamodb_async":
+        return AsyncDynamoDBProjectRepository()
     else:
         raise ValueError(f"Unsupported database: {settings.DATABASE_TYPE}")
 
@@ -25,6 +43,8 @@ def get_project_repository() -> ProjectRepository:
 def get_session_repository() -> SessionRepository:
     if settings.DATABASE_TYPE == "dynamodb":
         return DynamoDBSessionRepository()
+    elif settings.DATABASE_TYPE == "dynamodb_async":
+        return AsyncDynamoDBSessionRepository()
     else:
         raise ValueError(f"Unsupported database: {settings.DATABASE_TYPE}")
 
@@ -32,6 +52,8 @@ def get_session_repository() -> SessionRepository:
 def get_file_repository() -> FileRepository:
     if settings.DATABASE_TYPE == "dynamodb":
         return DynamoDBFileRepository()
+    elif settings.DATABASE_TYPE == "dynamodb_async":
+        return AsyncDynamoDBFileRepository()
     else:
         raise ValueError(f"Unsupported database: {settings.DATABASE_TYPE}")
 
@@ -39,9 +61,62 @@ def get_file_repository() -> FileRepository:
 def get_message_repository() -> MessageRepository:
     if settings.DATABASE_TYPE == "dynamodb":
         return DynamoDBMessageRepository()
+    elif settings.DATABASE_TYPE == "dynamodb_async":
+        return AsyncDynamoDBMessageRepository()
     else:
         raise ValueError(f"Unsupported database: {settings.DATABASE_TYPE}")
 
+@lru_cache()
+def get_catalog_pool() -> CatalogPool:
+    return CatalogPool(
+        aws_config_provider=get_aws_configs,
+        credential_ttl_seconds=settings.CATALOG_CREDENTIAL_TTL_SECONDS,
+        object_cache=S3ObjectCache(
+            cache_dir=settings.S3_CACHE_DIR,
+            max_bytes=settings.S3_CACHE_MAX_BYTES,
+            validate_after_seconds=settings.S3_CACHE_VALIDATE_SECONDS
+        ),
+        result_cache=QueryResultCache(
+            max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+            ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS
+        ),
+        limits=QueryLimits(
+            memory_limit=settings.DUCKDB_MEMORY_LIMIT,
+            threads=settings.DUCKDB_THREADS,
+            temp_directory=settings.DUCKDB_TEMP_DIRECTORY,
+            timeout_seconds=settings.QUERY_TIMEOUT_SECONDS,
+            max_rows=settings.QUERY_MAX_ROWS
+        ),
+        executor=BoundedExecutor(
+            max_workers=settings.CATALOG_EXECUTOR_WORKERS,
+            max_queue=settings.CATALOG_EXECUTOR_QUEUE,
+            name="catalog"
+        )
+    )
+
+@lru_cache()
+def get_sql_cache() -> Optional[SQLCache]:
+    if not settings.SQL_CACHE_ENABLED:
+        return None
+    table = None
+    if settings.SQL_CACHE_TABLE:
+        table = boto3.resource('dynamodb', region_name=settings.AWS_REGION).Table(settings.SQL_CACHE_TABLE)
+    return SQLCache(
+        ttl_seconds=settings.SQL_CACHE_TTL_SECONDS,
+        max_entries=settings.SQL_CACHE_MAX_ENTRIES,
+        table=table
+    )
+
+@lru_cache()
+def get_access_cache() -> AccessCache:
+    return AccessCache(
+        get_project_repository(),
+        get_session_repository(),
+        get_file_repository(),
+        ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+        max_entries=settings.AUTH_CACHE_MAX_ENTRIES
+    )
+
 # Services
 from package.services.auth_service import AuthService
 
@@ -53,19 +128,19 @@ from package.services.project_service import ProjectService
 
 @lru_cache()
 def get_project_service() -> ProjectService:
-    return ProjectService(get_project_repository(), get_file_repository(), get_session_repository())
+    return ProjectService(get_project_repository(), get_file_repository(), get_session_repository(), get_access_cache())
 
 from package.services.session_service import SessionService
 
 @lru_cache()
 def get_session_service() -> SessionService:
-    return SessionService(get_session_repository(), get_project_repository())
+    return SessionService(get_session_repository(), get_project_repository(), get_access_cache())
 
 from package.services.file_service import FileService
 
 @lru_cache()
 def get_file_service() -> FileService:
-    return FileService(get_file_repository(), get_project_repository())
+    return FileService(get_file_repository(), get_project_repository(), get_catalog_pool(), get_access_cache())
 
 from package.services.chat_service import ChatService
 
@@ -75,5 +150,8 @@ def get_chat_service() -> ChatService:
         get_message_repository(),
         get_session_repository(), 
         get_project_repository(),
-        get_file_repository()
+        get_file_repository(),
+        get_catalog_pool(),
+        get_access_cache(),
+        get_sql_cache()
     )
\ No newline at end of file
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class ExecutorSaturatedError(Exception):
+    """Raised when a BoundedExecutor already has max_queue tasks waiting"""
+    pass
+
+class BoundedExecutor:
+    """
+    Fixed-size thread pool for blocking work called from async code.
+    At most max_queue tasks may wait for a free worker, so a burst fails fast
+    instead of piling up; queue depth and wait time are tracked for sizing.
+    """
+    def __init__(self, max_workers: int = 4, max_queue: int = 32, name: str = "executor"):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_ms = 0.0
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the pool and await its result"""
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturatedError(f"{self.name} has {self.queued} tasks waiting")
+            self.in_flight += 1
+            self.submitted += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        enqueued_at = time.monotonic()
+
+        def task():
+            with self._lock:
+                self.running += 1
+                self.total_wait_ms += (time.monotonic() - enqueued_at) * 1000
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        def on_done(future):
+            with self._lock:
+                self.in_flight -= 1
+
+        future = self._pool.submit(task)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    @property
+    def queued(self) -> int:
+        """Tasks waiting for a free worker"""
+        return max(0, self.in_flight - self.max_workers)
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self.completed + self.running
+            return dict(
+                max_workers=self.max_workers,
+                max_queue=self.max_queue,
+                queued=self.queued,
+                running=self.running,
+                peak_queued=self.peak_queued,
+                submitted=self.submitted,
+                completed=self.completed,
+                rejected=self.rejected,
+                avg_wait_ms=round(self.total_wait_ms / started, 2) if started else 0.0
+            )
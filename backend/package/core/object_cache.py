@@ -0,0 +1,170 @@
+import boto3
+import hashlib
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from pydantic import BaseModel
+
+class CacheEntry(BaseModel):
+    etag: str
+    path: str
+    size: int
+    validated_at: float
+
+def parse_s3_uri(uri: str) -> Tuple[str, str]:
+    """Split s3://bucket/key into (bucket, key)"""
+    bucket, _, key = uri[len("s3://"):].partition("/")
+    return bucket, key
+
+def _delete(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class S3ObjectCache:
+    """
+    Local copy of S3 objects kept under /tmp for warm containers.
+    Entries are keyed by bucket, key and ETag, evicted least-recently-used once
+    the byte budget is exceeded, and revalidated with a HEAD request.
+    fetch() pins the returned file until release(), so views still reading it
+    are never left without their file: pinned entries are skipped by eviction
+    and replaced files are deleted once their last pin is released.
+    """
+    KEY_LOCKS = 64
+
+    def __init__(self, cache_dir: str = "/tmp/s3_cache", max_bytes: int = 256 * 1024 * 1024,
+                 validate_after_seconds: float = 0, s3_client=None):
+        # One directory per process so uvicorn workers never evict each other's files
+        self.cache_dir = os.path.join(cache_dir, str(os.getpid()))
+        self.max_bytes = max_bytes
+        self.validate_after_seconds = validate_after_seconds
+        self._s3_client = s3_client
+        self._entries: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self._key_locks = [threading.Lock() for _ in range(self.KEY_LOCKS)]
+        self._pins = {}
+        self._orphans = set()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def s3_client(self):
+        if self._s3_client is None:
+            self._s3_client = boto3.client('s3')
+        return self._s3_client
+
+    def _local_path(self, bucket: str, key: str, etag: str) -> str:
+        digest = hashlib.sha256(f"{bucket}/{key}/{etag}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}{os.path.splitext(key)[1]}")
+
+    def _key_lock(self, cache_key) -> threading.Lock:
+        # Striped so the lock table stays bounded however many keys pass through
+        return self._key_locks[hash(cache_key) % self.KEY_LOCKS]
+
+    def _pin(self, path: str):
+        self._pins[path] = self._pins.get(path, 0) + 1
+
+    def release(self, path: Optional[str]):
+        """Drop a pin taken by fetch(); deletes the file if it was replaced or evicted meanwhile"""
+        if path is None:
+            return
+        with self._lock:
+            count = self._pins.get(path, 0) - 1
+            if count > 0:
+                self._pins[path] = count
+                return
+            self._pins.pop(path, None)
+            if path not in self._orphans:
+                return
+            self._orphans.discard(path)
+        _delete(path)
+
+    def fetch(self, uri: str) -> Tuple[Optional[str], str]:
+        """
+        Return (local_path, etag) for an S3 object; local_path is None when it does not fit the budget.
+        A returned local_path is pinned and must be passed to release() once no longer read.
+        """
+        bucket, key = parse_s3_uri(uri)
+        cache_key = (bucket, key)
+        with self._key_lock(cache_key):
+            with self._lock:
+                entry = self._entries.get(cache_key)
+                if entry and time.monotonic() - entry.validated_at < self.validate_after_seconds:
+                    self._entries.move_to_end(cache_key)
+                    self.hits += 1
+                    self._pin(entry.path)
+                    return entry.path, entry.etag
+
+            head = self.s3_client.head_object(Bucket=bucket, Key=key)
+            etag = head['ETag'].strip('"')
+
+            with self._lock:
+                entry = self._entries.get(cache_key)
+                if entry and entry.etag == etag and os.path.exists(entry.path):
+                    entry.validated_at = time.monotonic()
+                    self._entries.move_to_end(cache_key)
+                    self.hits += 1
+                    self._pin(entry.path)
+                    return entry.path, etag
+                self.misses += 1
+                if entry:
+                    self._remove(cache_key)
+
+            size = head['ContentLength']
+            if size > self.max_bytes:
+                return None, etag
+
+            path = self._local_path(bucket, key, etag)
+            tmp_path = f"{path}.part"
+            try:
+                self.s3_client.download_file(bucket, key, tmp_path)
+                os.replace(tmp_path, path)
+            except BaseException:
+                _delete(tmp_path)
+                raise
+
+            with self._lock:
+                self._entries[cache_key] = CacheEntry(etag=etag, path=path, size=size, validated_at=time.monotonic())
+                self._bytes += size
+                self._orphans.discard(path)
+                self._pin(path)
+                self._evict()
+            return path, etag
+
+    def _remove(self, cache_key):
+        entry = self._entries.pop(cache_key)
+        self._bytes -= entry.size
+        if self._pins.get(entry.path):
+            # Still read by a live view; release() deletes it after the last pin
+            self._orphans.add(entry.path)
+        else:
+            _delete(entry.path)
+
+    def _evict(self):
+        for cache_key in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if self._pins.get(self._entries[cache_key].path):
+                continue
+            self._remove(cache_key)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                entries=len(self._entries),
+                pinned=len(self._pins),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions
+            )
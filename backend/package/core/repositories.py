@@ -39,6 +39,10 @@ class ProjectRepository(BaseRepository[T]):
     async def get_by_id_and_user(self, project_id: str, user_id: str) -> Optional[T]:
         pass
 
+    @abstractmethod
+    async def increment_counts(self, project_id: str, file_count: int = 0, session_count: int = 0) -> Optional[T]:
+        pass
+
 class SessionRepository(BaseRepository[T]):
     @abstractmethod
     async def get_by_project_id(self, project_id: str) -> List[T]:
@@ -98,5 +102,8 @@ class MessageRepository(BaseRepository[T]):
     async def create_assistant_message(self, session_id: str, user_id: str, content: str, 
                                      model_name: str, input_tokens: int, output_tokens: int, 
                                      response_time_ms: int, reason: Optional[str] = None, 
-                                     artifacts: Optional[List[Any]] = None) -> T:
+                                     artifacts: Optional[List[Any]] = None,
+                                     cache_read_tokens: int = 0, cache_write_tokens: int = 0,
+                                     context_tokens_saved: int = 0, queue_time_ms: int = 0,
+                                     client_init_ms: int = 0) -> T:
         pass
\ No newline at end of file
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+import pyarrow as pa
+
+_STRING_LITERAL = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and lowercase everything outside quoted literals and identifiers"""
+    parts = _STRING_LITERAL.split(sql.strip().rstrip(";").strip())
+    normalized = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            normalized.append(part)
+        else:
+            normalized.append(re.sub(r"\s+", " ", part).lower())
+    return "".join(normalized).strip()
+
+class QueryResultCache:
+    """
+    In-process cache of query results stored as Arrow tables.
+    Keys combine the normalized SQL with the file id and version of every
+    registered table, entries expire after a TTL and the least recently used
+    are evicted once the byte budget is exceeded.
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 600):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._keys_by_file = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, sql: str, tables: dict) -> Optional[str]:
+        """Build a cache key, or None when a registered table has no known version"""
+        versions = []
+        for name, info in sorted(tables.items()):
+            version = info.get('version') or info.get('etag')
+            if not version:
+                return None
+            versions.append([name, info.get('file_id'), version, info.get('etag')])
+        payload = json.dumps([normalize_sql(sql), versions])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[pa.Table]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            table, file_ids, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return table
+
+    def put(self, key: str, table: pa.Table, file_ids: list):
+        if table.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (table, file_ids, time.monotonic() + self.ttl_seconds)
+            self._bytes += table.nbytes
+            for file_id in file_ids:
+                self._keys_by_file.setdefault(file_id, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_file(self, file_id: str):
+        """Drop every cached result that read the given file"""
+        with self._lock:
+            for key in self._keys_by_file.pop(file_id, set()):
+                if key in self._entries:
+                    self._remove(key)
+
+    def _remove(self, key: str):
+        table, file_ids, _ = self._entries.pop(key)
+        self._bytes -= table.nbytes
+        for file_id in file_ids:
+            keys = self._keys_by_file.get(file_id)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_file[file_id]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions
+            )
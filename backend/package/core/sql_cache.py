@@ -0,0 +1,104 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+def normalize_question(text: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation"""
+    return re.sub(r"\s+", " ", text).strip().rstrip("?.!").strip().lower()
+
+class SQLCache:
+    """
+    Cache of generated SQL keyed by schema fingerprint, model and question.
+    The schema fingerprint hashes the FileMetadata prompts sent to the model,
+    so any change to file metadata produces a new key. A local LRU tier sits
+    in front of an optional DynamoDB table whose items expire through TTL.
+    """
+    def __init__(self, ttl_seconds: float = 86400, max_entries: int = 1024, table=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.table = table
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def make_key(self, schema_prompt: str, model_id: str, question: str, history: list) -> str:
+        schema_hash = hashlib.sha256(schema_prompt.encode()).hexdigest()
+        window = [[m['role'], normalize_question(m['content'])] for m in history]
+        payload = json.dumps([schema_hash, model_id, normalize_question(question), window])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() < entry[1]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+
+        if self.table is not None:
+            try:
+                response = await asyncio.to_thread(self.table.get_item, Key={'cache_key': key})
+                item = response.get('Item')
+                # DynamoDB removes expired items lazily, so check expiry here too
+                if item and time.time() < int(item['expires_at']):
+                    self._put_local(key, item['sql'], int(item['expires_at']))
+                    with self._lock:
+                        self.persistent_hits += 1
+                    return item['sql']
+            except Exception as e:
+                logger.warning("SQL cache lookup failed: %s", e)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def put(self, key: str, sql: str, model_id: str):
+        expires_at = int(time.time() + self.ttl_seconds)
+        self._put_local(key, sql, expires_at)
+        if self.table is not None:
+            try:
+                await asyncio.to_thread(self.table.put_item, Item=dict(
+                    cache_key=key, sql=sql, model_id=model_id, expires_at=expires_at
+                ))
+            except Exception as e:
+                logger.warning("SQL cache write failed: %s", e)
+
+    async def invalidate(self, key: str):
+        """Forget SQL that turned out not to run"""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.table is not None:
+            try:
+                await asyncio.to_thread(self.table.delete_item, Key={'cache_key': key})
+            except Exception as e:
+                logger.warning("SQL cache delete failed: %s", e)
+
+    def _put_local(self, key: str, sql: str, expires_at: float):
+        with self._lock:
+            self._entries[key] = (sql, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                persistent=self.table is not None,
+                hits=self.hits,
+                persistent_hits=self.persistent_hits,
+                misses=self.misses
+            )
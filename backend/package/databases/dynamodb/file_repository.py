@@ -2,13 +2,19 @@ import boto3
 from datetime import datetime, timezone
 from typing import List, Optional, Any
 from package.core.config import settings
+from package.databases.dynamodb.conditions import update_existing, delete_existing
 from package.core.repositories import FileRepository
 from package.schemas.file import File, FileStatus
 from package.core.interface import FieldDetail
 
+def to_file(item: Optional[dict]) -> Optional[File]:
+    if item and 'columns' in item and item['columns']:
+        item['columns'] = [FieldDetail(**col) for col in item['columns']]
+    return File(**item) if item else None
+
 class DynamoDBFileRepository(FileRepository[File]):
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION)
+        self.dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION, endpoint_url=settings.DYNAMODB_ENDPOINT_URL or None)
         self.table = self.dynamodb.Table(settings.FILES_TABLE)
     
     async def create(self, entity: File) -> File:
@@ -17,10 +23,7 @@ class DynamoDBFileRepository(FileRepository[File]):
     
     async def get_by_id(self, id: str) -> Optional[File]:
         response = self.table.get_item(Key={'file_id': id})
-        item = response.get('Item')
-        if item and 'columns' in item and item['columns']:
-            item['columns'] = [FieldDetail(**col) for col in item['columns']]
-        return File(**item) if item else None
+        return to_file(response.get('Item'))
     
     async def get_by_project_id(self, project_id: str, status: Optional[str] = None) -> List[File]:
         if status:
@@ -62,14 +65,9 @@ class DynamoDBFileRepository(FileRepository[File]):
         return [File(**item) for item in items]
     
     async def update_status(self, file_id: str, status: str) -> Optional[File]:
-        file_record = await self.get_by_id(file_id)
-        if not file_record:
-            return None
-        
         updated_at = datetime.now(timezone.utc).isoformat()
         
-        self.table.update_item(
-            Key={'file_id': file_id},
+        item = update_existing(self.table, {'file_id': file_id},
             UpdateExpression='SET #status = :status, updated_at = :updated_at',
             ExpressionAttributeNames={'#status': 'status'},
             ExpressionAttributeValues={
@@ -77,19 +75,13 @@ class DynamoDBFileRepository(FileRepository[File]):
                 ':updated_at': updated_at
             }
         )
-        
-        return await self.get_by_id(file_id)
+        return to_file(item)
     
     async def update_metadata(self, file_id: str, name: str, description: str, columns: List[Any]) -> Optional[File]:
-        file_record = await self.get_by_id(file_id)
-        if not file_record:
-            return None
-        
         updated_at = datetime.now(timezone.utc).isoformat()
         columns_dict = [column.model_dump() if hasattr(column, 'model_dump') else column for column in columns]
         
-        self.table.update_item(
-            Key={'file_id': file_id},
+        item = update_existing(self.table, {'file_id': file_id},
             UpdateExpression='SET #name = :name, description = :description, #columns = :columns, updated_at = :updated_at',
             ExpressionAttributeNames={'#name': 'name', '#columns': 'columns'},
             ExpressionAttributeValues={
@@ -99,36 +91,24 @@ class DynamoDBFileRepository(FileRepository[File]):
                 ':updated_at': updated_at
             }
         )
-        
-        return await self.get_by_id(file_id)
+        return to_file(item)
     
     async def update_selection(self, file_id: str, selected: bool) -> Optional[File]:
-        file_record = await self.get_by_id(file_id)
-        if not file_record:
-            return None
-        
         updated_at = datetime.now(timezone.utc).isoformat()
         
-        self.table.update_item(
-            Key={'file_id': file_id},
+        item = update_existing(self.table, {'file_id': file_id},
             UpdateExpression='SET selected = :selected, updated_at = :updated_at',
             ExpressionAttributeValues={
                 ':selected': selected,
                 ':updated_at': updated_at
             }
         )
-        
-        return await self.get_by_id(file_id)
+        return to_file(item)
     
     async def confirm_upload(self, file_id: str, size: int) -> Optional[File]:
-        file_record = await self.get_by_id(file_id)
-        if not file_record:
-            return None
-        
         updated_at = datetime.now(timezone.utc).isoformat()
         
-        self.table.update_item(
-            Key={'file_id': file_id},
+        item = update_existing(self.table, {'file_id': file_id},
             UpdateExpression='SET size = :size, #status = :status, updated_at = :updated_at',
             ExpressionAttributeNames={'#status': 'status'},
             ExpressionAttributeValues={
@@ -137,14 +117,9 @@ class DynamoDBFileRepository(FileRepository[File]):
                 ':updated_at': updated_at
             }
         )
-        
-        return await self.get_by_id(file_id)
+        return to_file(item)
     
     async def update(self, id: str, **kwargs) -> Optional[File]:
-        file_record = await self.get_by_id(id)
-        if not file_record:
-            return None
-        
         update_expression = "SET "
         expression_values = {}
         expression_names = {}
@@ -161,7 +136,6 @@ class DynamoDBFileRepository(FileRepository[File]):
         update_expression = update_expression.rstrip(", ")
         
         update_params = {
-            'Key': {'file_id': id},
             'UpdateExpression': update_expression,
             'ExpressionAttributeValues': expression_values
         }
@@ -169,16 +143,11 @@ class DynamoDBFileRepository(FileRepository[File]):
         if expression_names:
             update_params['ExpressionAttributeNames'] = expression_names
         
-        self.table.update_item(**update_params)
-        return await self.get_by_id(id)
+        item = update_existing(self.table, {'file_id': id}, **update_params)
+        return to_file(item)
     
     async def delete(self, id: str) -> bool:
-        file_record = await self.get_by_id(id)
-        if not file_record:
-            return False
-        
-        self.table.delete_item(Key={'file_id': id})
-        return True
+        return delete_existing(self.table, {'file_id': id})
     
     async def batch_get_by_ids(self, ids: List[str]) -> List[File]:
         if not ids:
@@ -1,13 +1,14 @@
 import boto3
 from typing import List, Optional, Any
 from package.core.config import settings
+from package.databases.dynamodb.conditions import update_existing, delete_existing
 from package.core.repositories import MessageRepository
 from package.schemas.message import Message
 from package.llms import Role
 
 class DynamoDBMessageRepository(MessageRepository[Message]):
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION)
+        self.dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION, endpoint_url=settings.DYNAMODB_ENDPOINT_URL or None)
         self.table = self.dynamodb.Table(settings.MESSAGES_TABLE)
     
     async def create(self, entity: Message) -> Message:
@@ -60,7 +61,10 @@ class DynamoDBMessageRepository(MessageRepository[Message]):
     async def create_assistant_message(self, session_id: str, user_id: str, content: str, 
                                      model_name: str, input_tokens: int, output_tokens: int, 
                                      response_time_ms: int, reason: Optional[str] = None, 
-                                     artifacts: Optional[List[Any]] = None) -> Message:
+                                     artifacts: Optional[List[Any]] = None,
+                                     cache_read_tokens: int = 0, cache_write_tokens: int = 0,
+                                     context_tokens_saved: int = 0, queue_time_ms: int = 0,
+                                     client_init_ms: int = 0) -> Message:
         message = Message(
             session_id=session_id,
             user_id=user_id,
@@ -70,6 +74,11 @@ class DynamoDBMessageRepository(MessageRepository[Message]):
             input_tokens=input_tokens,
             output_tokens=output_tokens,
             response_time_ms=response_time_ms,
+            queue_time_ms=queue_time_ms,
+            client_init_ms=client_init_ms,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
+            context_tokens_saved=context_tokens_saved,
             reason=reason,
             artifacts=artifacts
         )
@@ -77,10 +86,6 @@ class DynamoDBMessageRepository(MessageRepository[Message]):
         return message
     
     async def update(self, id: str, **kwargs) -> Optional[Message]:
-        message = await self.get_by_id(id)
-        if not message:
-            return None
-        
         update_expression = "SET "
         expression_values = {}
         
@@ -90,21 +95,14 @@ class DynamoDBMessageRepository(MessageRepository[Message]):
         
         update_expression = update_expression.rstrip(", ")
         
-        self.table.update_item(
-            Key={'message_id': id},
+        item = update_existing(self.table, {'message_id': id},
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_values
         )
-        
-        return await self.get_by_id(id)
+        return Message(**item) if item else None
     
     async def delete(self, id: str) -> bool:
-        message = await self.get_by_id(id)
-        if not message:
-            return False
-        
-        self.table.delete_item(Key={'message_id': id})
-        return True
+        return delete_existing(self.table, {'message_id': id})
     
     async def batch_get_by_ids(self, ids: List[str]) -> List[Message]:
         if not ids:
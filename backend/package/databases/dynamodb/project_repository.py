@@ -1,12 +1,13 @@
 import boto3
 from typing import List, Optional
 from package.core.config import settings
+from package.databases.dynamodb.conditions import update_existing, delete_existing
 from package.core.repositories import ProjectRepository
 from package.schemas.project import Project
 
 class DynamoDBProjectRepository(ProjectRepository[Project]):
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION)
+        self.dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION, endpoint_url=settings.DYNAMODB_ENDPOINT_URL or None)
         self.table = self.dynamodb.Table(settings.PROJECTS_TABLE)
     
     async def create(self, entity: Project) -> Project:
@@ -34,11 +35,15 @@ class DynamoDBProjectRepository(ProjectRepository[Project]):
             return Project(**project)
         return None
     
+    async def increment_counts(self, project_id: str, file_count: int = 0, session_count: int = 0) -> Optional[Project]:
+        """Atomically adjust the denormalized file and session counters"""
+        item = update_existing(self.table, {'project_id': project_id},
+            UpdateExpression='ADD file_count :files, session_count :sessions',
+            ExpressionAttributeValues={':files': file_count, ':sessions': session_count}
+        )
+        return Project(**item) if item else None
+    
     async def update(self, id: str, **kwargs) -> Optional[Project]:
-        project = await self.get_by_id(id)
-        if not project:
-            return None
-        
         update_expression = "SET "
         expression_values = {}
         expression_names = {}
@@ -55,7 +60,6 @@ class DynamoDBProjectRepository(ProjectRepository[Project]):
         update_expression = update_expression.rstrip(", ")
         
         update_params = {
-            'Key': {'project_id': id},
             'UpdateExpression': update_expression,
             'ExpressionAttributeValues': expression_values
         }
@@ -63,13 +67,8 @@ class DynamoDBProjectRepository(ProjectRepository[Project]):
         if expression_names:
             update_params['ExpressionAttributeNames'] = expression_names
         
-        self.table.update_item(**update_params)
-        return await self.get_by_id(id)
+        item = update_existing(self.table, {'project_id': id}, **update_params)
+        return Project(**item) if item else None
     
     async def delete(self, id: str) -> bool:
-        project = await self.get_by_id(id)
-        if not project:
-            return False
-        
-        self.table.delete_item(Key={'project_id': id})
-        return True
\ No newline at end of file
+        return delete_existing(self.table, {'project_id': id})
\ No newline at end of file
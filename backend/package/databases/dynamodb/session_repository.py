@@ -2,12 +2,13 @@ import boto3
 from datetime import datetime, timezone
 from typing import List, Optional
 from package.core.config import settings
+from package.databases.dynamodb.conditions import update_existing, delete_existing
 from package.core.repositories import SessionRepository
 from package.schemas.session import Session
 
 class DynamoDBSessionRepository(SessionRepository[Session]):
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION)
+        self.dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION, endpoint_url=settings.DYNAMODB_ENDPOINT_URL or None)
         self.table = self.dynamodb.Table(settings.SESSIONS_TABLE)
     
     async def create(self, entity: Session) -> Session:
@@ -28,25 +29,15 @@ class DynamoDBSessionRepository(SessionRepository[Session]):
         return [Session(**item) for item in response.get('Items', [])]
     
     async def refresh_timestamp(self, session_id: str) -> Optional[Session]:
-        session = await self.get_by_id(session_id)
-        if not session:
-            return None
-        
         updated_at = datetime.now(timezone.utc).isoformat()
         
-        self.table.update_item(
-            Key={'session_id': session_id},
+        item = update_existing(self.table, {'session_id': session_id},
             UpdateExpression='SET updated_at = :updated_at',
             ExpressionAttributeValues={':updated_at': updated_at}
         )
-        
-        return await self.get_by_id(session_id)
+        return Session(**item) if item else None
     
     async def update(self, id: str, **kwargs) -> Optional[Session]:
-        session = await self.get_by_id(id)
-        if not session:
-            return None
-        
         update_expression = "SET "
         expression_values = {}
         expression_names = {}
@@ -63,7 +54,6 @@ class DynamoDBSessionRepository(SessionRepository[Session]):
         update_expression = update_expression.rstrip(", ")
         
         update_params = {
-            'Key': {'session_id': id},
             'UpdateExpression': update_expression,
             'ExpressionAttributeValues': expression_values
         }
@@ -71,16 +61,11 @@ class DynamoDBSessionRepository(SessionRepository[Session]):
         if expression_names:
             update_params['ExpressionAttributeNames'] = expression_names
         
-        self.table.update_item(**update_params)
-        return await self.get_by_id(id)
+        item = update_existing(self.table, {'session_id': id}, **update_params)
+        return Session(**item) if item else None
     
     async def delete(self, id: str) -> bool:
-        session = await self.get_by_id(id)
-        if not session:
-            return False
-        
-        self.table.delete_item(Key={'session_id': id})
-        return True
+        return delete_existing(self.table, {'session_id': id})
     
     async def batch_get_by_ids(self, ids: List[str]) -> List[Session]:
         if not ids:
@@ -1,12 +1,13 @@
 import boto3
 from typing import List, Optional
 from package.core.config import settings
+from package.databases.dynamodb.conditions import update_existing, delete_existing
 from package.core.repositories import UserRepository
 from package.schemas.user import User
 
 class DynamoDBUserRepository(UserRepository[User]):
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION)
+        self.dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION, endpoint_url=settings.DYNAMODB_ENDPOINT_URL or None)
         self.table = self.dynamodb.Table(settings.USERS_TABLE)
     
     async def create(self, entity: User) -> User:
@@ -19,19 +20,16 @@ class DynamoDBUserRepository(UserRepository[User]):
         return User(**item) if item else None
     
     async def get_by_email(self, email: str) -> Optional[User]:
-        response = self.table.scan(
-            FilterExpression='email = :email',
-            ExpressionAttributeValues={':email': email}
+        response = self.table.query(
+            IndexName='EmailIndex',
+            KeyConditionExpression='email = :email',
+            ExpressionAttributeValues={':email': email},
+            Limit=1
         )
         items = response.get('Items', [])
         return User(**items[0]) if items else None
     
     async def update(self, id: str, **kwargs) -> Optional[User]:
-        # Generic update implementation
-        user = await self.get_by_id(id)
-        if not user:
-            return None
-        
         update_expression = "SET "
         expression_values = {}
         
@@ -41,21 +39,14 @@ class DynamoDBUserRepository(UserRepository[User]):
         
         update_expression = update_expression.rstrip(", ")
         
-        self.table.update_item(
-            Key={'user_id': id},
+        item = update_existing(self.table, {'user_id': id},
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_values
         )
-        
-        return await self.get_by_id(id)
+        return User(**item) if item else None
     
     async def delete(self, id: str) -> bool:
-        user = await self.get_by_id(id)
-        if not user:
-            return False
-        
-        self.table.delete_item(Key={'user_id': id})
-        return True
+        return delete_existing(self.table, {'user_id': id})
     
     # async def batch_get_by_ids(self, ids: List[str]) -> List[User]:
     #     if not ids:
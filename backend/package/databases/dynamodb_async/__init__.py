@@ -0,0 +1 @@
+# Async DynamoDB implementations
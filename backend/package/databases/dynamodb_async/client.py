@@ -0,0 +1,52 @@
+import asyncio
+import weakref
+from contextlib import AsyncExitStack
+import aioboto3
+from botocore.config import Config
+from package.core.config import settings
+
+class AsyncDynamoDB:
+    """
+    One aioboto3 DynamoDB resource per event loop, shared by every async
+    repository so they reuse a single HTTP connection pool.
+    """
+    def __init__(self):
+        self._session = aioboto3.Session()
+        self._resources = weakref.WeakKeyDictionary()
+        self._locks = weakref.WeakKeyDictionary()
+        self._tables = weakref.WeakKeyDictionary()
+
+    async def resource(self):
+        loop = asyncio.get_running_loop()
+        entry = self._resources.get(loop)
+        if entry is None:
+            lock = self._locks.setdefault(loop, asyncio.Lock())
+            async with lock:
+                entry = self._resources.get(loop)
+                if entry is None:
+                    stack = AsyncExitStack()
+                    resource = await stack.enter_async_context(self._session.resource(
+                        'dynamodb',
+                        region_name=settings.AWS_REGION,
+                        endpoint_url=settings.DYNAMODB_ENDPOINT_URL or None,
+                        config=Config(max_pool_connections=settings.DYNAMODB_MAX_POOL_CONNECTIONS, tcp_keepalive=True)
+                    ))
+                    entry = (stack, resource)
+                    self._resources[loop] = entry
+        return entry[1]
+
+    async def table(self, name: str):
+        tables = self._tables.setdefault(asyncio.get_running_loop(), {})
+        if name not in tables:
+            tables[name] = await (await self.resource()).Table(name)
+        return tables[name]
+
+    async def close(self):
+        """Close the pool of the running loop"""
+        loop = asyncio.get_running_loop()
+        self._tables.pop(loop, None)
+        entry = self._resources.pop(loop, None)
+        if entry:
+            await entry[0].aclose()
+
+dynamodb = AsyncDynamoDB()
@@ -0,0 +1,28 @@
+from typing import Optional
+from botocore.exceptions import ClientError
+from package.databases.dynamodb.conditions import condition_failed
+
+async def update_existing(table, key: dict, **params) -> Optional[dict]:
+    """Update an item in one round trip; returns the new item, or None if it does not exist"""
+    try:
+        response = await table.update_item(
+            Key=key,
+            ConditionExpression=f"attribute_exists({next(iter(key))})",
+            ReturnValues='ALL_NEW',
+            **params
+        )
+    except ClientError as e:
+        if condition_failed(e):
+            return None
+        raise
+    return response['Attributes']
+
+async def delete_existing(table, key: dict) -> bool:
+    """Delete an item in one round trip; returns False if it did not exist"""
+    try:
+        await table.delete_item(Key=key, ConditionExpression=f"attribute_exists({next(iter(key))})")
+    except ClientError as e:
+        if condition_failed(e):
+            return False
+        raise
+    return True
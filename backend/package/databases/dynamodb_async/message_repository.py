@@ -0,0 +1,128 @@
+from typing import List, Optional, Any
+from package.core.config import settings
+from package.databases.dynamodb_async.conditions import update_existing, delete_existing
+from package.databases.dynamodb_async.client import dynamodb
+from package.core.repositories import MessageRepository
+from package.schemas.message import Message
+from package.llms import Role
+
+class AsyncDynamoDBMessageRepository(MessageRepository[Message]):
+    async def table(self):
+        return await dynamodb.table(settings.MESSAGES_TABLE)
+    
+    async def create(self, entity: Message) -> Message:
+        table = await self.table()
+        await table.put_item(Item=entity.model_dump())
+        return entity
+    
+    async def get_by_id(self, id: str) -> Optional[Message]:
+        table = await self.table()
+        response = await table.get_item(Key={'message_id': id})
+        item = response.get('Item')
+        return Message(**item) if item else None
+    
+    async def get_by_session_id(self, session_id: str, limit: Optional[int] = None) -> List[Message]:
+        table = await self.table()
+        query_params = {
+            "IndexName": "SessionIndex",
+            "KeyConditionExpression": "session_id = :sid",
+            "ExpressionAttributeValues": {":sid": session_id},
+            "ScanIndexForward": True  # Chronological order (oldest first)
+        }
+
+        if limit:
+            query_params["Limit"] = limit
+        
+        response = await table.query(**query_params)
+        return [Message(**item) for item in response.get("Items", [])]
+    
+    async def get_recent_by_session_id(self, session_id: str, limit: int = 10) -> List[Message]:
+        """Get last N messages for AI context (newest first)"""
+        table = await self.table()
+        query_params = {
+            "IndexName": "SessionIndex", 
+            "KeyConditionExpression": "session_id = :sid",
+            "ExpressionAttributeValues": {":sid": session_id},
+            "ScanIndexForward": False,  # Newest first for AI context
+            "Limit": limit
+        }
+        
+        response = await table.query(**query_params)
+        return [Message(**item) for item in response.get("Items", [])]
+    
+    async def create_user_message(self, session_id: str, user_id: str, content: str, model_name:str) -> Message:
+        table = await self.table()
+        message = Message(
+            session_id=session_id,
+            user_id=user_id,
+            content=content,
+            model_name=model_name,
+            role=Role.USER
+        )
+        await table.put_item(Item=message.model_dump())
+        return message
+    
+    async def create_assistant_message(self, session_id: str, user_id: str, content: str, 
+                                     model_name: str, input_tokens: int, output_tokens: int, 
+                                     response_time_ms: int, reason: Optional[str] = None, 
+                                     artifacts: Optional[List[Any]] = None,
+                                     cache_read_tokens: int = 0, cache_write_tokens: int = 0,
+                                     context_tokens_saved: int = 0, queue_time_ms: int = 0,
+                                     client_init_ms: int = 0) -> Message:
+        table = await self.table()
+        message = Message(
+            session_id=session_id,
+            user_id=user_id,
+            content=content,
+            role=Role.ASSISTANT,
+            model_name=model_name,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            response_time_ms=response_time_ms,
+            queue_time_ms=queue_time_ms,
+            client_init_ms=client_init_ms,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
+            context_tokens_saved=context_tokens_saved,
+            reason=reason,
+            artifacts=artifacts
+        )
+        await table.put_item(Item=message.model_dump())
+        return message
+    
+    async def update(self, id: str, **kwargs) -> Optional[Message]:
+        table = await self.table()
+        update_expression = "SET "
+        expression_values = {}
+        
+        for key, value in kwargs.items():
+            update_expression += f"{key} = :{key}, "
+            expression_values[f":{key}"] = value
+        
+        update_expression = update_expression.rstrip(", ")
+        
+        item = await update_existing(table, {'message_id': id},
+            UpdateExpression=update_expression,
+            ExpressionAttributeValues=expression_values
+        )
+        return Message(**item) if item else None
+    
+    async def delete(self, id: str) -> bool:
+        table = await self.table()
+        return await delete_existing(table, {'message_id': id})
+    
+    async def batch_get_by_ids(self, ids: List[str]) -> List[Message]:
+        resource = await dynamodb.resource()
+        if not ids:
+            return []
+        
+        response = await resource.batch_get_item(
+            RequestItems={
+                settings.MESSAGES_TABLE: {
+                    'Keys': [{'message_id': id} for id in ids]
+                }
+            }
+        )
+        
+        items = response.get('Responses', {}).get(settings.MESSAGES_TABLE, [])
+        return [Message(**item) for item in items]
\ No newline at end of file
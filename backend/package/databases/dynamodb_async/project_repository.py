@@ -0,0 +1,80 @@
+from typing import List, Optional
+from package.core.config import settings
+from package.databases.dynamodb_async.conditions import update_existing, delete_existing
+from package.databases.dynamodb_async.client import dynamodb
+from package.core.repositories import ProjectRepository
+from package.schemas.project import Project
+
+class AsyncDynamoDBProjectRepository(ProjectRepository[Project]):
+    async def table(self):
+        return await dynamodb.table(settings.PROJECTS_TABLE)
+    
+    async def create(self, entity: Project) -> Project:
+        table = await self.table()
+        await table.put_item(Item=entity.model_dump())
+        return entity
+    
+    async def get_by_id(self, id: str) -> Optional[Project]:
+        table = await self.table()
+        response = await table.get_item(Key={'project_id': id})
+        item = response.get('Item')
+        return Project(**item) if item else None
+    
+    async def get_by_user_id(self, user_id: str) -> List[Project]:
+        table = await self.table()
+        response = await table.query(
+            IndexName='UserIndex',
+            KeyConditionExpression='user_id = :user_id',
+            ExpressionAttributeValues={':user_id': user_id}
+        )
+        return [Project(**item) for item in response.get('Items', [])]
+    
+    async def get_by_id_and_user(self, project_id: str, user_id: str) -> Optional[Project]:
+        table = await self.table()
+        response = await table.get_item(Key={'project_id': project_id})
+        project = response.get('Item')
+        
+        if project and project['user_id'] == user_id:
+            return Project(**project)
+        return None
+    
+    async def increment_counts(self, project_id: str, file_count: int = 0, session_count: int = 0) -> Optional[Project]:
+        """Atomically adjust the denormalized file and session counters"""
+        table = await self.table()
+        item = await update_existing(table, {'project_id': project_id},
+            UpdateExpression='ADD file_count :files, session_count :sessions',
+            ExpressionAttributeValues={':files': file_count, ':sessions': session_count}
+        )
+        return Project(**item) if item else None
+    
+    async def update(self, id: str, **kwargs) -> Optional[Project]:
+        table = await self.table()
+        update_expression = "SET "
+        expression_values = {}
+        expression_names = {}
+        
+        for key, value in kwargs.items():
+            if key == 'name':  # 'name' is a reserved word in DynamoDB
+                update_expression += f"#name = :name, "
+                expression_names['#name'] = 'name'
+                expression_values[':name'] = value
+            else:
+                update_expression += f"{key} = :{key}, "
+                expression_values[f":{key}"] = value
+        
+        update_expression = update_expression.rstrip(", ")
+        
+        update_params = {
+            'UpdateExpression': update_expression,
+            'ExpressionAttributeValues': expression_values
+        }
+        
+        if expression_names:
+            update_params['ExpressionAttributeNames'] = expression_names
+        
+        item = await update_existing(table, {'project_id': id}, **update_params)
+        return Project(**item) if item else None
+    
+    async def delete(self, id: str) -> bool:
+        table = await self.table()
+        return await delete_existing(table, {'project_id': id})
\ No newline at end of file
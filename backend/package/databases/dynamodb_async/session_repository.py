@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+from package.core.config import settings
+from package.databases.dynamodb_async.conditions import update_existing, delete_existing
+from package.databases.dynamodb_async.client import dynamodb
+from package.core.repositories import SessionRepository
+from package.schemas.session import Session
+
+class AsyncDynamoDBSessionRepository(SessionRepository[Session]):
+    async def table(self):
+        return await dynamodb.table(settings.SESSIONS_TABLE)
+    
+    async def create(self, entity: Session) -> Session:
+        table = await self.table()
+        await table.put_item(Item=entity.model_dump())
+        return entity
+    
+    async def get_by_id(self, id: str) -> Optional[Session]:
+        table = await self.table()
+        response = await table.get_item(Key={'session_id': id})
+        item = response.get('Item')
+        return Session(**item) if item else None
+    
+    async def get_by_project_id(self, project_id: str) -> List[Session]:
+        table = await self.table()
+        response = await table.query(
+            IndexName='ProjectIndex',
+            KeyConditionExpression='project_id = :project_id',
+            ExpressionAttributeValues={':project_id': project_id}
+        )
+        return [Session(**item) for item in response.get('Items', [])]
+    
+    async def refresh_timestamp(self, session_id: str) -> Optional[Session]:
+        table = await self.table()
+        updated_at = datetime.now(timezone.utc).isoformat()
+        
+        item = await update_existing(table, {'session_id': session_id},
+            UpdateExpression='SET updated_at = :updated_at',
+            ExpressionAttributeValues={':updated_at': updated_at}
+        )
+        return Session(**item) if item else None
+    
+    async def update(self, id: str, **kwargs) -> Optional[Session]:
+        table = await self.table()
+        update_expression = "SET "
+        expression_values = {}
+        expression_names = {}
+        
+        for key, value in kwargs.items():
+            if key == 'name':  # 'name' is a reserved word in DynamoDB
+                update_expression += f"#name = :name, "
+                expression_names['#name'] = 'name'
+                expression_values[':name'] = value
+            else:
+                update_expression += f"{key} = :{key}, "
+                expression_values[f":{key}"] = value
+        
+        update_expression = update_expression.rstrip(", ")
+        
+        update_params = {
+            'UpdateExpression': update_expression,
+            'ExpressionAttributeValues': expression_values
+        }
+        
+        if expression_names:
+            update_params['ExpressionAttributeNames'] = expression_names
+        
+        item = await update_existing(table, {'session_id': id}, **update_params)
+        return Session(**item) if item else None
+    
+    async def delete(self, id: str) -> bool:
+        table = await self.table()
+        return await delete_existing(table, {'session_id': id})
+    
+    async def batch_get_by_ids(self, ids: List[str]) -> List[Session]:
+        resource = await dynamodb.resource()
+        if not ids:
+            return []
+        
+        response = await resource.batch_get_item(
+            RequestItems={
+                settings.SESSIONS_TABLE: {
+                    'Keys': [{'session_id': id} for id in ids]
+                }
+            }
+        )
+        
+        items = response.get('Responses', {}).get(settings.SESSIONS_TABLE, [])
+        return [Session(**item) for item in items]
+
+    async def count_by_project_id(self, project_id: str) -> int:
+        table = await self.table()
+        response = await table.query(
+            IndexName='ProjectIndex',
+            KeyConditionExpression='project_id = :project_id',
+            Select='COUNT',
+            ExpressionAttributeValues={':project_id': project_id}
+        )
+        return response.get('Count', 0)
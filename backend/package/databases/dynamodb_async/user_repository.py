@@ -0,0 +1,53 @@
+from typing import List, Optional
+from package.core.config import settings
+from package.databases.dynamodb_async.conditions import update_existing, delete_existing
+from package.databases.dynamodb_async.client import dynamodb
+from package.core.repositories import UserRepository
+from package.schemas.user import User
+
+class AsyncDynamoDBUserRepository(UserRepository[User]):
+    async def table(self):
+        return await dynamodb.table(settings.USERS_TABLE)
+    
+    async def create(self, entity: User) -> User:
+        table = await self.table()
+        await table.put_item(Item=entity.model_dump())
+        return entity
+    
+    async def get_by_id(self, id: str) -> Optional[User]:
+        table = await self.table()
+        response = await table.get_item(Key={'user_id': id})
+        item = response.get('Item')
+        return User(**item) if item else None
+    
+    async def get_by_email(self, email: str) -> Optional[User]:
+        table = await self.table()
+        response = await table.query(
+            IndexName='EmailIndex',
+            KeyConditionExpression='email = :email',
+            ExpressionAttributeValues={':email': email},
+            Limit=1
+        )
+        items = response.get('Items', [])
+        return User(**items[0]) if items else None
+    
+    async def update(self, id: str, **kwargs) -> Optional[User]:
+        table = await self.table()
+        update_expression = "SET "
+        expression_values = {}
+        
+        for key, value in kwargs.items():
+            update_expression += f"{key} = :{key}, "
+            expression_values[f":{key}"] = value
+        
+        update_expression = update_expression.rstrip(", ")
+        
+        item = await update_existing(table, {'user_id': id},
+            UpdateExpression=update_expression,
+            ExpressionAttributeValues=expression_values
+        )
+        return User(**item) if item else None
+    
+    async def delete(self, id: str) -> bool:
+        table = await self.table()
+        return await delete_existing(table, {'user_id': id})
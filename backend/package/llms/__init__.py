@@ -1,35 +1,61 @@
 from .bedrock import *
 from .ollama import *
 from .base import *
+from .registry import ModelSpec, ModelRegistry
+from .admission import ModelUnavailableError, ModelThrottledError, CircuitOpenError, admission_stats
+from .replay import ReplayLLM, ReplayMissError
+from package.core.config import settings
 
 class ModelFactory:
-    _model_registry = {
-        "LLAMA3_2_11b_BR": lambda: BedrockLLama("us.meta.llama3-2-11b-instruct-v1:0"),
-        "NOVA_MICRO_BR": lambda: BedrockNova("us.amazon.nova-micro-v1:0"),
-        "NOVA_LITE_BR": lambda: BedrockNova("us.amazon.nova-lite-v1:0"),
-        "OPENAI_20b_BR": lambda: BedrockOpenAI("openai.gpt-oss-20b-1:0"),
-        "OPENAI_120b_BR": lambda: BedrockOpenAI("openai.gpt-oss-120b-1:0"), 
-        "CLAUDE_HAIKU4_5_BR": lambda: BedrockClaude("global.anthropic.claude-haiku-4-5-20251001-v1:0"),
-        "LLAMA3_2_11b_LC": lambda: OllamaLlama("llama3.2-vision:11b"),
-        "OPENAI_20b_LC": lambda: OllamaOpenAI("gpt-oss:20b"),
-    }
-    
+    _registry = ModelRegistry([
+        ModelSpec(key="LLAMA3_2_11b_BR", model_id="us.meta.llama3-2-11b-instruct-v1:0", provider="bedrock", llm_class=BedrockLLama,
+                  context_window=128000, input_price_per_mtok=0.16, output_price_per_mtok=0.16),
+        ModelSpec(key="NOVA_MICRO_BR", model_id="us.amazon.nova-micro-v1:0", provider="bedrock", llm_class=BedrockNova,
+                  context_window=128000, supports_prompt_cache=True, input_price_per_mtok=0.035, output_price_per_mtok=0.14),
+        ModelSpec(key="NOVA_LITE_BR", model_id="us.amazon.nova-lite-v1:0", provider="bedrock", llm_class=BedrockNova,
+                  context_window=300000, supports_prompt_cache=True, input_price_per_mtok=0.06, output_price_per_mtok=0.24,
+                  fallback="NOVA_MICRO_BR"),
+        ModelSpec(key="OPENAI_20b_BR", model_id="openai.gpt-oss-20b-1:0", provider="bedrock", llm_class=BedrockOpenAI,
+                  context_window=128000, input_price_per_mtok=0.07, output_price_per_mtok=0.3),
+        ModelSpec(key="OPENAI_120b_BR", model_id="openai.gpt-oss-120b-1:0", provider="bedrock", llm_class=BedrockOpenAI,
+                  context_window=128000, input_price_per_mtok=0.15, output_price_per_mtok=0.6,
+                  fallback="OPENAI_20b_BR"),
+        ModelSpec(key="CLAUDE_HAIKU4_5_BR", model_id="global.anthropic.claude-haiku-4-5-20251001-v1:0", provider="bedrock", llm_class=BedrockClaude,
+                  context_window=200000, supports_prompt_cache=True, input_price_per_mtok=1.0, output_price_per_mtok=5.0,
+                  fallback="NOVA_LITE_BR"),
+        ModelSpec(key="LLAMA3_2_11b_LC", model_id="llama3.2-vision:11b", provider="ollama", llm_class=OllamaLlama,
+                  context_window=4096),
+        ModelSpec(key="OPENAI_20b_LC", model_id="gpt-oss:20b", provider="ollama", llm_class=OllamaOpenAI,
+                  context_window=4096),
+    ])
+
     @classmethod
     def create_model(cls, model_name: str) -> BaseLLM:
-        if model_name not in cls._model_registry:
-            raise ValueError(f"Model {model_name} not available")
-        return cls._model_registry[model_name]()
-    
+        return cls._registry.get(model_name)
+
+    @classmethod
+    def get_spec(cls, model_name: str) -> ModelSpec:
+        return cls._registry.spec(model_name)
+
+    @classmethod
+    def register(cls, spec: ModelSpec):
+        cls._registry.register(spec)
+
     @classmethod
     def get_available_models(cls) -> list[str]:
-        return list(cls._model_registry.keys())
+        return cls._registry.keys()
 
     @classmethod
     def map_key_to_id(cls, model_key):
-        return cls._model_registry[model_key]().model_id
+        return cls._registry.key_to_id(model_key)
 
     @classmethod
     def map_id_to_key(cls, model_id):
-        for key, model in cls._model_registry.items():
-            if model().model_id == model_id:
-                return key
+        return cls._registry.id_to_key(model_id)
+
+if settings.LLM_REPLAY_MODE in ("record", "replay"):
+    # Record and replay against the same key so the pipeline builds identical requests
+    ModelFactory.register(ModelSpec(
+        key="REPLAY", model_id="replay", provider="replay", llm_class=ReplayLLM,
+        context_window=ModelFactory.get_spec(settings.LLM_REPLAY_DELEGATE).context_window
+    ))
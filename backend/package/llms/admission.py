@@ -0,0 +1,229 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional, Tuple
+import httpx
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+from package.core.config import settings
+
+class ModelUnavailableError(Exception):
+    """The model could not take the call; callers may fall back or report 503"""
+    pass
+
+class ModelThrottledError(ModelUnavailableError):
+    """Retries were exhausted while the provider kept throttling"""
+    pass
+
+class CircuitOpenError(ModelUnavailableError):
+    """The model failed repeatedly and calls are short-circuited for a while"""
+    pass
+
+THROTTLE_CODES = {"ThrottlingException", "TooManyRequestsException", "ServiceQuotaExceededException"}
+TRANSIENT_CODES = {"ServiceUnavailableException", "ModelNotReadyException", "InternalServerException"}
+
+def classify(exc: Exception) -> Tuple[bool, bool, Optional[float]]:
+    """Return (retryable, throttled, retry_after_seconds) for a provider error"""
+    if isinstance(exc, ClientError):
+        code = exc.response.get('Error', {}).get('Code', '')
+        headers = exc.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+        throttled = code in THROTTLE_CODES
+        return throttled or code in TRANSIENT_CODES, throttled, _retry_after(headers.get('retry-after'))
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        throttled = status in (429, 503)
+        return throttled or status >= 500, throttled, _retry_after(exc.response.headers.get('retry-after'))
+    if isinstance(exc, (BotoConnectionError, HTTPClientError, httpx.TransportError)):
+        return True, False, None
+    return False, False, None
+
+def _retry_after(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+class AdmissionController:
+    """
+    Per-model gate in front of provider calls.
+    Concurrency follows AIMD: the limit grows by about one per window of
+    successful calls and halves on throttling. Throttled and transient errors
+    are retried with full-jitter backoff (or the provider's retry-after), and
+    repeated failures open a circuit breaker that rejects calls until a
+    cool-down has passed and a trial call succeeds.
+    """
+    def __init__(self, name: str, initial_limit: float = 8, min_limit: float = 1, max_limit: float = 32,
+                 max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 8,
+                 failure_threshold: int = 5, reset_seconds: float = 30):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.throttled = 0
+        self.retries = 0
+        self.rejected = 0
+        self.total_wait_ms = 0.0
+        self.admitted = 0
+
+    async def acquire(self) -> float:
+        """Wait for a slot under the current limit; returns the wait in ms"""
+        start = time.monotonic()
+        trial = self._check_circuit()
+        try:
+            while True:
+                with self._lock:
+                    if self.in_flight < max(1, int(self.limit)):
+                        self.in_flight += 1
+                        self.admitted += 1
+                        waited = (time.monotonic() - start) * 1000
+                        self.total_wait_ms += waited
+                        return waited
+                    waiter = asyncio.get_running_loop().create_future()
+                    self._waiters.append(waiter)
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    with self._lock:
+                        if waiter in self._waiters:
+                            self._waiters.remove(waiter)
+                        else:
+                            # Already picked for a free slot, so pass the wake-up on
+                            self._wake_next()
+                    raise
+        except BaseException:
+            if trial:
+                # The trial never reached the model, so let the next caller try
+                with self._lock:
+                    self._trial_in_flight = False
+            raise
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._wake_next()
+
+    def _wake_next(self):
+        while self._waiters and self.in_flight < max(1, int(self.limit)):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+                break
+
+    def _check_circuit(self) -> bool:
+        """Raise while the circuit is open; returns True when this caller is the half-open trial"""
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            if time.monotonic() - self.opened_at < self.reset_seconds or self._trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} is unavailable, retry later")
+            # Half-open: let a single trial call through
+            self._trial_in_flight = True
+            return True
+
+    def on_success(self):
+        with self._lock:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+            self._wake_next()
+
+    def on_failure(self, throttled: bool):
+        with self._lock:
+            if throttled:
+                self.throttled += 1
+                self.limit = max(self.min_limit, self.limit / 2)
+            self.consecutive_failures += 1
+            if self._trial_in_flight or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def call(self, fn, hold: bool = False):
+        """
+        Await fn() under admission control, retrying throttled and transient errors.
+        With hold=True the slot stays taken after success and the caller must release() it,
+        which lets a stream keep its slot until the last chunk.
+        """
+        attempt = 0
+        while True:
+            await self.acquire()
+            try:
+                result = await fn()
+            except BaseException as e:
+                self.release()
+                retryable, throttled, retry_after = classify(e) if isinstance(e, Exception) else (False, False, None)
+                if not retryable:
+                    # Cancellation and caller errors say nothing about the model's health
+                    with self._lock:
+                        self._trial_in_flight = False
+                    raise
+                self.on_failure(throttled)
+                if attempt >= self.max_retries or self.opened_at is not None:
+                    raise ModelThrottledError(f"{self.name} is overloaded: {e}") from e
+            else:
+                self.on_success()
+                if not hold:
+                    self.release()
+                return result
+            with self._lock:
+                self.retries += 1
+            await asyncio.sleep(self.backoff(attempt, retry_after))
+            attempt += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                limit=round(self.limit, 2),
+                in_flight=self.in_flight,
+                waiting=len(self._waiters),
+                circuit_open=self.opened_at is not None,
+                throttled=self.throttled,
+                retries=self.retries,
+                rejected=self.rejected,
+                avg_wait_ms=round(self.total_wait_ms / self.admitted, 2) if self.admitted else 0.0
+            )
+
+def _resolve(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+_controllers = {}
+_controllers_lock = threading.Lock()
+
+def get_admission_controller(model_id: str) -> AdmissionController:
+    controller = _controllers.get(model_id)
+    if controller is None:
+        with _controllers_lock:
+            controller = _controllers.setdefault(model_id, AdmissionController(
+                name=model_id,
+                initial_limit=settings.LLM_CONCURRENCY_INITIAL,
+                min_limit=settings.LLM_CONCURRENCY_MIN,
+                max_limit=settings.LLM_CONCURRENCY_MAX,
+                max_retries=settings.LLM_MAX_RETRIES,
+                base_delay=settings.LLM_RETRY_BASE_SECONDS,
+                max_delay=settings.LLM_RETRY_MAX_SECONDS,
+                failure_threshold=settings.LLM_BREAKER_THRESHOLD,
+                reset_seconds=settings.LLM_BREAKER_RESET_SECONDS
+            ))
+    return controller
+
+def admission_stats() -> dict:
+    return {model_id: controller.stats() for model_id, controller in list(_controllers.items())}
@@ -2,6 +2,14 @@ from pydantic import BaseModel, Field
 from uuid import uuid4
 from enum import StrEnum
 from abc import ABC, abstractmethod
+from typing import Iterator, AsyncIterator, Union, List, Callable, Optional
+from functools import lru_cache
+from package.core.config import settings
+from package.core.executor import BoundedExecutor
+from .admission import get_admission_controller, ModelUnavailableError
+import asyncio
+import threading
+import time
 
 class Role(StrEnum):
     USER = "user"
@@ -15,12 +23,46 @@ class ModelResponse(BaseModel):
     input_tokens: int
     output_tokens: int
     response_time_ms: int
+    client_init_ms: int = 0
+    queue_time_ms: int = 0  # admission waits, retries and backoff, excluding model latency
+    fallback_from: Optional[str] = None  # model id that was unavailable when a fallback answered
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
     id: str = Field(default_factory=lambda: str(uuid4()))
 
+class StreamDelta(BaseModel):
+    content: str = ""
+    reason: str = ""
+
+@lru_cache()
+def get_llm_executor() -> BoundedExecutor:
+    """Shared pool for blocking LLM SDK calls made from async code"""
+    return BoundedExecutor(
+        max_workers=settings.LLM_EXECUTOR_WORKERS,
+        max_queue=settings.LLM_EXECUTOR_QUEUE,
+        name="llm"
+    )
+
+# A system prompt is either one string or a list of segments ordered from most to least static,
+# so providers with prompt caching can checkpoint after each segment
+SystemPrompt = Union[str, List[str]]
+
+def system_segments(system_prompt:SystemPrompt)->List[str]:
+    return [system_prompt] if isinstance(system_prompt, str) else list(system_prompt)
+
+def join_system_prompt(system_prompt:SystemPrompt)->str:
+    return "\n\n".join(system_segments(system_prompt))
+
 def UserMessage(content:str)->dict:
     return dict(role='user', content=content)
 
 class BaseLLM(ABC):
+    # Per-model settings; ModelFactory overrides them from the model's ModelSpec
+    context_window: int = 8192  # input tokens, used to budget conversation history
+    supports_prompt_cache: bool = False  # whether cache checkpoints may be sent
+    supports_streaming: bool = True  # False sends astream() callers through arun() instead
+    fallback: Optional[Callable[[], "BaseLLM"]] = None  # cheaper model to use when this one is unavailable
+
     def __init__(self, model_id,):
         self.model_id = model_id
         self.endpoint_url: str = "http://localhost:11434/api/chat"
@@ -31,6 +73,120 @@ class BaseLLM(ABC):
         pass
 
     @abstractmethod
-    def run(self, system_prompt:str, messages:list)->ModelResponse:
+    def run(self, system_prompt:SystemPrompt, messages:list)->ModelResponse:
         """Abstract method to be implemented by child classes"""
-        pass
\ No newline at end of file
+        pass
+
+    async def arun(self, system_prompt:SystemPrompt, messages:list)->ModelResponse:
+        """Run without blocking the event loop, under the model's admission controller"""
+        start_time = time.time()
+        try:
+            response = await get_admission_controller(self.model_id).call(lambda: self._arun(system_prompt, messages))
+        except ModelUnavailableError:
+            if self.fallback is None:
+                raise
+            response = await self.fallback().arun(system_prompt, messages)
+            response.fallback_from = response.fallback_from or self.model_id
+            return response
+        response.queue_time_ms = queue_time_ms(start_time, response)
+        return response
+
+    async def _arun(self, system_prompt:SystemPrompt, messages:list)->ModelResponse:
+        """Single attempt; blocking SDKs go through the bounded LLM executor"""
+        return await get_llm_executor().run(self.run_admitted, system_prompt, messages)
+
+    def run_admitted(self, system_prompt:SystemPrompt, messages:list)->ModelResponse:
+        """run() as called under the admission controller, which owns retries; backends
+        whose SDK retries on its own override this to make a single attempt"""
+        return self.run(system_prompt, messages)
+
+    def stream_admitted(self, system_prompt:SystemPrompt, messages:list)->Iterator[Union[StreamDelta, ModelResponse]]:
+        """stream() as called under the admission controller, see run_admitted()"""
+        return self.stream(system_prompt, messages)
+
+    def stream(self, system_prompt:SystemPrompt, messages:list)->Iterator[Union[StreamDelta, ModelResponse]]:
+        """Yield StreamDelta chunks as they are generated, then the final ModelResponse with usage.
+        Backends without native streaming yield the whole answer as a single chunk."""
+        response = self.run(system_prompt, messages)
+        yield StreamDelta(content=response.content)
+        yield response
+
+    async def astream(self, system_prompt:SystemPrompt, messages:list)->AsyncIterator[Union[StreamDelta, ModelResponse]]:
+        """Stream under the model's admission controller; retries and fallback only
+        happen before the first chunk, after that errors reach the caller"""
+        start_time = time.time()
+        controller = get_admission_controller(self.model_id)
+
+        async def open_stream():
+            iterator = self._astream(system_prompt, messages)
+            try:
+                return iterator, await anext(iterator)
+            except BaseException:
+                await iterator.aclose()
+                raise
+
+        try:
+            iterator, chunk = await controller.call(open_stream, hold=True)
+        except ModelUnavailableError:
+            if self.fallback is None:
+                raise
+            async for chunk in self.fallback().astream(system_prompt, messages):
+                if isinstance(chunk, ModelResponse):
+                    chunk.fallback_from = chunk.fallback_from or self.model_id
+                yield chunk
+            return
+
+        done = object()
+        try:
+            while chunk is not done:
+                if isinstance(chunk, ModelResponse):
+                    chunk.queue_time_ms = queue_time_ms(start_time, chunk)
+                yield chunk
+                chunk = await anext(iterator, done)
+        finally:
+            controller.release()
+            await iterator.aclose()
+
+    async def _astream(self, system_prompt:SystemPrompt, messages:list)->AsyncIterator[Union[StreamDelta, ModelResponse]]:
+        """Iterate stream() on the bounded LLM executor, closing it (and its HTTP stream) on exit"""
+        iterator = None
+        done = object()
+        # A cancelled step keeps running on its worker, so closing must wait for it
+        lock = threading.Lock()
+
+        def step():
+            nonlocal iterator
+            with lock:
+                if iterator is None:
+                    # stream() may do blocking setup before its first yield, so it is created here too
+                    iterator = self.stream_admitted(system_prompt, messages)
+                return next(iterator, done)
+
+        def close():
+            if iterator is not None:
+                iterator.close()
+
+        def close_after_step():
+            with lock:
+                close()
+
+        try:
+            while True:
+                chunk = await get_llm_executor().run(step)
+                if chunk is done:
+                    break
+                yield chunk
+        finally:
+            if lock.acquire(blocking=False):
+                try:
+                    close()
+                finally:
+                    lock.release()
+            else:
+                # A step is still blocked in a read; close once it returns, without making the caller wait
+                threading.Thread(target=close_after_step, name="llm-stream-close", daemon=True).start()
+
+def queue_time_ms(start_time:float, response:ModelResponse)->int:
+    """Wall time not spent in the successful model call"""
+    elapsed_ms = int((time.time() - start_time) * 1000)
+    return max(0, elapsed_ms - response.response_time_ms - response.client_init_ms)
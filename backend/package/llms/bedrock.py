@@ -1,6 +1,39 @@
 import boto3
+import copy
+import threading
 import time
-from .base import BaseLLM, ModelResponse
+from typing import Optional
+from botocore.config import Config
+from .base import BaseLLM, ModelResponse, StreamDelta, SystemPrompt, system_segments
+
+BEDROCK_CLIENT_CONFIG = dict(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=120,
+    retries={"mode": "adaptive", "max_attempts": 4},
+)
+
+# Calls made under the admission controller are retried there, so botocore must not retry as well
+ADMITTED_RETRIES = {"mode": "standard", "total_max_attempts": 1}
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_bedrock_client(region_name:str='us-east-1', **config):
+    """Process-wide bedrock-runtime client per region and config, so the
+    connection pool and TLS sessions are reused across LLM calls"""
+    options = {**BEDROCK_CLIENT_CONFIG, **config}
+    key = (region_name, repr(sorted(options.items())))
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                # botocore rewrites the retries dict in place, so hand it a copy
+                client = boto3.client('bedrock-runtime', region_name=region_name, config=Config(**copy.deepcopy(options)))
+                _clients[key] = client
+    return client
 
 def bedrock_driver(messages):
     return [dict(role=m['role'], content=[dict(text=m['content'])]) for m in messages]
@@ -9,22 +42,98 @@ class BaseBedrock(BaseLLM):
     def __init__(self, model_id):
         super().__init__(model_id)
 
-    def get_model(self):
-        return boto3.client('bedrock-runtime', region_name='us-east-1')
+    def get_model(self, retries:Optional[dict]=None):
+        if retries:
+            return get_bedrock_client(region_name='us-east-1', retries=retries)
+        return get_bedrock_client(region_name='us-east-1')
+
+    def timed_model(self, retries:Optional[dict]=None):
+        """Return the client and how long it took to obtain it"""
+        start_time = time.time()
+        model = self.get_model(retries)
+        return model, int((time.time() - start_time) * 1000)
 
     def bedrock_driver(self, messages):
         return [dict(role=m['role'], content=[dict(text=m['content'])]) for m in messages]
+
+    def system_blocks(self, system_prompt:SystemPrompt)->list:
+        """Bedrock system content, with a cache checkpoint after each segment when the model supports it"""
+        blocks = []
+        for segment in system_segments(system_prompt):
+            blocks.append({"text": segment})
+            if self.supports_prompt_cache:
+                blocks.append({"cachePoint": {"type": "default"}})
+        return blocks
+
+    def cache_usage(self, output:ModelResponse, usage:dict)->ModelResponse:
+        output.cache_read_tokens = usage.get('cacheReadInputTokens', 0)
+        output.cache_write_tokens = usage.get('cacheWriteInputTokens', 0)
+        return output
     
-    def run(self, system_prompt:str, messages:list)->ModelResponse:
-        model = self.get_model()
+    def run(self, system_prompt:SystemPrompt, messages:list)->ModelResponse:
+        return self.converse(self.timed_model(), system_prompt, messages)
+
+    def run_admitted(self, system_prompt:SystemPrompt, messages:list)->ModelResponse:
+        return self.converse(self.timed_model(ADMITTED_RETRIES), system_prompt, messages)
+
+    def stream(self, system_prompt:SystemPrompt, messages:list):
+        return self.converse_stream(None, system_prompt, messages)
+
+    def stream_admitted(self, system_prompt:SystemPrompt, messages:list):
+        return self.converse_stream(ADMITTED_RETRIES, system_prompt, messages)
+
+    def converse(self, timed_model, system_prompt:SystemPrompt, messages:list)->ModelResponse:
+        model, client_init_ms = timed_model
         start_time = time.time()
         response = model.converse(
             modelId=self.model_id,
             messages=self.bedrock_driver(messages),
-            system=[{"text": system_prompt}]
+            system=self.system_blocks(system_prompt)
+        )
+        response_time_ms = int((time.time() - start_time) * 1000)
+        output = self.OutputMessage(response, response_time_ms)
+        output.client_init_ms = client_init_ms
+        return self.cache_usage(output, response.get('usage', {}))
+
+    def converse_stream(self, retries:Optional[dict], system_prompt:SystemPrompt, messages:list):
+        # Obtained on the first next() rather than when the generator is created, so it runs where the steps run
+        model, client_init_ms = self.timed_model(retries)
+        start_time = time.time()
+        response = model.converse_stream(
+            modelId=self.model_id,
+            messages=self.bedrock_driver(messages),
+            system=self.system_blocks(system_prompt)
         )
+        role, content, reason, usage = "assistant", [], [], {}
+        try:
+            for event in response['stream']:
+                if 'messageStart' in event:
+                    role = event['messageStart']['role']
+                elif 'contentBlockDelta' in event:
+                    delta = event['contentBlockDelta']['delta']
+                    if 'text' in delta:
+                        content.append(delta['text'])
+                        yield StreamDelta(content=delta['text'])
+                    elif delta.get('reasoningContent', {}).get('text'):
+                        reason.append(delta['reasoningContent']['text'])
+                        yield StreamDelta(reason=delta['reasoningContent']['text'])
+                elif 'metadata' in event:
+                    usage = event['metadata'].get('usage', {})
+        finally:
+            # Return the connection to the pool even when the consumer stops early
+            response['stream'].close()
         response_time_ms = int((time.time() - start_time) * 1000)
-        return self.OutputMessage(response, response_time_ms)
+        output = ModelResponse(
+            model_name=self.model_id,
+            role=role,
+            content="".join(content),
+            reason="".join(reason) or "".join(content),
+            input_tokens=usage.get('inputTokens', 0),
+            output_tokens=usage.get('outputTokens', 0),
+            response_time_ms=response_time_ms,
+            client_init_ms=client_init_ms
+        )
+        yield self.cache_usage(output, usage)
     
 class BedrockLLama(BaseBedrock):
     def __init__(self, model_id):
@@ -1,23 +1,115 @@
+import asyncio
+import json
 import time
+import weakref
+import httpx
 import requests
-from .base import BaseLLM, ModelResponse
+from package.core.config import settings
+from .base import BaseLLM, ModelResponse, StreamDelta, SystemPrompt, join_system_prompt
+
+_session = requests.Session()
+_async_clients = weakref.WeakKeyDictionary()
+
+def get_async_client() -> httpx.AsyncClient:
+    """Pooled HTTP client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.OLLAMA_TIMEOUT_SECONDS, connect=settings.OLLAMA_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_connections=settings.OLLAMA_MAX_CONNECTIONS, max_keepalive_connections=settings.OLLAMA_MAX_CONNECTIONS)
+        )
+        _async_clients[loop] = client
+    return client
+
+class StreamState:
+    """Accumulates Ollama NDJSON chunks into deltas and a final response"""
+    def __init__(self):
+        self.role = "assistant"
+        self.content = []
+        self.reason = []
+        self.final = {}
+
+    def feed(self, line):
+        if not line:
+            return
+        chunk = json.loads(line)
+        message = chunk.get('message', {})
+        self.role = message.get('role', self.role)
+        if message.get('thinking'):
+            self.reason.append(message['thinking'])
+            yield StreamDelta(reason=message['thinking'])
+        if message.get('content'):
+            self.content.append(message['content'])
+            yield StreamDelta(content=message['content'])
+        if chunk.get('done'):
+            self.final = chunk
 
 class BaseLocalLLM(BaseLLM):
     def __init__(self, model_id):
         super().__init__(model_id)
         self.endpoint_url: str = "http://localhost:11434/api/chat"
 
-    def run(self, system_prompt:str, messages:list)->ModelResponse:
-        start_time = time.time()
-        payload = {
+    def payload(self, system_prompt:SystemPrompt, messages:list, stream:bool)->dict:
+        return {
             "model": self.model_id,
-            "messages": [dict(role="system", content=system_prompt)]+messages,
-            "stream": False
+            "messages": [dict(role="system", content=join_system_prompt(system_prompt))]+messages,
+            "stream": stream
         }
-        response = requests.post(self.endpoint_url, json=payload)
+
+    def run(self, system_prompt:SystemPrompt, messages:list)->ModelResponse:
+        start_time = time.time()
+        response = _session.post(
+            self.endpoint_url,
+            json=self.payload(system_prompt, messages, stream=False),
+            timeout=(settings.OLLAMA_CONNECT_TIMEOUT_SECONDS, settings.OLLAMA_TIMEOUT_SECONDS)
+        )
         response_time_ms = int((time.time() - start_time) * 1000)
         return self.OutputMessage(response.json(), response_time_ms=response_time_ms)
 
+    async def _arun(self, system_prompt:SystemPrompt, messages:list)->ModelResponse:
+        start_time = time.time()
+        response = await get_async_client().post(self.endpoint_url, json=self.payload(system_prompt, messages, stream=False))
+        response.raise_for_status()
+        response_time_ms = int((time.time() - start_time) * 1000)
+        return self.OutputMessage(response.json(), response_time_ms=response_time_ms)
+
+    def final_response(self, state:StreamState, start_time:float)->ModelResponse:
+        response_time_ms = int((time.time() - start_time) * 1000)
+        return ModelResponse(
+            model_name=self.model_id,
+            role=state.role,
+            content="".join(state.content),
+            reason="".join(state.reason) or "".join(state.content),
+            input_tokens=state.final.get('prompt_eval_count', 0),
+            output_tokens=state.final.get('eval_count', 0),
+            response_time_ms=response_time_ms
+        )
+
+    def stream(self, system_prompt:SystemPrompt, messages:list):
+        start_time = time.time()
+        state = StreamState()
+        with _session.post(
+            self.endpoint_url,
+            json=self.payload(system_prompt, messages, stream=True),
+            stream=True,
+            timeout=(settings.OLLAMA_CONNECT_TIMEOUT_SECONDS, settings.OLLAMA_TIMEOUT_SECONDS)
+        ) as response:
+            # Ollama streams one JSON object per line
+            for line in response.iter_lines():
+                yield from state.feed(line)
+        yield self.final_response(state, start_time)
+
+    async def _astream(self, system_prompt:SystemPrompt, messages:list):
+        start_time = time.time()
+        state = StreamState()
+        async with get_async_client().stream("POST", self.endpoint_url, json=self.payload(system_prompt, messages, stream=True)) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                for delta in state.feed(line):
+                    yield delta
+        yield self.final_response(state, start_time)
+
 class OllamaOpenAI(BaseLocalLLM):
     def __init__(self, model_id="gpt-oss:20b"):
         super().__init__(model_id)
@@ -0,0 +1,70 @@
+import threading
+from typing import Dict, List, Optional, Type
+from pydantic import BaseModel
+from .base import BaseLLM
+
+class ModelSpec(BaseModel):
+    key: str
+    model_id: str
+    provider: str
+    llm_class: Type[BaseLLM]
+    context_window: int
+    supports_streaming: bool = True
+    supports_prompt_cache: bool = False
+    input_price_per_mtok: float = 0.0  # USD per million input tokens
+    output_price_per_mtok: float = 0.0  # USD per million output tokens
+    fallback: Optional[str] = None  # key of a cheaper model used while this one is unavailable
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (input_tokens * self.input_price_per_mtok + output_tokens * self.output_price_per_mtok) / 1_000_000
+
+class ModelRegistry:
+    """
+    Registered models by key with precomputed key/id maps.
+    LLM instances hold no per-call state, so one instance per key is built
+    on first use and shared across requests.
+    """
+    def __init__(self, specs: List[ModelSpec] = ()):
+        self._specs: Dict[str, ModelSpec] = {}
+        self._key_by_id: Dict[str, str] = {}
+        self._instances: Dict[str, BaseLLM] = {}
+        self._lock = threading.Lock()
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: ModelSpec):
+        with self._lock:
+            self._specs[spec.key] = spec
+            self._key_by_id.setdefault(spec.model_id, spec.key)
+            self._instances.pop(spec.key, None)
+
+    def spec(self, key: str) -> ModelSpec:
+        if key not in self._specs:
+            raise ValueError(f"Model {key} not available")
+        return self._specs[key]
+
+    def get(self, key: str) -> BaseLLM:
+        instance = self._instances.get(key)
+        if instance is None:
+            spec = self.spec(key)
+            with self._lock:
+                instance = self._instances.get(key)
+                if instance is None:
+                    instance = spec.llm_class(spec.model_id)
+                    # The spec is the source of truth for per-model settings
+                    instance.context_window = spec.context_window
+                    instance.supports_prompt_cache = spec.supports_prompt_cache
+                    instance.supports_streaming = spec.supports_streaming
+                    if spec.fallback:
+                        instance.fallback = lambda: self.get(spec.fallback)
+                    self._instances[key] = instance
+        return instance
+
+    def keys(self) -> List[str]:
+        return list(self._specs.keys())
+
+    def key_to_id(self, key: str) -> str:
+        return self.spec(key).model_id
+
+    def id_to_key(self, model_id: str) -> Optional[str]:
+        return self._key_by_id.get(model_id)
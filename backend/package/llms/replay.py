@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+from package.core.config import settings
+from .base import BaseLLM, ModelResponse, StreamDelta, SystemPrompt, system_segments
+
+class ReplayMissError(Exception):
+    """No recorded response matches the request"""
+    pass
+
+def request_key(system_prompt:SystemPrompt, messages:list)->str:
+    payload = json.dumps([system_segments(system_prompt), messages], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class Cassette:
+    """Recorded responses by request hash, stored as JSON lines"""
+    def __init__(self, path:str):
+        self.path = path
+        self._responses = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._responses is None:
+            self._responses = {}
+            if os.path.exists(self.path):
+                with open(self.path) as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            self._responses[record['key']] = record['response']
+        return self._responses
+
+    def get(self, key:str)->Optional[dict]:
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key:str, response:ModelResponse):
+        with self._lock:
+            self._load()[key] = response.model_dump(mode="json")
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(dict(key=key, model_id=response.model_name, response=self._responses[key])) + "\n")
+
+_cassettes = {}
+
+def get_cassette(path:str)->Cassette:
+    return _cassettes.setdefault(path, Cassette(path))
+
+class ReplayLLM(BaseLLM):
+    """
+    Offline stand-in for a real model.
+    In record mode calls go to the LLM_REPLAY_DELEGATE model and each response is
+    written to the cassette; in replay mode responses are served from the cassette
+    by request hash, with optional synthetic latency and token counts.
+    """
+    def __init__(self, model_id):
+        super().__init__(model_id)
+        self.mode = settings.LLM_REPLAY_MODE
+        self.cassette = get_cassette(settings.LLM_REPLAY_CASSETTE)
+
+    def delegate(self)->BaseLLM:
+        from package.llms import ModelFactory
+        return ModelFactory.create_model(settings.LLM_REPLAY_DELEGATE)
+
+    def OutputMessage(self, response:dict, response_time_ms:int)->ModelResponse:
+        output = ModelResponse(**{**response, 'model_name': self.model_id})
+        output.response_time_ms = response_time_ms
+        output.queue_time_ms = 0
+        if settings.LLM_REPLAY_INPUT_TOKENS is not None:
+            output.input_tokens = settings.LLM_REPLAY_INPUT_TOKENS
+        if settings.LLM_REPLAY_OUTPUT_TOKENS is not None:
+            output.output_tokens = settings.LLM_REPLAY_OUTPUT_TOKENS
+        return output
+
+    def lookup(self, system_prompt:SystemPrompt, messages:list):
+        """Return (recorded response, latency in seconds) for a request"""
+        response = self.cassette.get(request_key(system_prompt, messages))
+        if response is None:
+            raise ReplayMissError(f"No recording for this request in {self.cassette.path}")
+        latency_ms = settings.LLM_REPLAY_LATENCY_MS
+        if latency_ms is None:
+            latency_ms = response['response_time_ms']
+        return response, latency_ms / 1000
+
+    def record(self, system_prompt:SystemPrompt, messages:list, response:ModelResponse)->ModelResponse:
+        self.cassette.put(request_key(system_prompt, messages), response)
+        return response
+
+    def run(self, system_prompt:SystemPrompt, messages:list)->ModelResponse:
+        if self.mode == "record":
+            return self.record(system_prompt, messages, self.delegate().run(system_prompt, messages))
+        response, latency = self.lookup(system_prompt, messages)
+        time.sleep(latency)
+        return self.OutputMessage(response, int(latency * 1000))
+
+    async def _arun(self, system_prompt:SystemPrompt, messages:list)->ModelResponse:
+        if self.mode == "record":
+            return self.record(system_prompt, messages, await self.delegate().arun(system_prompt, messages))
+        response, latency = self.lookup(system_prompt, messages)
+        await asyncio.sleep(latency)
+        return self.OutputMessage(response, int(latency * 1000))
+
+    async def _astream(self, system_prompt:SystemPrompt, messages:list):
+        if self.mode == "record":
+            async for chunk in self.delegate().astream(system_prompt, messages):
+                if isinstance(chunk, ModelResponse):
+                    chunk = self.record(system_prompt, messages, chunk)
+                yield chunk
+            return
+        response, latency = self.lookup(system_prompt, messages)
+        await asyncio.sleep(latency)
+        yield StreamDelta(content=response['content'])
+        yield self.OutputMessage(response, int(latency * 1000))
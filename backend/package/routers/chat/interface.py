@@ -13,6 +13,7 @@ class Artifact(BaseModel):
     type: Literal["sql", "results", "chart"]
     content: Any
     title: Optional[str] = None
+    status: Literal["ok", "skipped"] = "ok"
 
 class ArtifactResponse(BaseModel):
     message_id:str
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from package.core.dependencies import get_chat_service
 from package.services.chat_service import ChatService
 from package.core.auth_middleware import get_current_user
@@ -29,6 +30,20 @@ async def send_message(
     response.model_name = message_data.model_id
     return response
 
+@router.post("/sessions/{session_id}/messages/stream")
+async def stream_message(
+    session_id: str,
+    message_data: MessageSend,
+    chat_service: ChatService = Depends(get_chat_service),
+    current_user: str = Depends(get_current_user)
+):
+    events = await chat_service.stream_message(session_id, current_user, message_data)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/available-models")
 async def get_available_models(
     current_user: str = Depends(get_current_user)
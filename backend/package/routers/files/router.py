@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from typing import List
 from package.core.dependencies import get_file_service
 from package.services.file_service import FileService
@@ -66,10 +66,11 @@ async def update_file_selection(
 async def confirm_file_upload(
     file_id: str,
     size: int,
+    background_tasks: BackgroundTasks,
     file_service: FileService = Depends(get_file_service),
     current_user: str = Depends(get_current_user)
 ):
-    return await file_service.confirm_file_upload(file_id, current_user, size)
+    return await file_service.confirm_file_upload(file_id, current_user, size, background_tasks)
 
 @router.delete("/{file_id}")
 async def delete_file(
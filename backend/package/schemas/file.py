@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from uuid import uuid4
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from enum import Enum
 from package.core.interface import FieldDetail
@@ -27,5 +27,6 @@ class File(BaseModel):
     description: str = Field(default="")
     selected: bool = Field(default=False)
     columns: List[FieldDetail] = Field(default_factory=list)
+    parquet_key: Optional[str] = Field(default=None)
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
\ No newline at end of file
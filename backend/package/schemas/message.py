@@ -15,6 +15,11 @@ class Message(BaseModel):
     input_tokens: Optional[int] = Field(default=None)
     output_tokens: Optional[int] = Field(default=None)
     response_time_ms: Optional[int] = Field(default=None)
+    queue_time_ms: Optional[int] = Field(default=None)
+    client_init_ms: Optional[int] = Field(default=None)  # SDK client setup on a cold container
+    cache_read_tokens: Optional[int] = Field(default=None)
+    cache_write_tokens: Optional[int] = Field(default=None)
+    context_tokens_saved: Optional[int] = Field(default=None)
     reason: Optional[str] = Field(default=None)
     updated_at: Optional[str] = Field(default=None)
     artifacts: Optional[List[dict]] = Field(default=None)
\ No newline at end of file
@@ -7,5 +7,7 @@ class Project(BaseModel):
     user_id: str
     name: str
     description: str
+    file_count: int = 0
+    session_count: int = 0
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
\ No newline at end of file
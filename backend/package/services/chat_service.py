@@ -1,23 +1,57 @@
+import asyncio
+import json
+import logging
 from datetime import datetime
+from typing import AsyncIterator, Optional
 from fastapi import HTTPException
 from package.core.repositories import MessageRepository, SessionRepository, ProjectRepository, FileRepository
-from package.llms import UserMessage, Role, ModelFactory
+from package.llms import UserMessage, Role, ModelFactory, StreamDelta, ModelUnavailableError
 from package.core.config import settings
-from package.core.aws_config import get_aws_configs
-from package.core.data_catalog import DataCatalog
+from package.core.data_catalog import CatalogPool, QueryError
+from package.core.executor import ExecutorSaturatedError
+from package.core.sql_cache import SQLCache
+from package.core.access_cache import AccessCache
+from package.core.context_builder import ContextBuilder
 from package.core.interface import FileMetadata
 from package.prompt_hub import PromptHub
+from package.utils.render import to_markdown
 from package.agents.query_master import QueryMasterAgent
 from package.agents.chart_builder import ChartBuilder
 from package.routers.chat.interface import MessageSend, ChatResponse, ChatHistoryResponse, MessageHistoryResponse, Artifact, ArtifactResponse
 
+logger = logging.getLogger(__name__)
+
+def sse_event(event: str, data) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens")
+
+def total_usage(model_response, stage_responses: list) -> dict:
+    """Token usage of the answer plus every model call made by earlier stages"""
+    responses = [model_response, *stage_responses]
+    return {field: sum(getattr(response, field) for response in responses) for field in USAGE_FIELDS}
+
+def usage_cost(responses: list) -> float:
+    """USD price of the given model calls, each at the rates of the model that answered it"""
+    cost = 0.0
+    for response in responses:
+        key = ModelFactory.map_id_to_key(response.model_name)
+        if key:
+            cost += ModelFactory.get_spec(key).cost(response.input_tokens, response.output_tokens)
+    return cost
+
 class ChatService:
     def __init__(self, message_repo: MessageRepository, session_repo: SessionRepository, 
-                 project_repo: ProjectRepository, file_repo: FileRepository):
+                 project_repo: ProjectRepository, file_repo: FileRepository, catalog_pool: CatalogPool,
+                 access_cache: AccessCache, sql_cache: Optional[SQLCache] = None):
         self.message_repo = message_repo
         self.session_repo = session_repo
         self.project_repo = project_repo
         self.file_repo = file_repo
+        self.catalog_pool = catalog_pool
+        self.access_cache = access_cache
+        self.sql_cache = sql_cache
         
     async def validate_session_access(self, session_id: str, user_id: str):
         """Validate user has access to session"""
@@ -26,15 +60,15 @@ class ChatService:
             raise HTTPException(status_code=404, detail="Session not found")
         
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(session.project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_project(session.project_id, user_id):
             raise HTTPException(status_code=404, detail="Session not found")
         
         return session
     
     async def get_chat_history(self, session_id: str, user_id: str) -> ChatHistoryResponse:
         """Get full chat history for a session"""
-        await self.validate_session_access(session_id, user_id)
+        if not await self.access_cache.owns_session(session_id, user_id):
+            raise HTTPException(status_code=404, detail="Session not found")
         
         messages = await self.message_repo.get_by_session_id(session_id)
         
@@ -55,27 +89,56 @@ class ChatService:
         )
     # def ai_client(self, model_id:str):
     #     return ModelFactory.create_model(model_name=model_id)
-    async def send_message(self, session_id: str, user_id: str, message_data: MessageSend) -> ChatResponse:
-        """Send message and get AI response"""
+    async def prepare_message(self, session_id: str, user_id: str, message_data: MessageSend):
+        """Validate access, store the user message and load the history for the AI context"""
         session = await self.validate_session_access(session_id, user_id)
         model_id = message_data.model_id
         ai_client = ModelFactory.create_model(model_name=model_id)
         
+        # Load history before storing the new message so the question is not sent twice
+        recent_messages = await self.message_repo.get_recent_by_session_id(session_id, settings.CONTEXT_HISTORY_LIMIT)
+        
         # Create user message record
         user_msg = await self.message_repo.create_user_message(session_id, user_id, message_data.content, ModelFactory.map_key_to_id(message_data.model_id))
         
-        # Get recent history for AI context
-        recent_messages = await self.message_repo.get_recent_by_session_id(session_id, 10)
-        conversation = []
+        history = []
         
         for msg in reversed(recent_messages):  # Reverse to get chronological order
             if msg.role == Role.USER:
-                conversation.append(UserMessage(content=msg.content))
+                history.append(UserMessage(content=msg.content))
             else:
-                conversation.append(dict(role='assistant', content=msg.content))
+                history.append(dict(role='assistant', content=msg.content))
         
-        artifacts = []
+        return session, ai_client, ContextBuilder(history, ai_client.context_window)
+
+    async def generate_sql(self, ai_client, context: ContextBuilder, schema_prompt: str, question: str):
+        """
+        Return (sql, cache_key, model_response), reusing SQL generated for the same schema, model and question;
+        model_response is None when the SQL came from the cache
+        """
+        cache_key = None
+        if self.sql_cache:
+            window = context.history[-settings.SQL_CACHE_HISTORY_WINDOW:] if settings.SQL_CACHE_HISTORY_WINDOW else []
+            cache_key = self.sql_cache.make_key(schema_prompt, ai_client.model_id, question, window)
+            sql_query = await self.sql_cache.get(cache_key)
+            if sql_query:
+                return sql_query, cache_key, None
         
+        sql_request_prompt = f"USER QUERY:\n{question}"
+        agent = QueryMasterAgent(llm=ai_client)
+        sql_query = await agent.arun(context.build("sql", sql_request_prompt), schema_prompt)
+        if cache_key and sql_query:
+            await self.sql_cache.put(cache_key, sql_query, ai_client.model_id)
+        return sql_query, cache_key, agent.response
+
+    async def run_pipeline(self, session, ai_client, context: ContextBuilder, message_data: MessageSend):
+        """
+        Run the stages around the final answer.
+        Yields ("artifact", Artifact) as each stage finishes, ("usage", ModelResponse) for every model
+        call a stage made and ("answer", (system_prompt, messages)) as soon as the answer can start;
+        the chart stage keeps running after the answer is yielded, so consumers should start the
+        answer and keep iterating.
+        """
         # Handle data context if requested
         if message_data.chat_with_data:
             # Get selected files for this project
@@ -95,74 +158,133 @@ class ChatService:
                     for metadata in file_metadata
                 ]
                 metadatas_str = "\n".join(metadatas)
-                sql_request_prompt = f"METADATAS:\n\n{metadatas_str}\n\nUSER QUERY:\n{message_data.content}"
+                # The schema block goes in the system prompt so it can be cached per project
+                schema_prompt = f"METADATAS:\n\n{metadatas_str}"
                 
-                # Generate SQL query
-                sql_query = QueryMasterAgent(llm=ai_client).run(
-                    conversation + [UserMessage(content=sql_request_prompt)]
-                )
-                
-                # Add SQL query as artifact
-                artifacts.append(Artifact(
-                    type="sql",
-                    content=sql_query,
-                    title="Generated SQL Query"
+                # Generate SQL while the selected files are fetched and registered
+                sql_task = asyncio.create_task(asyncio.wait_for(
+                    self.generate_sql(ai_client, context, schema_prompt, message_data.content),
+                    settings.SQL_STAGE_TIMEOUT_SECONDS
                 ))
+                cache_key = None
                 
-                # Execute query
-                catalog = DataCatalog(aws_configs=get_aws_configs())
-                for fm in file_metadata:
-                    catalog.register(fm.filename.split(".")[0], source=f"s3://{settings.FILE_BUCKET}/{fm.s3_key}")
-                
-                results = catalog.query(sql_query)
-                results_markdown = results.to_markdown()
+                try:
+                    async with self.catalog_pool.alease() as catalog:
+                        await catalog.aregister_many([
+                            dict(
+                                name=fm.filename.split(".")[0],
+                                # Prefer the columnar copy written at ingest
+                                source=f"s3://{settings.FILE_BUCKET}/{fm.parquet_key or fm.s3_key}",
+                                file_id=fm.file_id,
+                                version=fm.updated_at
+                            )
+                            for fm in file_metadata
+                        ])
+                        sql_query, cache_key, sql_response = await sql_task
+                        if sql_response:
+                            yield "usage", sql_response
+                        
+                        # Add SQL query as artifact
+                        yield "artifact", Artifact(
+                            type="sql",
+                            content=sql_query,
+                            title="Generated SQL Query"
+                        )
+                        
+                        # Execute query
+                        results = await catalog.aquery_arrow(sql_query)
+                except QueryError as e:
+                    # Plain QueryError means the SQL itself failed; limit errors say nothing about it
+                    if cache_key and type(e) is QueryError:
+                        await self.sql_cache.invalidate(cache_key)
+                    raise HTTPException(status_code=e.status_code, detail=e.to_dict())
+                except ExecutorSaturatedError:
+                    raise HTTPException(status_code=503, detail="Too many requests in progress, please retry")
+                except ModelUnavailableError as e:
+                    raise HTTPException(status_code=503, detail=str(e))
+                except asyncio.TimeoutError:
+                    raise HTTPException(status_code=504, detail="SQL generation timed out")
+                finally:
+                    sql_task.cancel()
+                results_markdown = to_markdown(results)
                 
                 # Add data results as artifact
-                artifacts.append(Artifact(
+                yield "artifact", Artifact(
                     type="results",
                     content=results_markdown,
                     # content=results.to_json(orient="records"),
                     title="Query Results"
-                ))
-
-                plotly_request_prompt = f"DATA:\n\n{results.to_markdown()}\n\nUSER_INPUT:\n\n{message_data.content}\n\n"
-                plotly_json_str = ChartBuilder(llm=ai_client).run(results, conversation + [UserMessage(content=plotly_request_prompt)])
-                if plotly_json_str:
-                    artifacts.append(Artifact(
-                        type="chart",
-                        content=plotly_json_str,
-                        title="Generated Plotly json"
-                    ))
-                result_prompt = f"CONTEXT:\n\n{results_markdown}\n\nUSER_INPUT:\n\n{message_data.content}\n\n"
-                model_response = ai_client.run(
-                    PromptHub().chat_with_data, 
-                    conversation + [UserMessage(content=result_prompt)]
                 )
-            else:
-                # No selected files, use regular chat
-                model_response = ai_client.run(
-                    PromptHub().chat_with_bro, 
-                    conversation + [UserMessage(content=message_data.content)]
-                )
-        else:
-            # Regular chat without data context
-            model_response = ai_client.run(
-                PromptHub().chat_with_bro, 
-                conversation + [UserMessage(content=message_data.content)]
-            )
+
+                # Chart and answer only depend on the results, so the chart runs alongside the answer
+                plotly_request_prompt = f"DATA:\n\n{results_markdown}\n\nUSER_INPUT:\n\n{message_data.content}\n\n"
+                chart_builder = ChartBuilder(llm=ai_client)
+                chart_task = asyncio.create_task(asyncio.wait_for(
+                    chart_builder.arun(results, context.build("chart", plotly_request_prompt)),
+                    settings.CHART_STAGE_TIMEOUT_SECONDS
+                ))
+                try:
+                    result_prompt = f"CONTEXT:\n\n{results_markdown}\n\nUSER_INPUT:\n\n{message_data.content}\n\n"
+                    yield "answer", (PromptHub().chat_with_data, context.build("answer", result_prompt))
+                    
+                    try:
+                        plotly_json_str = await chart_task
+                        skipped_reason = None if plotly_json_str else "generation failed"
+                    except asyncio.TimeoutError:
+                        plotly_json_str, skipped_reason = None, "timed out"
+                    except ExecutorSaturatedError:
+                        # Overload is reported as a 503 rather than hidden as a skipped chart
+                        raise
+                    except Exception as e:
+                        logger.warning("Chart stage failed: %s", e)
+                        plotly_json_str, skipped_reason = None, "generation failed"
+                    if chart_builder.response:
+                        yield "usage", chart_builder.response
+                    
+                    if plotly_json_str:
+                        yield "artifact", Artifact(
+                            type="chart",
+                            content=plotly_json_str,
+                            title="Generated Plotly json"
+                        )
+                    else:
+                        yield "artifact", Artifact(
+                            type="chart",
+                            content=None,
+                            title=f"Chart skipped: {skipped_reason}",
+                            status="skipped"
+                        )
+                finally:
+                    chart_task.cancel()
+                return
         
+        # Regular chat without data context, or no selected files
+        yield "answer", (PromptHub().chat_with_bro, context.build("answer", message_data.content))
+
+    async def save_assistant_message(self, session_id: str, user_id: str, model_response, artifacts: list,
+                                     context_tokens_saved: int = 0, stage_responses: Optional[list] = None) -> ChatResponse:
+        """Persist the assistant reply and build the API response; token counts cover every stage"""
+        stage_responses = stage_responses or []
+        # The first call on a cold container pays for client setup, usually the SQL stage
+        client_init_ms = sum(response.client_init_ms for response in [model_response, *stage_responses])
+        usage = total_usage(model_response, stage_responses)
         # Create assistant message record
         ai_msg = await self.message_repo.create_assistant_message(
             session_id=session_id,
             user_id=user_id,
             content=model_response.content,
             model_name=model_response.model_name,
-            input_tokens=model_response.input_tokens,
-            output_tokens=model_response.output_tokens,
             response_time_ms=model_response.response_time_ms,
+            queue_time_ms=model_response.queue_time_ms,
+            client_init_ms=client_init_ms,
+            **usage,
+            context_tokens_saved=context_tokens_saved,
             reason=model_response.reason,
             artifacts=[artifact.model_dump() for artifact in artifacts] if artifacts else None
         )
+        logger.info("Assistant message %s: %d model calls, %d input and %d output tokens, $%.6f",
+                    ai_msg.message_id, 1 + len(stage_responses), usage['input_tokens'], usage['output_tokens'],
+                    usage_cost([model_response, *stage_responses]))
         
         return ChatResponse(
             id=ai_msg.message_id,
@@ -176,6 +298,115 @@ class ChatService:
             # artifacts=artifacts if artifacts else None
         )
 
+    async def send_message(self, session_id: str, user_id: str, message_data: MessageSend) -> ChatResponse:
+        """Send message and get AI response"""
+        session, ai_client, context = await self.prepare_message(session_id, user_id, message_data)
+        
+        artifacts = []
+        stage_responses = []
+        answer_task = None
+        try:
+            async for kind, payload in self.run_pipeline(session, ai_client, context, message_data):
+                if kind == "artifact":
+                    artifacts.append(payload)
+                elif kind == "usage":
+                    stage_responses.append(payload)
+                else:
+                    # Start the answer now; the pipeline may still be building the chart
+                    answer_task = asyncio.create_task(asyncio.wait_for(
+                        ai_client.arun(*payload), settings.ANSWER_STAGE_TIMEOUT_SECONDS
+                    ))
+            model_response = await answer_task
+        except ExecutorSaturatedError:
+            raise HTTPException(status_code=503, detail="Too many requests in progress, please retry")
+        except ModelUnavailableError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Answer generation timed out")
+        finally:
+            if answer_task:
+                answer_task.cancel()
+        return await self.save_assistant_message(session_id, user_id, model_response, artifacts, context.saved_tokens,
+                                                 stage_responses)
+
+    async def stream_message(self, session_id: str, user_id: str, message_data: MessageSend) -> AsyncIterator[str]:
+        """
+        Validate and store the user message, then return a Server-Sent Events stream.
+        Artifacts are emitted as each stage finishes and interleave with answer deltas;
+        the assistant message is persisted once the answer and chart are complete.
+        """
+        session, ai_client, context = await self.prepare_message(session_id, user_id, message_data)
+        
+        async def events():
+            queue = asyncio.Queue()
+            
+            async def pump(source):
+                """Forward (kind, payload) items from source into the shared queue"""
+                try:
+                    async for item in source:
+                        await queue.put(item)
+                except Exception as e:
+                    await queue.put(("error", e))
+                finally:
+                    await queue.put(("end", None))
+            
+            async def answer_chunks(system_prompt, messages):
+                async with asyncio.timeout(settings.ANSWER_STAGE_TIMEOUT_SECONDS):
+                    if not ai_client.supports_streaming:
+                        # Sent as a single delta once the regular call returns
+                        model_response = await ai_client.arun(system_prompt, messages)
+                        yield "chunk", StreamDelta(content=model_response.content)
+                        yield "chunk", model_response
+                        return
+                    async for chunk in ai_client.astream(system_prompt, messages):
+                        yield "chunk", chunk
+            
+            tasks = [asyncio.create_task(pump(self.run_pipeline(session, ai_client, context, message_data)))]
+            artifacts = []
+            stage_responses = []
+            model_response = None
+            try:
+                active = len(tasks)
+                while active:
+                    kind, payload = await queue.get()
+                    if kind == "end":
+                        active -= 1
+                    elif kind == "error":
+                        raise payload
+                    elif kind == "artifact":
+                        artifacts.append(payload)
+                        yield sse_event("artifact", payload.model_dump())
+                    elif kind == "usage":
+                        stage_responses.append(payload)
+                    elif kind == "answer":
+                        tasks.append(asyncio.create_task(pump(answer_chunks(*payload))))
+                        active += 1
+                    elif isinstance(payload, StreamDelta):
+                        yield sse_event("delta", payload.model_dump())
+                    else:
+                        model_response = payload
+                
+                response = await self.save_assistant_message(session_id, user_id, model_response, artifacts,
+                                                             context.saved_tokens, stage_responses)
+                response.model_name = message_data.model_id
+                yield sse_event("done", response.model_dump(mode="json"))
+            except HTTPException as e:
+                yield sse_event("error", dict(status_code=e.status_code, detail=e.detail))
+            except ExecutorSaturatedError:
+                yield sse_event("error", dict(status_code=503, detail="Too many requests in progress, please retry"))
+            except ModelUnavailableError as e:
+                yield sse_event("error", dict(status_code=503, detail=str(e)))
+            except asyncio.TimeoutError:
+                yield sse_event("error", dict(status_code=504, detail="Answer generation timed out"))
+            except Exception as e:
+                # Headers are already sent, so failures are reported in-band
+                yield sse_event("error", dict(status_code=500, detail=str(e)))
+            finally:
+                for task in tasks:
+                    task.cancel()
+        
+        return events()
+
     async def get_artifacts(self, message_id: str, user_id: str)->ArtifactResponse:
         """Get artifacts for a message"""
         message = await self.message_repo.get_by_id(message_id)
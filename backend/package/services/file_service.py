@@ -1,22 +1,30 @@
 from datetime import datetime, timezone
-from fastapi import HTTPException
+from fastapi import HTTPException, BackgroundTasks
 from typing import List, Optional
 from package.core.repositories import FileRepository, ProjectRepository
 from package.schemas.file import File, FileStatus, FileSource
 from package.core.interface import FieldDetail
 from package.routers.files.interface import FileResponse, FileListResponse, FileMetadataResponse, PresignedUrlResponse
 from package.core.config import settings
-from package.core.data_catalog import DataCatalog
-from package.core.aws_config import get_aws_configs
+from package.core.data_catalog import CatalogPool
+from package.core.executor import ExecutorSaturatedError
+from package.core.access_cache import AccessCache
 from package.core.interface import FileMetadata
 from uuid import uuid4
 import boto3
+import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 s3_client = boto3.client('s3', region_name=settings.AWS_REGION)
 class FileService:
-    def __init__(self, file_repo: FileRepository, project_repo: ProjectRepository):
+    def __init__(self, file_repo: FileRepository, project_repo: ProjectRepository, catalog_pool: CatalogPool,
+                 access_cache: AccessCache):
         self.file_repo = file_repo
         self.project_repo = project_repo
+        self.catalog_pool = catalog_pool
+        self.access_cache = access_cache
 
     async def create_file_record(self, project_id: str, user_id: str, filename: str, 
                                s3_key: str, size: int, file_id: Optional[str] = None,
@@ -24,8 +32,7 @@ class FileService:
                                source: FileSource = FileSource.USER_UPLOAD) -> FileResponse:
         """Create file record"""
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_project(project_id, user_id):
             raise HTTPException(status_code=404, detail="Project not found")
         
         if file_id:
@@ -36,6 +43,7 @@ class FileService:
                        size=size, status=status, source=source)
         
         created_file = await self.file_repo.create(file)
+        await self.project_repo.increment_counts(project_id, file_count=1)
         
         return FileResponse(
             file_id=created_file.file_id,
@@ -52,8 +60,7 @@ class FileService:
     async def get_project_files(self, project_id: str, user_id: str, status: Optional[str] = None) -> FileListResponse:
         """Get all files for a project"""
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_project(project_id, user_id):
             raise HTTPException(status_code=404, detail="Project not found")
         
         files = await self.file_repo.get_by_project_id(project_id, status)
@@ -82,8 +89,7 @@ class FileService:
             raise HTTPException(status_code=404, detail="File not found")
         
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(file.project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_project(file.project_id, user_id):
             raise HTTPException(status_code=404, detail="File not found")
         
         return FileMetadataResponse(
@@ -103,16 +109,13 @@ class FileService:
     
     async def update_file_status(self, file_id: str, user_id: str, status: str) -> FileResponse:
         """Update file status"""
-        file = await self.file_repo.get_by_id(file_id)
-        if not file:
-            raise HTTPException(status_code=404, detail="File not found")
-        
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(file.project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_file(file_id, user_id):
             raise HTTPException(status_code=404, detail="File not found")
         
         updated_file = await self.file_repo.update_status(file_id, status)
+        if not updated_file:
+            raise HTTPException(status_code=404, detail="File not found")
         
         return FileResponse(
             file_id=updated_file.file_id,
@@ -129,16 +132,14 @@ class FileService:
     async def update_file_metadata(self, file_id: str, user_id: str, name: str, 
                                  description: str, columns: List[FieldDetail]) -> FileResponse:
         """Update file metadata"""
-        file = await self.file_repo.get_by_id(file_id)
-        if not file:
-            raise HTTPException(status_code=404, detail="File not found")
-        
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(file.project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_file(file_id, user_id):
             raise HTTPException(status_code=404, detail="File not found")
         
         updated_file = await self.file_repo.update_metadata(file_id, name, description, columns)
+        if not updated_file:
+            raise HTTPException(status_code=404, detail="File not found")
+        self.catalog_pool.invalidate_file(file_id)
         
         return FileResponse(
             file_id=updated_file.file_id,
@@ -154,16 +155,13 @@ class FileService:
     
     async def update_file_selection(self, file_id: str, user_id: str, selected: bool) -> FileResponse:
         """Update file selection status"""
-        file = await self.file_repo.get_by_id(file_id)
-        if not file:
-            raise HTTPException(status_code=404, detail="File not found")
-        
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(file.project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_file(file_id, user_id):
             raise HTTPException(status_code=404, detail="File not found")
         
         updated_file = await self.file_repo.update_selection(file_id, selected)
+        if not updated_file:
+            raise HTTPException(status_code=404, detail="File not found")
         
         return FileResponse(
             file_id=updated_file.file_id,
@@ -177,24 +175,25 @@ class FileService:
             updated_at=datetime.fromisoformat(updated_file.updated_at)
         )
     
-    async def confirm_file_upload(self, file_id: str, user_id: str, size: int) -> FileResponse:
+    async def confirm_file_upload(self, file_id: str, user_id: str, size: int,
+                                  background_tasks: Optional[BackgroundTasks] = None) -> FileResponse:
         """Confirm file upload and update size and status"""
-        file = await self.file_repo.get_by_id(file_id)
-        if not file:
-            raise HTTPException(status_code=404, detail="File not found")
-        
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(file.project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_file(file_id, user_id):
             raise HTTPException(status_code=404, detail="File not found")
         
         updated_file = await self.file_repo.confirm_upload(file_id, size)
+        if not updated_file:
+            raise HTTPException(status_code=404, detail="File not found")
+        self.catalog_pool.invalidate_file(file_id)
         
-        # Create metadata after uploading complete
-        catalog = DataCatalog(aws_configs=get_aws_configs())
+        # Create metadata after uploading complete, reading only a sample of the file
         source = f"s3://{settings.FILE_BUCKET}/{updated_file.s3_key}"
-        catalog.register(name="mock", source=source)
-        file_df = catalog.query("DESCRIBE mock;")
+        try:
+            async with self.catalog_pool.alease() as catalog:
+                file_df = await catalog.asniff_schema(source)
+        except ExecutorSaturatedError:
+            raise HTTPException(status_code=503, detail="Too many data queries in progress, please retry")
         
         # Generate metadata from dataframe
         fm = FileMetadata.from_dataframe(
@@ -205,6 +204,15 @@ class FileService:
         
         # Update file with extracted metadata
         final_file = await self.file_repo.update_metadata(file_id, fm.name, fm.description, fm.columns)
+        if not final_file:
+            # Deleted while its schema was being sniffed; there is nothing left to convert
+            raise HTTPException(status_code=404, detail="File not found")
+        
+        # The full scan (Parquet conversion) runs after the response is sent
+        if background_tasks is not None:
+            background_tasks.add_task(self.convert_to_parquet, final_file)
+        else:
+            await self.convert_to_parquet(final_file)
         
         return FileResponse(
             file_id=updated_file.file_id,
@@ -218,11 +226,28 @@ class FileService:
             updated_at=datetime.fromisoformat(updated_file.updated_at)
         )
     
+    async def convert_to_parquet(self, file: File) -> Optional[str]:
+        """Write a Parquet sibling of the uploaded CSV, record its key and return it"""
+        base_key, extension = os.path.splitext(file.s3_key)
+        if extension.lower() == ".parquet":
+            return None
+        parquet_key = f"{base_key}.parquet"
+        try:
+            async with self.catalog_pool.alease() as catalog:
+                await catalog.aexport_parquet(
+                    source=f"s3://{settings.FILE_BUCKET}/{file.s3_key}",
+                    target=f"s3://{settings.FILE_BUCKET}/{parquet_key}"
+                )
+        except Exception as e:
+            logger.warning("Failed to convert %s to parquet: %s", file.s3_key, e)
+            return None
+        await self.file_repo.update(file.file_id, parquet_key=parquet_key)
+        return parquet_key
+    
     async def get_selected_files(self, project_id: str, user_id: str) -> FileListResponse:
         """Get selected files for a project"""
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_project(project_id, user_id):
             raise HTTPException(status_code=404, detail="Project not found")
         
         files = await self.file_repo.get_selected_by_project(project_id)
@@ -246,16 +271,17 @@ class FileService:
     
     async def delete_file(self, file_id: str, user_id: str) -> bool:
         """Delete file"""
-        file = await self.file_repo.get_by_id(file_id)
-        if not file:
-            raise HTTPException(status_code=404, detail="File not found")
-        
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(file.project_id, user_id)
-        if not project:
+        project_id = await self.access_cache.owns_file(file_id, user_id)
+        if not project_id:
             raise HTTPException(status_code=404, detail="File not found")
         
-        return await self.file_repo.delete(file_id)
+        self.catalog_pool.invalidate_file(file_id)
+        deleted = await self.file_repo.delete(file_id)
+        self.access_cache.invalidate_file(file_id)
+        if deleted:
+            await self.project_repo.increment_counts(project_id, file_count=-1)
+        return deleted
 
     async def count_by_project_id(self, project_id:str) -> int | None:
         response = await self.file_repo.count_by_project_id(project_id)
@@ -280,6 +306,7 @@ class FileService:
             
             entity = File(project_id=project_id, filename=filename, s3_key=s3_key, file_id=file_id, size=0)
             _ = await self.file_repo.create(entity)
+            await self.project_repo.increment_counts(project_id, file_count=1)
             return PresignedUrlResponse(
                 url=response['url'],
                 file_id=file_id,
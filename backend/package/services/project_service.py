@@ -5,13 +5,16 @@ from package.core.repositories import ProjectRepository
 from package.schemas.project import Project
 from package.routers.projects.interface import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListResponse
 from package.core.repositories import ProjectRepository, FileRepository, SessionRepository
+from package.core.access_cache import AccessCache
 
 
 class ProjectService:
-    def __init__(self, project_repo: ProjectRepository, file_repo: FileRepository, session_repo: SessionRepository):
+    def __init__(self, project_repo: ProjectRepository, file_repo: FileRepository, session_repo: SessionRepository,
+                 access_cache: AccessCache):
         self.project_repo = project_repo
         self.file_repo = file_repo
         self.session_repo = session_repo
+        self.access_cache = access_cache
     
     async def create_project(self, user_id: str, project_data: ProjectCreate) -> ProjectResponse:
         """Create new project"""
@@ -34,19 +37,18 @@ class ProjectService:
         """Get all projects for a user with file and session counts"""
         projects = await self.project_repo.get_by_user_id(user_id)
         
-        project_responses = []
-        for project in projects:
-            file_count = await self.file_repo.count_by_project_id(project.project_id)
-            session_count = await self.session_repo.count_by_project_id(project.project_id)
-            project_responses.append(ProjectResponse(
+        project_responses = [
+            ProjectResponse(
                 project_id=project.project_id,
                 name=project.name,
                 description=project.description,
                 created_at=datetime.fromisoformat(project.created_at),
                 updated_at=datetime.fromisoformat(project.updated_at),
-                file_count=file_count,
-                session_count=session_count
-            ))
+                file_count=project.file_count,
+                session_count=project.session_count
+            )
+            for project in projects
+        ]
         
         return ProjectListResponse(projects=project_responses)
 
@@ -62,14 +64,15 @@ class ProjectService:
             name=project.name,
             description=project.description,
             created_at=datetime.fromisoformat(project.created_at),
-            updated_at=datetime.fromisoformat(project.updated_at)
+            updated_at=datetime.fromisoformat(project.updated_at),
+            file_count=project.file_count,
+            session_count=project.session_count
         )
     
     async def update_project(self, project_id: str, user_id: str, project_data: ProjectUpdate) -> ProjectResponse:
         """Update project"""
         # Check ownership first
-        existing_project = await self.project_repo.get_by_id_and_user(project_id, user_id)
-        if not existing_project:
+        if not await self.access_cache.owns_project(project_id, user_id):
             raise HTTPException(status_code=404, detail="Project not found")
         
         # Update project
@@ -80,6 +83,8 @@ class ProjectService:
             description=project_data.description,
             updated_at=updated_at
         )
+        if not updated_project:
+            raise HTTPException(status_code=404, detail="Project not found")
         
         return ProjectResponse(
             project_id=updated_project.project_id,
@@ -92,8 +97,9 @@ class ProjectService:
     async def delete_project(self, project_id: str, user_id: str) -> bool:
         """Delete project"""
         # Check ownership first
-        existing_project = await self.project_repo.get_by_id_and_user(project_id, user_id)
-        if not existing_project:
+        if not await self.access_cache.owns_project(project_id, user_id):
             raise HTTPException(status_code=404, detail="Project not found")
         
-        return await self.project_repo.delete(project_id)
\ No newline at end of file
+        deleted = await self.project_repo.delete(project_id)
+        self.access_cache.invalidate_project(project_id)
+        return deleted
\ No newline at end of file
@@ -2,19 +2,20 @@ from datetime import datetime, timezone
 from fastapi import HTTPException
 from typing import List
 from package.core.repositories import SessionRepository, ProjectRepository
+from package.core.access_cache import AccessCache
 from package.schemas.session import Session
 from package.routers.sessions.interface import SessionCreate, SessionUpdate, SessionResponse, SessionListResponse
 
 class SessionService:
-    def __init__(self, session_repo: SessionRepository, project_repo: ProjectRepository):
+    def __init__(self, session_repo: SessionRepository, project_repo: ProjectRepository, access_cache: AccessCache):
         self.session_repo = session_repo
         self.project_repo = project_repo
+        self.access_cache = access_cache
     
     async def create_session(self, project_id: str, user_id: str, session_data: SessionCreate) -> SessionResponse:
         """Create new session"""
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_project(project_id, user_id):
             raise HTTPException(status_code=404, detail="Project not found")
         
         session = Session(
@@ -22,6 +23,7 @@ class SessionService:
             name=session_data.name
         )
         created_session = await self.session_repo.create(session)
+        await self.project_repo.increment_counts(project_id, session_count=1)
         
         return SessionResponse(
             session_id=created_session.session_id,
@@ -34,8 +36,7 @@ class SessionService:
     async def get_project_sessions(self, project_id: str, user_id: str) -> SessionListResponse:
         """Get all sessions for a project"""
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_project(project_id, user_id):
             raise HTTPException(status_code=404, detail="Project not found")
         
         sessions = await self.session_repo.get_by_project_id(project_id)
@@ -60,8 +61,7 @@ class SessionService:
             raise HTTPException(status_code=404, detail="Session not found")
         
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(session.project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_project(session.project_id, user_id):
             raise HTTPException(status_code=404, detail="Session not found")
         
         return SessionResponse(
@@ -74,13 +74,8 @@ class SessionService:
     
     async def update_session(self, session_id: str, user_id: str, session_data: SessionUpdate) -> SessionResponse:
         """Update session"""
-        session = await self.session_repo.get_by_id(session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(session.project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_session(session_id, user_id):
             raise HTTPException(status_code=404, detail="Session not found")
         
         # Update session
@@ -90,6 +85,8 @@ class SessionService:
             name=session_data.name,
             updated_at=updated_at
         )
+        if not updated_session:
+            raise HTTPException(status_code=404, detail="Session not found")
         
         return SessionResponse(
             session_id=updated_session.session_id,
@@ -101,16 +98,13 @@ class SessionService:
     
     async def refresh_session(self, session_id: str, user_id: str) -> SessionResponse:
         """Refresh session timestamp"""
-        session = await self.session_repo.get_by_id(session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(session.project_id, user_id)
-        if not project:
+        if not await self.access_cache.owns_session(session_id, user_id):
             raise HTTPException(status_code=404, detail="Session not found")
         
         refreshed_session = await self.session_repo.refresh_timestamp(session_id)
+        if not refreshed_session:
+            raise HTTPException(status_code=404, detail="Session not found")
         
         return SessionResponse(
             session_id=refreshed_session.session_id,
@@ -122,16 +116,16 @@ class SessionService:
     
     async def delete_session(self, session_id: str, user_id: str) -> bool:
         """Delete session"""
-        session = await self.session_repo.get_by_id(session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
         # Verify project ownership
-        project = await self.project_repo.get_by_id_and_user(session.project_id, user_id)
-        if not project:
+        project_id = await self.access_cache.owns_session(session_id, user_id)
+        if not project_id:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        return await self.session_repo.delete(session_id)
+        deleted = await self.session_repo.delete(session_id)
+        self.access_cache.invalidate_session(session_id)
+        if deleted:
+            await self.project_repo.increment_counts(project_id, session_count=-1)
+        return deleted
 
     async def count_by_project_id(self, project_id: str) -> int:
         return await self.session_repo.count_by_project_id(project_id)
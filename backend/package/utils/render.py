@@ -0,0 +1,6 @@
+import pyarrow as pa
+from tabulate import tabulate
+
+def to_markdown(table: pa.Table) -> str:
+    """Render an Arrow table as a pipe table, matching DataFrame.to_markdown()"""
+    return tabulate(table.to_pydict(), headers="keys", tablefmt="pipe", showindex=True)
\ No newline at end of file
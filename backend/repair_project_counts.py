@@ -0,0 +1,70 @@
+"""
+Recompute the denormalized file_count and session_count on every project.
+
+The counters are maintained with atomic ADD updates when files and sessions are
+created or deleted; run this after a backfill, or if a failed request left them
+out of step with the files and sessions tables.
+
+    uv run python repair_project_counts.py [--dry-run]
+"""
+import argparse
+import boto3
+from package.core.config import settings
+from package.databases.dynamodb.conditions import update_existing
+
+def count_by_project(table, project_id: str) -> int:
+    params = dict(
+        IndexName='ProjectIndex',
+        KeyConditionExpression='project_id = :project_id',
+        ExpressionAttributeValues={':project_id': project_id},
+        Select='COUNT'
+    )
+    count = 0
+    while True:
+        response = table.query(**params)
+        count += response.get('Count', 0)
+        if 'LastEvaluatedKey' not in response:
+            return count
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def scan_projects(table):
+    params = dict(ProjectionExpression='project_id, file_count, session_count')
+    while True:
+        response = table.scan(**params)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def repair(dry_run: bool = False):
+    dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION, endpoint_url=settings.DYNAMODB_ENDPOINT_URL or None)
+    projects = dynamodb.Table(settings.PROJECTS_TABLE)
+    files = dynamodb.Table(settings.FILES_TABLE)
+    sessions = dynamodb.Table(settings.SESSIONS_TABLE)
+
+    checked = repaired = 0
+    for project in scan_projects(projects):
+        checked += 1
+        project_id = project['project_id']
+        file_count = count_by_project(files, project_id)
+        session_count = count_by_project(sessions, project_id)
+        if project.get('file_count') == file_count and project.get('session_count') == session_count:
+            continue
+
+        repaired += 1
+        print(f"{project_id}: files {project.get('file_count')} -> {file_count}, sessions {project.get('session_count')} -> {session_count}")
+        if not dry_run:
+            update_existing(projects, {'project_id': project_id},
+                UpdateExpression='SET file_count = :files, session_count = :sessions',
+                ExpressionAttributeValues={':files': file_count, ':sessions': session_count}
+            )
+    print(f"Checked {checked} projects, {'would repair' if dry_run else 'repaired'} {repaired}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="report drift without writing")
+    args = parser.parse_args()
+    repair(args.dry_run)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import pytest
+
+class FakeS3:
+    """In-memory stand-in for the boto3 S3 client calls the object cache makes"""
+    def __init__(self):
+        self.objects = {}
+        self.downloads = 0
+        self.fail_downloads = False
+
+    def put(self, key: str, body: str, etag: str):
+        self.objects[key] = (body, etag)
+
+    def head_object(self, Bucket, Key):
+        body, etag = self.objects[Key]
+        return {'ETag': f'"{etag}"', 'ContentLength': len(body)}
+
+    def download_file(self, bucket, key, path):
+        self.downloads += 1
+        with open(path, "w") as f:
+            f.write(self.objects[key][0][:5])
+            if self.fail_downloads:
+                raise ConnectionError("connection reset")
+            f.write(self.objects[key][0][5:])
+
+@pytest.fixture
+def s3():
+    return FakeS3()
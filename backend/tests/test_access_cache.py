@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import package.core.access_cache as access_cache
+from package.core.access_cache import AccessCache, AccessMemoMiddleware
+
+class Repo:
+    """Counts lookups against an in-memory table of entities"""
+    def __init__(self, **entities):
+        self.entities = entities
+        self.lookups = 0
+
+    async def get_by_id(self, id):
+        self.lookups += 1
+        return self.entities.get(id)
+
+def make_cache(**kwargs):
+    projects = Repo(p1=SimpleNamespace(user_id='u1'))
+    sessions = Repo(s1=SimpleNamespace(project_id='p1'))
+    files = Repo(f1=SimpleNamespace(project_id='p1'))
+    return AccessCache(projects, sessions, files, **kwargs), projects, sessions
+
+def test_ownership_checks():
+    cache, _, _ = make_cache()
+
+    async def scenario():
+        assert await cache.owns_project('p1', 'u1')
+        assert not await cache.owns_project('p1', 'u2')
+        assert await cache.owns_session('s1', 'u1') == 'p1'
+        assert await cache.owns_file('f1', 'u2') is None
+        assert await cache.owns_session('missing', 'u1') is None
+
+    asyncio.run(scenario())
+
+def test_lru_hits_until_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(access_cache.time, "monotonic", lambda: now[0])
+    cache, projects, _ = make_cache(ttl_seconds=30)
+
+    async def scenario():
+        await cache.project_owner('p1')
+        await cache.project_owner('p1')
+        assert projects.lookups == 1
+        now[0] = 130.0
+        await cache.project_owner('p1')
+        assert projects.lookups == 2
+
+    asyncio.run(scenario())
+    assert cache.stats()['hits'] == 1
+
+def test_missing_entities_are_not_cached():
+    cache, _, sessions = make_cache()
+
+    async def scenario():
+        await cache.session_project('missing')
+        sessions.entities['missing'] = SimpleNamespace(project_id='p1')
+        assert await cache.session_project('missing') == 'p1'
+
+    asyncio.run(scenario())
+    assert sessions.lookups == 2
+
+def test_invalidate_drops_the_entry():
+    cache, _, sessions = make_cache()
+
+    async def scenario():
+        await cache.session_project('s1')
+        del sessions.entities['s1']
+        cache.invalidate_session('s1')
+        assert await cache.session_project('s1') is None
+
+    asyncio.run(scenario())
+
+def test_memo_is_per_request_even_without_ttl():
+    cache, projects, _ = make_cache(ttl_seconds=0)
+    app = FastAPI()
+    app.add_middleware(AccessMemoMiddleware)
+
+    @app.get("/check")
+    async def check():
+        # Several checks in one request share a single lookup
+        await cache.owns_project('p1', 'u1')
+        await cache.owns_session('s1', 'u1')
+        return dict(lookups=projects.lookups)
+
+    client = TestClient(app)
+    assert client.get("/check").json() == dict(lookups=1)
+    assert client.get("/check").json() == dict(lookups=2)
+    assert cache.stats()['entries'] == 0
+
+def test_memo_hits_are_counted_across_threads():
+    cache, projects, _ = make_cache()
+
+    def request():
+        # Each thread runs its own request with its own memo
+        async def checks():
+            access_cache._request_memo.set({})
+            for _ in range(500):
+                await cache.owns_project('p1', 'u1')
+        asyncio.run(checks())
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats['memo_hits'] + stats['hits'] + stats['misses'] == 8 * 500
+    assert stats['memo_hits'] == 8 * 499
@@ -0,0 +1,119 @@
+import asyncio
+import time
+import pytest
+from botocore.exceptions import ClientError
+from package.llms.admission import AdmissionController, CircuitOpenError, ModelThrottledError
+
+def throttle():
+    return ClientError({'Error': {'Code': 'ThrottlingException'}}, 'Converse')
+
+def controller(**kwargs):
+    options = dict(initial_limit=2, max_limit=4, max_retries=2, base_delay=0.001, max_delay=0.001,
+                   failure_threshold=2, reset_seconds=0.05)
+    options.update(kwargs)
+    return AdmissionController("test", **options)
+
+def failing(times, exc=throttle):
+    calls = []
+    async def fn():
+        calls.append(1)
+        if len(calls) <= times:
+            raise exc()
+        return "ok"
+    return fn, calls
+
+def open_circuit(gate):
+    gate.opened_at = time.monotonic() - gate.reset_seconds - 1
+
+def test_retries_throttling_then_succeeds():
+    gate = controller(failure_threshold=10)
+    fn, calls = failing(2)
+    assert asyncio.run(gate.call(fn)) == "ok"
+    assert len(calls) == 3
+    assert gate.stats()['retries'] == 2
+    assert gate.stats()['throttled'] == 2
+
+def test_gives_up_after_max_retries():
+    gate = controller(failure_threshold=10)
+    fn, calls = failing(10)
+    with pytest.raises(ModelThrottledError):
+        asyncio.run(gate.call(fn))
+    assert len(calls) == 3
+    assert gate.in_flight == 0
+
+def test_caller_errors_are_not_retried():
+    gate = controller()
+    fn, calls = failing(1, exc=lambda: ValueError("bad request"))
+    with pytest.raises(ValueError):
+        asyncio.run(gate.call(fn))
+    assert len(calls) == 1
+    assert gate.opened_at is None
+
+def test_circuit_opens_then_recovers_through_trial():
+    gate = controller(max_retries=0)
+    for _ in range(2):
+        with pytest.raises(ModelThrottledError):
+            asyncio.run(gate.call(failing(1)[0]))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(gate.call(failing(0)[0]))
+
+    time.sleep(gate.reset_seconds)
+    assert asyncio.run(gate.call(failing(0)[0])) == "ok"
+    assert gate.stats()['circuit_open'] is False
+
+def test_failed_trial_reopens_circuit():
+    gate = controller(max_retries=0)
+    open_circuit(gate)
+    with pytest.raises(ModelThrottledError):
+        asyncio.run(gate.call(failing(1)[0]))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(gate.call(failing(0)[0]))
+
+def test_cancelled_half_open_trial_frees_the_trial():
+    gate = controller(initial_limit=1, max_limit=1)
+
+    async def scenario():
+        await gate.acquire()  # hold the only slot
+        open_circuit(gate)
+        trial = asyncio.create_task(gate.call(failing(0)[0]))
+        await asyncio.sleep(0.01)
+        assert gate.stats()['waiting'] == 1
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        gate.release()
+        return await gate.call(failing(0)[0])
+
+    assert asyncio.run(scenario()) == "ok"
+    assert gate.stats()['circuit_open'] is False
+    assert gate.in_flight == 0
+
+def test_concurrency_stays_under_limit():
+    gate = controller(initial_limit=2, max_limit=2)
+    active, peak = 0, 0
+
+    async def fn():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "ok"
+
+    async def scenario():
+        return await asyncio.gather(*[gate.call(fn) for _ in range(8)])
+
+    assert asyncio.run(scenario()) == ["ok"] * 8
+    assert peak == 2
+    assert gate.in_flight == 0
+
+def test_held_slot_is_kept_until_released():
+    gate = controller(initial_limit=1, max_limit=1)
+
+    async def scenario():
+        await gate.call(failing(0)[0], hold=True)
+        assert gate.in_flight == 1
+        gate.release()
+        assert gate.in_flight == 0
+
+    asyncio.run(scenario())
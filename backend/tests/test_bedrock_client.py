@@ -0,0 +1,30 @@
+from package.llms.bedrock import BedrockNova, ADMITTED_RETRIES
+
+def test_direct_calls_keep_sdk_retries():
+    model = BedrockNova("us.amazon.nova-lite-v1:0")
+    assert model.get_model().meta.config.retries == {'mode': 'adaptive', 'total_max_attempts': 5}
+
+def test_admitted_calls_make_a_single_attempt():
+    model = BedrockNova("us.amazon.nova-lite-v1:0")
+    client = model.get_model(ADMITTED_RETRIES)
+    assert client.meta.config.retries == {'mode': 'standard', 'total_max_attempts': 1}
+    assert client is model.get_model(ADMITTED_RETRIES)
+    assert client is not model.get_model()
+
+def test_stream_takes_its_client_on_the_first_step():
+    class FakeClient:
+        def converse_stream(self, **kwargs):
+            return {'stream': EventStream([{'contentBlockDelta': {'delta': {'text': 'hi'}}}])}
+
+    class EventStream(list):
+        def close(self):
+            pass
+
+    model = BedrockNova("us.amazon.nova-lite-v1:0")
+    requested = []
+    model.get_model = lambda retries=None: requested.append(retries) or FakeClient()
+    stream = model.stream_admitted("system", [])
+    assert requested == []
+    assert next(stream).content == "hi"
+    assert requested == [ADMITTED_RETRIES]
+    stream.close()
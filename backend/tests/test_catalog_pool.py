@@ -0,0 +1,57 @@
+import package.core.data_catalog as data_catalog
+from package.core.data_catalog import CatalogPool
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+def test_httpfs_load_is_retried_with_backoff(monkeypatch):
+    attempts = []
+    outcomes = iter([False, False, True])
+    clock = Clock()
+    monkeypatch.setattr(data_catalog, "_load_httpfs", lambda conn: attempts.append(clock.now) or next(outcomes))
+    monkeypatch.setattr(data_catalog.time, "monotonic", clock.monotonic)
+    pool = CatalogPool()
+
+    def lease_at(now):
+        clock.now = now
+        with pool.lease():
+            pass
+
+    lease_at(1000.0)
+    lease_at(1000.5)  # within the first 1s backoff
+    lease_at(1001.0)
+    lease_at(1002.5)  # backoff doubled to 2s
+    assert attempts == [1000.0, 1001.0]
+    assert not pool._s3_ready
+
+    lease_at(1003.0)
+    lease_at(1010.0)
+    assert attempts == [1000.0, 1001.0, 1003.0]
+    assert pool._s3_ready
+
+def test_s3_auth_errors_reload_credentials_on_the_next_lease(monkeypatch):
+    loads = []
+    monkeypatch.setattr(data_catalog, "_load_httpfs", lambda conn: True)
+    monkeypatch.setattr(data_catalog, "_create_s3_secret", lambda conn, **config: loads.append(config))
+    pool = CatalogPool(aws_config_provider=lambda: dict(aws_access_key_id="key", aws_secret_access_key="secret"),
+                       credential_ttl_seconds=900)
+
+    def lease_raising(error):
+        try:
+            with pool.lease():
+                raise error
+        except type(error):
+            pass
+
+    lease_raising(data_catalog.QueryError("Binder Error: column not found"))
+    lease_raising(data_catalog.QueryError("IO Error: disk full"))
+    assert len(loads) == 1
+
+    lease_raising(data_catalog.QueryError("HTTP Error: HTTP GET error on 'https://bucket.s3.amazonaws.com/k' (HTTP 403)"))
+    with pool.lease():
+        pass
+    assert len(loads) == 2
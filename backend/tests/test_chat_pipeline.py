@@ -0,0 +1,214 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+from package.core.access_cache import AccessCache
+from package.core.config import settings
+from package.core.data_catalog import CatalogPool
+from package.core.executor import ExecutorSaturatedError
+from package.core.object_cache import S3ObjectCache
+from package.llms import BaseLLM, ModelFactory, ModelResponse, ModelSpec
+from package.prompt_hub import PromptHub
+from package.routers.chat.interface import MessageSend
+from package.schemas.file import File
+from package.schemas.message import Message
+from package.schemas.project import Project
+from package.schemas.session import Session
+from package.services.chat_service import ChatService
+import package.agents.chart_builder as chart_builder
+import package.core.data_catalog as data_catalog
+
+SQL = "```sql\nselect a, count(*) n from sales group by a order by a\n```"
+CHART = "```python\ndef create_chart(data):\n    import plotly.express as px\n    return px.bar(data, x='a', y='n')\n```"
+
+class ScriptedLLM(BaseLLM):
+    """Answers each pipeline stage with a fixed reply, optionally slowed down or failing"""
+    def __init__(self, model_id):
+        super().__init__(model_id)
+        self.delays = {}
+        self.failures = {}
+        self.spans = {}
+
+    def OutputMessage(self, response, response_time_ms):
+        pass
+
+    def stage(self, system_prompt) -> str:
+        first = system_prompt if isinstance(system_prompt, str) else system_prompt[0]
+        if first == PromptHub().generate_sql:
+            return "sql"
+        if first == PromptHub().chart_builder:
+            return "chart"
+        return "answer"
+
+    def run(self, system_prompt, messages):
+        stage = self.stage(system_prompt)
+        started = time.monotonic()
+        time.sleep(self.delays.get(stage, 0))
+        self.spans[stage] = (started, time.monotonic())
+        if stage in self.failures:
+            raise self.failures[stage]
+        content = dict(sql=SQL, chart=CHART).get(stage, "answer")
+        return ModelResponse(model_name=self.model_id, role="assistant", content=content, reason="",
+                             input_tokens=10, output_tokens=5, response_time_ms=1)
+
+class Repo:
+    """In-memory sessions, projects, files and messages for one user's project"""
+    def __init__(self):
+        self.messages = []
+        self.file = File(file_id="f1", project_id="p1", filename="sales.csv", s3_key="k/sales.csv", size=1,
+                         selected=True, columns=[dict(column="a", dtype="BIGINT"), dict(column="b", dtype="VARCHAR")])
+
+    async def get_by_id(self, id):
+        if id == "p1":
+            return Project(project_id="p1", user_id="u1", name="p", description="")
+        return Session(session_id=id, project_id="p1", name="s")
+
+    async def get_selected_by_project(self, project_id):
+        return [self.file]
+
+    async def batch_get_by_ids(self, ids):
+        return [self.file]
+
+    async def create_user_message(self, session_id, user_id, content, model_name):
+        message = Message(session_id=session_id, user_id=user_id, content=content, role="user", model_name=model_name)
+        self.messages.append(message)
+        return message
+
+    async def get_recent_by_session_id(self, session_id, limit=10):
+        return list(reversed(self.messages))[:limit]
+
+    async def create_assistant_message(self, **kwargs):
+        message = Message(role="assistant", **kwargs)
+        self.messages.append(message)
+        return message
+
+@pytest.fixture
+def chat(tmp_path, s3):
+    s3.put("k/sales.csv", "a,b\n1,x\n1,y\n2,z\n", "e1")
+    ModelFactory.register(ModelSpec(key="SCRIPTED", model_id="scripted-1", provider="scripted",
+                                    llm_class=ScriptedLLM, context_window=8192))
+    repo = Repo()
+    pool = CatalogPool(object_cache=S3ObjectCache(cache_dir=str(tmp_path), s3_client=s3))
+    service = ChatService(repo, repo, repo, repo, pool, AccessCache(repo, repo, repo))
+    return service, ModelFactory.create_model("SCRIPTED"), repo
+
+def send(service, chat_with_data=True):
+    return asyncio.run(service.send_message("s1", "u1", MessageSend(content="how many?", model_id="SCRIPTED",
+                                                                    chat_with_data=chat_with_data)))
+
+def chart_artifact(repo) -> dict:
+    return next(a for a in repo.messages[-1].artifacts if a["type"] == "chart")
+
+def test_chart_runs_alongside_the_answer(chat):
+    service, llm, repo = chat
+    llm.delays = dict(chart=0.3, answer=0.3)
+    assert send(service).content == "answer"
+    chart, answer = llm.spans["chart"], llm.spans["answer"]
+    assert answer[0] < chart[1] and chart[0] < answer[1]
+    assert chart_artifact(repo)["status"] == "ok"
+
+def test_chart_timeout_is_skipped(chat, monkeypatch):
+    service, llm, repo = chat
+    monkeypatch.setattr(settings, "CHART_STAGE_TIMEOUT_SECONDS", 0.1)
+    llm.delays = dict(chart=0.3)
+    assert send(service).content == "answer"
+    artifact = chart_artifact(repo)
+    assert artifact["status"] == "skipped"
+    assert artifact["title"] == "Chart skipped: timed out"
+
+def test_chart_failure_does_not_fail_the_answer(chat):
+    service, llm, repo = chat
+    llm.failures = dict(chart=ValueError("bad chart"))
+    assert send(service).content == "answer"
+    assert chart_artifact(repo)["title"] == "Chart skipped: generation failed"
+
+def test_saturated_chart_render_is_a_503(chat, monkeypatch):
+    class Saturated:
+        async def run(self, fn, *args):
+            raise ExecutorSaturatedError("llm has 0 tasks waiting")
+
+    service, llm, repo = chat
+    monkeypatch.setattr(chart_builder, "get_llm_executor", Saturated)
+    with pytest.raises(HTTPException) as e:
+        send(service)
+    assert e.value.status_code == 503
+
+def test_chart_render_runs_on_the_llm_executor(chat, monkeypatch):
+    service, llm, repo = chat
+    threads = []
+    render = chart_builder.ChartBuilder.render
+    monkeypatch.setattr(chart_builder.ChartBuilder, "render",
+                        lambda self, *args: threads.append(threading.current_thread().name) or render(self, *args))
+    send(service)
+    assert threads and threads[0].startswith("llm")
+
+def test_files_are_registered_while_sql_is_generated(chat, s3, monkeypatch):
+    service, llm, repo = chat
+    # Files are read from the local cache; skip the extension download a cold pool attempts
+    monkeypatch.setattr(data_catalog, "_load_httpfs", lambda conn: True)
+    llm.delays = dict(sql=0.3)
+    spans = []
+    download = s3.download_file
+
+    def slow_download(bucket, key, path):
+        started = time.monotonic()
+        time.sleep(0.3)
+        download(bucket, key, path)
+        spans.append((started, time.monotonic()))
+
+    monkeypatch.setattr(s3, "download_file", slow_download)
+    send(service)
+    sql, fetch = llm.spans["sql"], spans[0]
+    assert fetch[0] < sql[1] and sql[0] < fetch[1]
+
+def test_registration_failure_cancels_sql_generation(chat, s3, monkeypatch):
+    service, llm, repo = chat
+    s3.fail_downloads = True
+    cancelled = asyncio.Event()
+
+    async def generate_sql(*args):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(service, "generate_sql", generate_sql)
+
+    async def scenario():
+        with pytest.raises(ConnectionError):
+            await service.send_message("s1", "u1", MessageSend(content="how many?", model_id="SCRIPTED", chat_with_data=True))
+        await asyncio.sleep(0)
+        assert cancelled.is_set()
+
+    started = time.monotonic()
+    asyncio.run(scenario())
+    assert time.monotonic() - started < 5
+
+def stream(service, model_id="SCRIPTED"):
+    async def collect():
+        events = await service.stream_message("s1", "u1", MessageSend(content="hello", model_id=model_id))
+        return [event async for event in events]
+
+    return [event.split("\n")[0].removeprefix("event: ") for event in asyncio.run(collect())]
+
+def test_models_without_streaming_answer_through_the_regular_call(chat):
+    class BatchOnly(ScriptedLLM):
+        def stream(self, system_prompt, messages):
+            raise AssertionError("stream() called on a model without streaming")
+
+    service, _, repo = chat
+    ModelFactory.register(ModelSpec(key="BATCH", model_id="batch-1", provider="scripted", llm_class=BatchOnly,
+                                    context_window=8192, supports_streaming=False))
+    assert stream(service, "BATCH") == ["delta", "done"]
+    assert repo.messages[-1].content == "answer"
+
+def test_reply_cost_is_logged_at_each_model_price(chat, caplog):
+    service, _, _ = chat
+    ModelFactory.register(ModelSpec(key="SCRIPTED", model_id="scripted-1", provider="scripted", llm_class=ScriptedLLM,
+                                    context_window=8192, input_price_per_mtok=1.0, output_price_per_mtok=2.0))
+    with caplog.at_level("INFO", logger="package.services.chat_service"):
+        send(service)
+    # Three calls of 10 input and 5 output tokens: 30 * $1 + 15 * $2 per million
+    assert "3 model calls, 30 input and 15 output tokens, $0.000060" in caplog.text
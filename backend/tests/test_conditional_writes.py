@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from botocore.exceptions import ClientError
+from package.databases.dynamodb.conditions import update_existing, delete_existing
+from package.databases.dynamodb.file_repository import DynamoDBFileRepository
+from package.databases.dynamodb.session_repository import DynamoDBSessionRepository
+from package.databases.dynamodb_async.file_repository import AsyncDynamoDBFileRepository
+from package.schemas.file import File, FileStatus
+
+def client_error(code: str, operation: str) -> ClientError:
+    return ClientError({'Error': {'Code': code, 'Message': code}}, operation)
+
+class StubTable:
+    """
+    Dict-backed table supporting the attribute_exists conditions and simple
+    SET expressions the repositories send; counts calls per operation
+    """
+    def __init__(self, key: str, *items: dict):
+        self.key = key
+        self.items = {item[key]: dict(item) for item in items}
+        self.calls = []
+
+    def _check(self, Key, ConditionExpression, operation):
+        if ConditionExpression == f"attribute_exists({self.key})" and Key[self.key] not in self.items:
+            raise client_error('ConditionalCheckFailedException', operation)
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ConditionExpression=None,
+                    ReturnValues=None, ExpressionAttributeNames=None):
+        self.calls.append('update_item')
+        self._check(Key, ConditionExpression, 'UpdateItem')
+        item = self.items.setdefault(Key[self.key], dict(Key))
+        for clause in UpdateExpression.removeprefix("SET ").split(", "):
+            name, value = clause.split(" = ")
+            item[(ExpressionAttributeNames or {}).get(name, name)] = ExpressionAttributeValues[value]
+        return {'Attributes': dict(item)}
+
+    def delete_item(self, Key, ConditionExpression=None):
+        self.calls.append('delete_item')
+        self._check(Key, ConditionExpression, 'DeleteItem')
+        self.items.pop(Key[self.key], None)
+
+class AsyncStubTable:
+    """The same table behind the awaitable aioboto3 interface"""
+    def __init__(self, table: StubTable):
+        self.sync = table
+
+    async def update_item(self, **kwargs):
+        return self.sync.update_item(**kwargs)
+
+    async def delete_item(self, **kwargs):
+        return self.sync.delete_item(**kwargs)
+
+def file_item(file_id: str = "f1") -> dict:
+    return File(file_id=file_id, project_id="p1", filename="sales.csv", s3_key="k/sales.csv", size=1).model_dump()
+
+def sync_repo(repo_class, table):
+    repo = repo_class.__new__(repo_class)
+    repo.table = table
+    return repo
+
+def test_update_existing_returns_the_new_item():
+    table = StubTable('file_id', file_item())
+    item = update_existing(table, {'file_id': 'f1'}, UpdateExpression='SET size = :size',
+                           ExpressionAttributeValues={':size': 10})
+    assert item['size'] == 10
+    assert table.calls == ['update_item']
+
+def test_update_on_a_missing_item_returns_none_without_creating_it():
+    table = StubTable('file_id')
+    assert update_existing(table, {'file_id': 'f1'}, UpdateExpression='SET size = :size',
+                           ExpressionAttributeValues={':size': 10}) is None
+    assert table.items == {}
+
+def test_delete_existing_reports_whether_the_item_existed():
+    table = StubTable('file_id', file_item())
+    assert delete_existing(table, {'file_id': 'f1'}) is True
+    assert delete_existing(table, {'file_id': 'f1'}) is False
+    assert table.calls == ['delete_item', 'delete_item']
+
+def test_other_client_errors_are_raised():
+    class ThrottledTable(StubTable):
+        def delete_item(self, Key, ConditionExpression=None):
+            raise client_error('ProvisionedThroughputExceededException', 'DeleteItem')
+
+    with pytest.raises(ClientError):
+        delete_existing(ThrottledTable('file_id'), {'file_id': 'f1'})
+
+def test_repositories_return_none_and_false_for_missing_items():
+    files = sync_repo(DynamoDBFileRepository, StubTable('file_id', file_item()))
+    sessions = sync_repo(DynamoDBSessionRepository, StubTable('session_id'))
+
+    async def scenario():
+        confirmed = await files.confirm_upload('f1', 42)
+        assert (confirmed.size, confirmed.status) == (42, FileStatus.COMPLETED)
+        assert await files.update_selection('missing', True) is None
+        assert await files.update('missing', status='failed') is None
+        assert await files.delete('missing') is False
+        assert await files.delete('f1') is True
+        assert await sessions.delete('missing') is False
+
+    asyncio.run(scenario())
+    assert files.table.calls == ['update_item', 'update_item', 'update_item', 'delete_item', 'delete_item']
+
+def test_async_repository_returns_none_and_false_for_missing_items():
+    table = AsyncStubTable(StubTable('file_id', file_item()))
+    repo = AsyncDynamoDBFileRepository()
+
+    async def get_table():
+        return table
+
+    repo.table = get_table
+
+    async def scenario():
+        assert (await repo.update_metadata('f1', 'sales', 'desc', [])).name == 'sales'
+        assert await repo.update_metadata('missing', 'sales', 'desc', []) is None
+        assert await repo.delete('missing') is False
+        assert await repo.delete('f1') is True
+
+    asyncio.run(scenario())
+    assert table.sync.items == {}
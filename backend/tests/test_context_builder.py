@@ -0,0 +1,61 @@
+from package.core.context_builder import ContextBuilder, STAGE_POLICIES, estimate_tokens
+
+def turns(count: int, size: int = 40) -> list:
+    """Alternating user/assistant history, oldest first, each message size characters long"""
+    return [dict(role='user' if i % 2 == 0 else 'assistant', content=f"{i:02d}" + "x" * (size - 2))
+            for i in range(count)]
+
+def test_answer_keeps_the_recent_conversation():
+    history = turns(20)
+    messages = ContextBuilder(history, 128000).build("answer", "question")
+    assert len(messages) == STAGE_POLICIES["answer"].max_messages + 1
+    assert messages[0]['content'] == history[10]['content']
+    assert messages[-1] == dict(role='user', content="question")
+
+def test_sql_drops_older_turns_at_its_message_limit():
+    history = turns(20)
+    messages = ContextBuilder(history, 128000).build("sql", "USER QUERY:\nq")
+    assert [m['content'] for m in messages[:-1]] == [m['content'] for m in history[-6:]]
+
+def test_chart_sends_only_user_turns():
+    history = turns(8)
+    messages = ContextBuilder(history, 128000).build("chart", "DATA")
+    # The two most recent questions, merged with the prompt since they are consecutive user turns
+    assert messages == [dict(role='user', content=f"{history[4]['content']}\n\n{history[6]['content']}\n\nDATA")]
+
+def test_budget_follows_the_context_window():
+    history = turns(10, size=400)
+    # 25% of a 1000 token window is 250 tokens, room for two 100 token messages after the prompt
+    messages = ContextBuilder(history, 1000).build("sql", "q")
+    assert [m['content'] for m in messages[:-1]] == [history[-2]['content'], history[-1]['content']]
+
+def test_long_messages_are_trimmed():
+    history = [dict(role='user', content="y" * 8000)]
+    messages = ContextBuilder(history, 128000).build("sql", "q")
+    limit = STAGE_POLICIES["sql"].max_message_tokens
+    assert messages[0]['content'].startswith("y" * limit * 4 + "\n...[truncated]")
+
+def test_conversation_starts_with_the_user_and_alternates():
+    history = [dict(role='assistant', content="welcome")] + turns(3)
+    history.append(dict(role='user', content="unanswered"))
+    messages = ContextBuilder(history, 128000).build("answer", "question")
+    assert messages[0]['role'] == 'user'
+    assert all(a['role'] != b['role'] for a, b in zip(messages, messages[1:]))
+    # The unanswered question merges with the user turn before it and with the prompt
+    assert messages[-1]['content'] == f"{history[3]['content']}\n\nunanswered\n\nquestion"
+
+def test_saved_tokens_count_what_was_left_out():
+    history = [dict(role='assistant', content="a" * 40)] + turns(20)
+    full = sum(estimate_tokens(m['content']) for m in history)
+    assert full == 210
+    context = ContextBuilder(history, 128000)
+    context.build("sql", "q")  # six 10 token messages
+    context.build("chart", "q")  # two 10 token questions
+    # Each stage is measured against sending the full history
+    assert context.saved_tokens == (full - 60) + (full - 20)
+
+def test_leading_assistant_turns_dropped_for_ordering_count_as_saved():
+    history = [dict(role='assistant', content="a" * 400)]
+    context = ContextBuilder(history, 128000)
+    assert context.build("answer", "q") == [dict(role='user', content="q")]
+    assert context.saved_tokens == estimate_tokens("a" * 400)
@@ -0,0 +1,30 @@
+from package.core.data_catalog import DataCatalog
+
+def table_types(catalog: DataCatalog) -> dict:
+    rows = catalog._conn.execute("select table_name, table_type from information_schema.tables").fetchall()
+    return dict(rows)
+
+def test_file_sources_register_as_lazy_views(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text("a,b\n1,x\n2,y\n")
+    catalog = DataCatalog()
+    catalog.register("lazy", str(path))
+    catalog.register("copied", str(path), materialize=True)
+    assert table_types(catalog) == dict(lazy="VIEW", copied="BASE TABLE")
+    assert (catalog._tables["lazy"]["materialized"], catalog._tables["copied"]["materialized"]) == (False, True)
+
+    # A view reads the file at query time, so later changes to it show up
+    path.write_text("a,b\n1,x\n2,y\n3,z\n")
+    assert catalog.query_arrow("select count(*) n from lazy").column("n").to_pylist() == [3]
+    assert catalog.query_arrow("select count(*) n from copied").column("n").to_pylist() == [2]
+
+def test_sniff_schema_reads_only_a_sample(tmp_path):
+    # Numeric well past the default 20480-row sample; a full scan would see the text at the end
+    path = tmp_path / "wide.csv"
+    path.write_text("a,b\n" + "".join(f"{i},x\n" for i in range(50000)) + "not a number,x\n")
+    catalog = DataCatalog()
+    sampled = catalog.sniff_schema(str(path))
+    assert list(sampled.columns[:2]) == ["column_name", "column_type"]
+    assert dict(zip(sampled.column_name, sampled.column_type))["a"] == "BIGINT"
+    scanned = catalog.sniff_schema(str(path), sample_size=-1)
+    assert dict(zip(scanned.column_name, scanned.column_type))["a"] == "VARCHAR"
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import pytest
+from package.core.executor import BoundedExecutor, ExecutorSaturatedError
+
+def test_runs_on_named_workers_and_counts():
+    executor = BoundedExecutor(max_workers=2, max_queue=2, name="unit")
+    name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+    assert name.startswith("unit")
+    stats = executor.stats()
+    assert (stats['submitted'], stats['completed'], stats['running'], stats['queued']) == (1, 1, 0, 0)
+
+def test_errors_reach_the_caller():
+    executor = BoundedExecutor(max_workers=1, max_queue=0)
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run(fail))
+    assert executor.stats()['completed'] == 1
+
+def test_rejects_once_the_queue_is_full():
+    executor = BoundedExecutor(max_workers=1, max_queue=1, name="unit")
+    gate = threading.Event()
+
+    async def scenario():
+        running = asyncio.create_task(executor.run(gate.wait))
+        queued = asyncio.create_task(executor.run(gate.wait))
+        await asyncio.sleep(0.05)
+        assert executor.stats()['queued'] == 1
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(gate.wait)
+        gate.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(scenario())
+    stats = executor.stats()
+    assert (stats['submitted'], stats['completed'], stats['rejected'], stats['peak_queued']) == (2, 2, 1, 1)
+    # Capacity is back once the burst drains
+    assert asyncio.run(executor.run(lambda: 42)) == 42
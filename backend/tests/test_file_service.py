@@ -0,0 +1,52 @@
+import asyncio
+from contextlib import asynccontextmanager
+from package.core.config import settings
+from package.schemas.file import File
+from package.services.file_service import FileService
+
+class Catalog:
+    def __init__(self, fail: bool):
+        self.fail = fail
+        self.exports = []
+
+    async def aexport_parquet(self, source, target):
+        if self.fail:
+            raise IOError("s3 write failed")
+        self.exports.append((source, target))
+
+class Pool:
+    """CatalogPool stand-in handing out one recording catalog"""
+    def __init__(self, fail: bool = False):
+        self.catalog = Catalog(fail)
+
+    @asynccontextmanager
+    async def alease(self):
+        yield self.catalog
+
+class Files:
+    def __init__(self):
+        self.updates = []
+
+    async def update(self, id, **kwargs):
+        self.updates.append((id, kwargs))
+
+def convert(s3_key: str, fail: bool = False):
+    files, pool = Files(), Pool(fail)
+    service = FileService(files, None, pool, None)
+    file = File(file_id="f1", project_id="p1", filename="sales.csv", s3_key=s3_key, size=1)
+    return asyncio.run(service.convert_to_parquet(file)), pool.catalog.exports, files.updates
+
+def test_csv_is_converted_and_its_parquet_key_recorded():
+    parquet_key, exports, updates = convert("u1/p1/sales.CSV")
+    assert parquet_key == "u1/p1/sales.parquet"
+    bucket = f"s3://{settings.FILE_BUCKET}"
+    assert exports == [(f"{bucket}/u1/p1/sales.CSV", f"{bucket}/u1/p1/sales.parquet")]
+    assert updates == [("f1", dict(parquet_key="u1/p1/sales.parquet"))]
+
+def test_parquet_uploads_are_not_converted():
+    assert convert("u1/p1/sales.parquet") == (None, [], [])
+
+def test_failed_conversion_keeps_querying_the_csv():
+    parquet_key, _, updates = convert("u1/p1/sales.csv", fail=True)
+    assert parquet_key is None
+    assert updates == []
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+from package.llms.base import BaseLLM, ModelResponse, StreamDelta, get_llm_executor
+
+class SlowStream(BaseLLM):
+    """Yields chunks from a blocking generator and records when it is closed"""
+    def __init__(self, chunks=3, delay=0.0):
+        super().__init__("slow-1")
+        self.chunks = chunks
+        self.delay = delay
+        self.closed = threading.Event()
+        self.threads = set()
+
+    def OutputMessage(self, response, response_time_ms):
+        pass
+
+    def run(self, system_prompt, messages):
+        pass
+
+    def stream(self, system_prompt, messages):
+        try:
+            for i in range(self.chunks):
+                self.threads.add(threading.current_thread().name)
+                time.sleep(self.delay)
+                yield StreamDelta(content=str(i))
+            yield ModelResponse(model_name=self.model_id, role="assistant", content="", reason="",
+                                input_tokens=1, output_tokens=1, response_time_ms=1)
+        finally:
+            self.closed.set()
+
+async def collect(llm, limit=None):
+    chunks = []
+    stream = llm._astream("system", [])
+    async for chunk in stream:
+        chunks.append(chunk)
+        if limit and len(chunks) == limit:
+            break
+    await stream.aclose()
+    return chunks
+
+def test_steps_run_on_the_llm_executor():
+    llm = SlowStream()
+    submitted = get_llm_executor().stats()['submitted']
+    chunks = asyncio.run(collect(llm))
+    assert [c.content for c in chunks[:-1]] == ["0", "1", "2"]
+    assert get_llm_executor().stats()['submitted'] - submitted == 5
+    assert all(name.startswith("llm") for name in llm.threads)
+    assert llm.closed.is_set()
+
+def test_early_exit_closes_the_iterator():
+    llm = SlowStream(chunks=10)
+    assert len(asyncio.run(collect(llm, limit=2))) == 2
+    assert llm.closed.is_set()
+
+def test_cancel_mid_read_closes_after_the_step_returns():
+    llm = SlowStream(chunks=10, delay=0.2)
+
+    async def scenario():
+        task = asyncio.create_task(collect(llm))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    started = time.monotonic()
+    asyncio.run(scenario())
+    assert time.monotonic() - started < 0.5
+    assert llm.closed.wait(1)
+
+def test_stream_is_created_on_the_executor():
+    class EagerSetup(SlowStream):
+        def stream(self, system_prompt, messages):
+            # Work done before the generator exists, like building an SDK client
+            self.setup_thread = threading.current_thread().name
+            return super().stream(system_prompt, messages)
+
+    llm = EagerSetup(chunks=1)
+    asyncio.run(collect(llm))
+    assert llm.setup_thread.startswith("llm")
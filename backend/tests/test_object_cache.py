@@ -0,0 +1,82 @@
+import os
+from package.core.object_cache import S3ObjectCache
+from package.core.data_catalog import CatalogPool
+
+def csv(rows: int) -> str:
+    return "a,b\n" + "".join(f"{i},x{i}\n" for i in range(rows))
+
+def make_cache(tmp_path, s3, max_bytes):
+    return S3ObjectCache(cache_dir=str(tmp_path), max_bytes=max_bytes, s3_client=s3)
+
+def test_hit_reuses_local_copy(tmp_path, s3):
+    s3.put("a.csv", csv(5), "e1")
+    cache = make_cache(tmp_path, s3, 10_000)
+    path, etag = cache.fetch("s3://bucket/a.csv")
+    assert (path, etag) == cache.fetch("s3://bucket/a.csv")
+    assert s3.downloads == 1
+    assert cache.stats()['hits'] == 1
+
+def test_pinned_entries_are_not_evicted(tmp_path, s3):
+    s3.put("a.csv", csv(20), "e1")
+    s3.put("b.csv", csv(20), "e1")
+    s3.put("c.csv", csv(20), "e1")
+    cache = make_cache(tmp_path, s3, len(csv(20)) + 1)
+
+    a, _ = cache.fetch("s3://bucket/a.csv")
+    b, _ = cache.fetch("s3://bucket/b.csv")
+    assert os.path.exists(a) and os.path.exists(b)
+
+    cache.release(a)
+    cache.release(b)
+    c, _ = cache.fetch("s3://bucket/c.csv")
+    assert not os.path.exists(a) and not os.path.exists(b)
+    assert os.path.exists(c)
+    assert cache.stats()['evictions'] == 2
+
+def test_replaced_file_kept_until_released(tmp_path, s3):
+    s3.put("a.csv", csv(5), "e1")
+    cache = make_cache(tmp_path, s3, 10_000)
+    old, _ = cache.fetch("s3://bucket/a.csv")
+
+    s3.put("a.csv", csv(6), "e2")
+    new, etag = cache.fetch("s3://bucket/a.csv")
+    assert etag == "e2" and new != old
+    assert os.path.exists(old)
+
+    cache.release(old)
+    assert not os.path.exists(old)
+    assert os.path.exists(new)
+
+def test_failed_download_leaves_no_partial_file(tmp_path, s3):
+    s3.put("a.csv", csv(5), "e1")
+    s3.fail_downloads = True
+    cache = make_cache(tmp_path, s3, 10_000)
+    try:
+        cache.fetch("s3://bucket/a.csv")
+    except ConnectionError:
+        pass
+    assert os.listdir(cache.cache_dir) == []
+    assert cache.stats()['entries'] == 0
+
+def test_key_locks_stay_bounded(tmp_path, s3):
+    cache = make_cache(tmp_path, s3, 10_000)
+    for i in range(500):
+        s3.put(f"{i}.csv", csv(1), "e1")
+        cache.release(cache.fetch(f"s3://bucket/{i}.csv")[0])
+    assert len(cache._key_locks) == S3ObjectCache.KEY_LOCKS
+
+def test_view_survives_eviction_by_another_lease(tmp_path, s3):
+    for name in ("a", "b", "c"):
+        s3.put(f"{name}.csv", csv(50), "e1")
+    cache = make_cache(tmp_path, s3, len(csv(50)) + 1)
+    pool = CatalogPool(object_cache=cache)
+
+    with pool.lease() as first:
+        first.register("a", "s3://bucket/a.csv")
+        with pool.lease() as second:
+            second.register("b", "s3://bucket/b.csv")
+            second.register("c", "s3://bucket/c.csv")
+        assert len(first.query("select * from a")) == 50
+
+    assert cache.stats()['pinned'] == 0
+    assert cache.fetch("s3://bucket/a.csv")[0] is not None
@@ -0,0 +1,110 @@
+import asyncio
+from types import SimpleNamespace
+import repair_project_counts
+from package.databases.dynamodb.project_repository import DynamoDBProjectRepository
+from package.services.file_service import FileService
+from package.services.session_service import SessionService
+from package.core.config import settings
+
+class PagedTable:
+    """Scan and ProjectIndex queries served one item per page, with update_item recorded"""
+    def __init__(self, items):
+        self.items = items
+        self.pages = 0
+        self.updates = []
+
+    def _page(self, items, params):
+        self.pages += 1
+        start = params.get('ExclusiveStartKey', 0)
+        response = dict(Items=items[start:start + 1], Count=len(items[start:start + 1]))
+        if start + 1 < len(items):
+            response['LastEvaluatedKey'] = start + 1
+        return response
+
+    def scan(self, **params):
+        return self._page(self.items, params)
+
+    def query(self, **params):
+        project_id = params['ExpressionAttributeValues'][':project_id']
+        return self._page([item for item in self.items if item['project_id'] == project_id], params)
+
+    def update_item(self, **params):
+        self.updates.append(params)
+        return {'Attributes': {}}
+
+def run_repair(monkeypatch, dry_run: bool):
+    projects = PagedTable([
+        dict(project_id='p1', file_count=2, session_count=1),
+        dict(project_id='p2', file_count=5, session_count=0),
+    ])
+    files = PagedTable([dict(project_id='p1'), dict(project_id='p1'), dict(project_id='p2')])
+    sessions = PagedTable([dict(project_id='p1'), dict(project_id='p2'), dict(project_id='p2')])
+    tables = {settings.PROJECTS_TABLE: projects, settings.FILES_TABLE: files, settings.SESSIONS_TABLE: sessions}
+    resource = SimpleNamespace(Table=tables.__getitem__)
+    monkeypatch.setattr(repair_project_counts.boto3, "resource", lambda *args, **kwargs: resource)
+    repair_project_counts.repair(dry_run)
+    return projects, files
+
+def test_repair_recounts_across_pages(monkeypatch, capsys):
+    projects, files = run_repair(monkeypatch, dry_run=False)
+    # p1 is already right; p2 has drifted
+    assert [update['Key'] for update in projects.updates] == [{'project_id': 'p2'}]
+    assert projects.updates[0]['ExpressionAttributeValues'] == {':files': 1, ':sessions': 2}
+    assert projects.pages == 2 and files.pages == 3
+    assert "Checked 2 projects, repaired 1" in capsys.readouterr().out
+
+def test_repair_dry_run_only_reports(monkeypatch, capsys):
+    projects, _ = run_repair(monkeypatch, dry_run=True)
+    assert projects.updates == []
+    out = capsys.readouterr().out
+    assert "p2: files 5 -> 1, sessions 0 -> 2" in out
+    assert "would repair 1" in out
+
+def test_increment_counts_is_a_single_atomic_add():
+    repo = DynamoDBProjectRepository.__new__(DynamoDBProjectRepository)
+    repo.table = PagedTable([])
+    asyncio.run(repo.increment_counts('p1', file_count=-1))
+    update = repo.table.updates[0]
+    assert update['UpdateExpression'] == 'ADD file_count :files, session_count :sessions'
+    assert update['ExpressionAttributeValues'] == {':files': -1, ':sessions': 0}
+    assert update['ConditionExpression'] == 'attribute_exists(project_id)'
+
+class Recorder:
+    """Repository stand-in whose delete() reports the given outcome and which records counter changes"""
+    def __init__(self, deleted: bool):
+        self.deleted = deleted
+        self.increments = []
+
+    async def delete(self, id):
+        return self.deleted
+
+    async def increment_counts(self, project_id, **counts):
+        self.increments.append((project_id, counts))
+
+class Access:
+    async def owns_file(self, file_id, user_id):
+        return 'p1'
+
+    async def owns_session(self, session_id, user_id):
+        return 'p1'
+
+    def invalidate_file(self, file_id):
+        pass
+
+    def invalidate_session(self, session_id):
+        pass
+
+class Pool:
+    def invalidate_file(self, file_id):
+        pass
+
+def test_deletes_decrement_only_when_something_was_deleted():
+    for deleted, expected in [(True, [('p1', dict(file_count=-1))]), (False, [])]:
+        repo = Recorder(deleted)
+        assert asyncio.run(FileService(repo, repo, Pool(), Access()).delete_file('f1', 'u1')) is deleted
+        assert repo.increments == expected
+
+    for deleted, expected in [(True, [('p1', dict(session_count=-1))]), (False, [])]:
+        repo = Recorder(deleted)
+        assert asyncio.run(SessionService(repo, repo, Access()).delete_session('s1', 'u1')) is deleted
+        assert repo.increments == expected
@@ -0,0 +1,34 @@
+import time
+import pytest
+from package.core.data_catalog import DataCatalog, QueryLimits, QueryError, QueryTimeoutError, QueryRowLimitError
+
+def catalog(**limits) -> DataCatalog:
+    return DataCatalog(limits=QueryLimits(**limits))
+
+def test_results_within_the_row_cap_are_returned_whole():
+    result = catalog(max_rows=100).query_arrow("select range as a from range(100)")
+    assert result.num_rows == 100
+    assert result.column_names == ["a"]
+
+def test_results_over_the_row_cap_are_rejected():
+    with pytest.raises(QueryRowLimitError) as e:
+        catalog(max_rows=100).query_arrow("select range as a from range(101)")
+    assert "more than 100 rows" in e.value.message
+
+def test_slow_query_is_interrupted_at_the_timeout():
+    started = time.monotonic()
+    with pytest.raises(QueryTimeoutError) as e:
+        catalog(timeout_seconds=0.2).query_arrow("select sum(a.range * b.range) from range(100000000) a, range(1000) b")
+    assert time.monotonic() - started < 5
+    assert "0.2s" in e.value.message
+
+def test_sql_errors_are_query_errors():
+    with pytest.raises(QueryError) as e:
+        catalog().query_arrow("select missing from range(1)")
+    assert type(e.value) is QueryError
+
+def test_errors_map_to_codes_and_statuses():
+    assert QueryError("bad").to_dict() == dict(code="query_failed", message="bad")
+    assert QueryTimeoutError("slow").to_dict() == dict(code="query_timeout", message="slow")
+    assert QueryRowLimitError("big").to_dict()["code"] == "query_row_limit"
+    assert (QueryError.status_code, QueryTimeoutError.status_code, QueryRowLimitError.status_code) == (422, 408, 422)
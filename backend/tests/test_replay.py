@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+import package.llms.replay as replay
+from package.core.config import settings
+from package.llms import BaseLLM, ModelFactory, ModelResponse, ModelSpec, ReplayLLM, ReplayMissError, StreamDelta
+
+class EchoLLM(BaseLLM):
+    """Deterministic delegate that answers with the last user message"""
+    calls = 0
+
+    def OutputMessage(self, response, response_time_ms):
+        pass
+
+    def run(self, system_prompt, messages):
+        EchoLLM.calls += 1
+        return ModelResponse(model_name=self.model_id, role="assistant", content=f"echo: {messages[-1]['content']}",
+                             reason="", input_tokens=12, output_tokens=3, response_time_ms=250)
+
+CONVERSATION = [
+    ("system", [dict(role="user", content="hello")]),
+    (["static", "schema"], [dict(role="user", content="how many?")]),
+]
+
+@pytest.fixture
+def cassette_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "cassette.jsonl")
+    ModelFactory.register(ModelSpec(key="ECHO", model_id="echo-1", provider="echo", llm_class=EchoLLM, context_window=8192))
+    monkeypatch.setattr(settings, "LLM_REPLAY_CASSETTE", path)
+    monkeypatch.setattr(settings, "LLM_REPLAY_DELEGATE", "ECHO")
+    monkeypatch.setattr(settings, "LLM_REPLAY_LATENCY_MS", 0)
+    monkeypatch.setattr(replay, "_cassettes", {})
+    EchoLLM.calls = 0
+    return path
+
+def replay_llm(monkeypatch, mode: str) -> ReplayLLM:
+    monkeypatch.setattr(settings, "LLM_REPLAY_MODE", mode)
+    # A fresh process reads the cassette back from disk
+    monkeypatch.setattr(replay, "_cassettes", {})
+    return ReplayLLM("replay")
+
+def test_recorded_conversation_replays_without_the_delegate(cassette_path, monkeypatch):
+    recorder = replay_llm(monkeypatch, "record")
+    recorded = [asyncio.run(recorder.arun(system, messages)) for system, messages in CONVERSATION]
+    assert EchoLLM.calls == 2
+
+    player = replay_llm(monkeypatch, "replay")
+    replayed = [asyncio.run(player.arun(system, messages)) for system, messages in CONVERSATION]
+    assert EchoLLM.calls == 2
+    assert [r.content for r in replayed] == [r.content for r in recorded] == ["echo: hello", "echo: how many?"]
+    assert [(r.input_tokens, r.output_tokens, r.model_name) for r in replayed] == [(12, 3, "replay")] * 2
+
+def test_replayed_stream_matches_the_recording(cassette_path, monkeypatch):
+    system, messages = CONVERSATION[0]
+    asyncio.run(replay_llm(monkeypatch, "record").arun(system, messages))
+
+    async def collect(llm):
+        return [chunk async for chunk in llm.astream(system, messages)]
+
+    delta, final = asyncio.run(collect(replay_llm(monkeypatch, "replay")))
+    assert delta == StreamDelta(content="echo: hello")
+    assert final.content == "echo: hello"
+
+def test_recorded_latency_is_replayed_unless_overridden(cassette_path, monkeypatch):
+    system, messages = CONVERSATION[0]
+    asyncio.run(replay_llm(monkeypatch, "record").arun(system, messages))
+    monkeypatch.setattr(settings, "LLM_REPLAY_LATENCY_MS", None)
+    assert replay_llm(monkeypatch, "replay").lookup(system, messages)[1] == 0.25
+
+def test_cassette_miss_raises(cassette_path, monkeypatch):
+    system, messages = CONVERSATION[0]
+    asyncio.run(replay_llm(monkeypatch, "record").arun(system, messages))
+    player = replay_llm(monkeypatch, "replay")
+    with pytest.raises(ReplayMissError, match="No recording"):
+        asyncio.run(player.arun(system, [dict(role="user", content="hello!")]))
+    with pytest.raises(ReplayMissError):
+        player.run("another system prompt", messages)
+    assert EchoLLM.calls == 1
@@ -0,0 +1,55 @@
+import pyarrow as pa
+import package.core.result_cache as result_cache
+from package.core.result_cache import QueryResultCache, normalize_sql
+
+TABLES = {'sales': dict(file_id='f1', version='v1')}
+
+def table(rows: int) -> pa.Table:
+    return pa.table({'a': list(range(rows))})
+
+def test_key_ignores_formatting_but_not_literals():
+    cache = QueryResultCache()
+    assert normalize_sql("SELECT  a\nFROM sales;") == "select a from sales"
+    assert cache.make_key("SELECT a FROM sales", TABLES) == cache.make_key("select a\n from sales;", TABLES)
+    assert cache.make_key("select a from sales where b = 'X'", TABLES) != cache.make_key("select a from sales where b = 'x'", TABLES)
+
+def test_key_follows_file_versions():
+    cache = QueryResultCache()
+    key = cache.make_key("select a from sales", TABLES)
+    assert key != cache.make_key("select a from sales", {'sales': dict(file_id='f1', version='v2')})
+    assert cache.make_key("select a from sales", {'sales': dict(file_id='f1')}) is None
+
+def test_hit_and_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = QueryResultCache(ttl_seconds=10)
+    cache.put("k", table(3), ['f1'])
+    assert cache.get("k").num_rows == 3
+    now[0] = 110.0
+    assert cache.get("k") is None
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes'], stats['hits'], stats['misses']) == (0, 0, 1, 1)
+
+def test_least_recently_used_is_evicted_past_the_budget():
+    size = table(100).nbytes
+    cache = QueryResultCache(max_bytes=size * 2)
+    cache.put("a", table(100), ['f1'])
+    cache.put("b", table(100), ['f2'])
+    cache.get("a")
+    cache.put("c", table(100), ['f3'])
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()['evictions'] == 1
+
+    cache.put("huge", table(1000), ['f4'])
+    assert cache.get("huge") is None
+
+def test_invalidate_file_drops_every_result_that_read_it():
+    cache = QueryResultCache()
+    cache.put("a", table(1), ['f1'])
+    cache.put("ab", table(1), ['f1', 'f2'])
+    cache.put("b", table(1), ['f2'])
+    cache.invalidate_file('f1')
+    assert cache.get("a") is None and cache.get("ab") is None
+    assert cache.get("b") is not None
+    assert cache.stats()['entries'] == 1
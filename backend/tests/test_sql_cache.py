@@ -0,0 +1,115 @@
+import asyncio
+import package.core.sql_cache as sql_cache
+from package.core.sql_cache import SQLCache
+
+SCHEMA = "METADATAS:\n\nsales(a BIGINT, b VARCHAR)"
+
+class FakeTable:
+    """The get_item/put_item/delete_item calls SQLCache makes on a DynamoDB table"""
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key):
+        item = self.items.get(Key['cache_key'])
+        return {'Item': item} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item['cache_key']] = Item
+
+    def delete_item(self, Key):
+        self.items.pop(Key['cache_key'], None)
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+def history(*turns):
+    return [dict(role=role, content=content) for role, content in turns]
+
+def test_key_is_stable_across_question_formatting():
+    cache = SQLCache()
+    key = cache.make_key(SCHEMA, "m1", "How many sales?", [])
+    assert key == cache.make_key(SCHEMA, "m1", "  how   many SALES ", [])
+    assert key != cache.make_key(SCHEMA, "m2", "How many sales?", [])
+    assert key != cache.make_key(SCHEMA + ", c DOUBLE", "m1", "How many sales?", [])
+    assert key != cache.make_key(SCHEMA, "m1", "How many returns?", [])
+
+def test_key_includes_the_history_window():
+    cache = SQLCache()
+    window = history(("user", "Only 2024"), ("assistant", "OK"))
+    key = cache.make_key(SCHEMA, "m1", "and by month?", window)
+    assert key == cache.make_key(SCHEMA, "m1", "and by month?", history(("user", "only 2024."), ("assistant", "ok")))
+    assert key != cache.make_key(SCHEMA, "m1", "and by month?", history(("user", "Only 2023"), ("assistant", "OK")))
+    assert key != cache.make_key(SCHEMA, "m1", "and by month?", [])
+
+def test_local_tier_hits_until_expiry(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sql_cache.time, "time", clock.time)
+    cache = SQLCache(ttl_seconds=60)
+
+    async def scenario():
+        assert await cache.get("k") is None
+        await cache.put("k", "select 1", "m1")
+        assert await cache.get("k") == "select 1"
+        clock.now += 61
+        assert await cache.get("k") is None
+
+    asyncio.run(scenario())
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 0)
+
+def test_local_tier_evicts_least_recently_used():
+    cache = SQLCache(max_entries=2)
+
+    async def scenario():
+        await cache.put("a", "select 'a'", "m1")
+        await cache.put("b", "select 'b'", "m1")
+        await cache.get("a")
+        await cache.put("c", "select 'c'", "m1")
+        return [await cache.get(key) for key in "abc"]
+
+    assert asyncio.run(scenario()) == ["select 'a'", None, "select 'c'"]
+
+def test_table_tier_survives_a_cold_process(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sql_cache.time, "time", clock.time)
+    table = FakeTable()
+
+    async def scenario():
+        await SQLCache(ttl_seconds=60, table=table).put("k", "select 1", "m1")
+        assert table.items["k"]["expires_at"] == int(clock.now + 60)
+
+        cold = SQLCache(ttl_seconds=60, table=table)
+        assert await cold.get("k") == "select 1"
+        assert await cold.get("k") == "select 1"
+        assert (cold.stats()['persistent_hits'], cold.stats()['hits']) == (1, 1)
+
+        # DynamoDB deletes expired items lazily, so an expired item may still be returned
+        clock.now += 61
+        assert await SQLCache(table=table).get("k") is None
+
+    asyncio.run(scenario())
+
+def test_invalidate_clears_both_tiers():
+    table = FakeTable()
+    cache = SQLCache(table=table)
+
+    async def scenario():
+        await cache.put("k", "select broken", "m1")
+        await cache.invalidate("k")
+        assert await cache.get("k") is None
+
+    asyncio.run(scenario())
+    assert table.items == {}
+
+def test_table_errors_fall_back_to_a_miss():
+    class BrokenTable(FakeTable):
+        def get_item(self, Key):
+            raise ConnectionError("dynamodb unreachable")
+
+    cache = SQLCache(table=BrokenTable())
+    assert asyncio.run(cache.get("k")) is None
+    assert cache.stats()['misses'] == 1
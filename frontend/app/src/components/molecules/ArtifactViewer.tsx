@@ -19,6 +19,7 @@ export const ArtifactViewer = ({ artifact }: ArtifactViewerProps) => {
       return <DataTable content={artifact.content} title={artifact.title} />
     
     case 'chart':
+      if (!artifact.content) return <div className="text-sm text-gray-500">{artifact.title}</div>
       return <ChartViewer content={artifact.content} title={artifact.title} />
     
     default:
@@ -187,7 +187,7 @@ export const ChatArea = ({
                                       </tbody>
                                     </table>
                                   </div>
-                                ) : artifact.type === "chart" ? (
+                                ) : artifact.type === "chart" && artifact.content ? (
                                   <div className="w-full">
                                     <iframe
                                       srcDoc={`
@@ -72,6 +72,7 @@ resource "aws_iam_role_policy" "lambda_policy" {
           aws_dynamodb_table.sessions.arn,
           aws_dynamodb_table.messages.arn,
           aws_dynamodb_table.files.arn,
+          aws_dynamodb_table.sql_cache.arn,
           "${aws_dynamodb_table.users.arn}/index/*",
           "${aws_dynamodb_table.projects.arn}/index/*",
           "${aws_dynamodb_table.sessions.arn}/index/*",
@@ -120,6 +121,7 @@ resource "aws_lambda_function" "api" {
       FILE_BUCKET           = aws_s3_bucket.uploads.bucket
       BEDROCK_REGION        = "us-west-2"
       MODEL_PROVIDER        = "bedrock"
+      SQL_CACHE_TABLE       = aws_dynamodb_table.sql_cache.name
     }
   }
 
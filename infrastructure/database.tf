@@ -9,6 +9,17 @@ resource "aws_dynamodb_table" "users" {
     type = "S"
   }
 
+  attribute {
+    name = "email"
+    type = "S"
+  }
+
+  global_secondary_index {
+    name            = "EmailIndex"
+    hash_key        = "email"
+    projection_type = "ALL"
+  }
+
   tags = {
     Name        = "Users Table"
     Environment = var.environment
@@ -136,4 +147,26 @@ resource "aws_dynamodb_table" "files" {
     Environment = var.environment
     Project     = var.project_name
   }
-}
\ No newline at end of file
+}
+# DynamoDB table for cached text-to-SQL generations
+resource "aws_dynamodb_table" "sql_cache" {
+  name         = "${var.table_prefix}sql_cache"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "cache_key"
+
+  attribute {
+    name = "cache_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "SQL Cache Table"
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
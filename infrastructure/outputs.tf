@@ -24,6 +24,11 @@ output "files_table_name" {
   value       = aws_dynamodb_table.files.name
 }
 
+output "sql_cache_table_name" {
+  description = "Name of the generated SQL cache DynamoDB table"
+  value       = aws_dynamodb_table.sql_cache.name
+}
+
 # Storage outputs
 output "s3_bucket_name" {
   description = "Name of the S3 uploads bucket"